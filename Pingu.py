@@ -29,6 +29,7 @@ from src.controllers.main_controller import MainController
 from src.web_server import WebServer
 from src.web_auth import web_auth
 from src.host_manager import HostManager
+from src.utils.bandwidth_store import bandwidth_store
        
 import threading
 import webbrowser
@@ -108,6 +109,12 @@ class MainWindow(QMainWindow):
                 from PySide6.QtCore import QCoreApplication
                 QCoreApplication.processEvents()
             
+            # 2b. Écrire l'historique de monitoring et de latence encore en mémoire tampon
+            from src.monitoring_history import close_monitoring_manager
+            from src.latency_history import close_latency_history
+            close_monitoring_manager()
+            close_latency_history()
+            
             # 3. Arrêter le serveur web
             if hasattr(self, 'web_server') and self.web_server:
                 logger.info("Arrêt du serveur web lors de la fermeture")
@@ -827,7 +834,14 @@ class MainWindow(QMainWindow):
                 except Exception as row_e:
                     logger.error(f"Erreur lecture ligne {row}: {row_e}")
             
-            self.host_manager.set_hosts(hosts)
+            removed = self.host_manager.set_hosts(hosts)
+            # Débits SNMP des hôtes supprimés
+            for ip in removed:
+                bandwidth_store.remove(ip)
+            
+            # Transmettre la nouvelle liste au service de ping
+            if getattr(self, 'main_controller', None) and self.main_controller.ping_manager:
+                self.main_controller.ping_manager.refresh_hosts()
             
             # Diffuser la mise à jour aux clients web après synchronisation
             if getattr(self, 'web_server_running', False) and hasattr(self, 'web_server') and self.web_server:
@@ -1171,9 +1185,16 @@ def run_headless_mode():
                         pass
                 
                 if self.host_manager:
-                    self.host_manager.set_hosts(hosts)
+                    removed = self.host_manager.set_hosts(hosts)
+                    # Débits SNMP des hôtes supprimés
+                    for ip in removed:
+                        bandwidth_store.remove(ip)
                     logger.debug(f"HostManager synchronisé: {len(hosts)} hôtes")
                 
+                # Transmettre la nouvelle liste au service de ping
+                if getattr(self, 'main_controller', None) and self.main_controller.ping_manager:
+                    self.main_controller.ping_manager.refresh_hosts()
+                
                 # Broadcaster après synchronisation
                 if self.web_server_running and self.web_server:
                     self.web_server.broadcast_update()
@@ -1284,6 +1305,12 @@ def run_headless_mode():
                 time.sleep(1)  # Attendre que le monitoring s'arrête
         except Exception as e:
             logger.error(f"Erreur arrêt monitoring: {e}")
+        
+        # 3b. Écrire l'historique de monitoring et de latence encore en mémoire tampon (os._exit ignore atexit)
+        from src.monitoring_history import close_monitoring_manager
+        from src.latency_history import close_latency_history
+        close_monitoring_manager()
+        close_latency_history()
             
         # 4. Arrêter le serveur web
         try:
@@ -1439,6 +1466,10 @@ def stop_headless_mode():
 
 if __name__ == "__main__":
     import argparse
+    import multiprocessing
+    
+    # Requis pour les processus de sonde (mode réparti) dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
     
     # Parser les arguments de ligne de commande
     parser = argparse.ArgumentParser(
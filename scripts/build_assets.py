@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Construction des ressources statiques de l'interface web.
+Écrit src/web/static/dist/ : fichiers renommés avec l'empreinte de leur contenu,
+versions précompressées .gz/.br et manifeste (voir src/web/assets.py).
+À relancer après chaque modification des fichiers JS/CSS/images.
+"""
+
+import os
+import sys
+
+# Se placer à la racine du projet (parent du dossier scripts)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+os.chdir(project_root)
+sys.path.insert(0, project_root)
+
+from src.web.assets import build_assets, BROTLI_AVAILABLE, DIST_DIR
+
+STATIC_DIR = os.path.join('src', 'web', 'static')
+
+if __name__ == '__main__':
+    manifest = build_assets(STATIC_DIR)
+    dist = os.path.join(STATIC_DIR, DIST_DIR)
+    total = sum(os.path.getsize(os.path.join(current, name))
+                for current, _, files in os.walk(dist) for name in files)
+    print(f"✅ {len(manifest)} ressources construites dans {dist} ({total // 1024} Ko)")
+    if not BROTLI_AVAILABLE:
+        print("   ℹ️ Module brotli non installé : seules les versions .gz sont générées")
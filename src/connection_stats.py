@@ -2,14 +2,18 @@
 """
 Module de gestion des statistiques de connexion des hôtes.
 Utilise SQLite pour stocker les événements de déconnexion/reconnexion.
+
+Horodatages en secondes UTC entières (colonne ts), convertis en heure locale à
+la lecture (champ timestamp des résultats). Schéma versionné par PRAGMA
+user_version ; la version 1 convertit l'ancienne colonne texte en heure locale.
 """
 
 import sqlite3
 import os
-from datetime import datetime, timedelta
 from contextlib import contextmanager
 from src.utils.logger import get_logger
 from src.utils.paths import AppPaths
+from src.utils.timestamps import local_text_to_epoch_sql, to_local, utc_now
 
 logger = get_logger(__name__)
 
@@ -17,6 +21,9 @@ logger = get_logger(__name__)
 class ConnectionStatsManager:
     """Gestionnaire des statistiques de connexion avec base SQLite."""
     
+    # Version du schéma (PRAGMA user_version)
+    SCHEMA_VERSION = 1
+    
     def __init__(self, db_path=None):
         """Initialise le gestionnaire avec le chemin de la base de données."""
         if db_path is None:
@@ -32,44 +39,72 @@ class ConnectionStatsManager:
         self._init_db()
     
     def _init_db(self):
-        """Crée les tables si elles n'existent pas."""
+        """Crée les tables si elles n'existent pas (et migre les anciennes bases)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Table des événements de connexion
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS connection_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ip TEXT NOT NULL,
-                    hostname TEXT,
-                    site TEXT DEFAULT '',
-                    event_type TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    duration_seconds INTEGER DEFAULT NULL
-                )
-            ''')
-            
-            # Ajouter la colonne site si elle n'existe pas (migration)
-            try:
-                cursor.execute('ALTER TABLE connection_events ADD COLUMN site TEXT DEFAULT ""')
-                logger.info("Colonne 'site' ajoutée à la table connection_events")
-            except sqlite3.OperationalError:
-                pass  # Colonne existe déjà
-            
-            # Index pour accélérer les requêtes
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_events_ip ON connection_events(ip)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_events_timestamp ON connection_events(timestamp)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_events_type ON connection_events(event_type)
-            ''')
+            version = cursor.execute('PRAGMA user_version').fetchone()[0]
+            if version < 1:
+                self._migrate_to_epoch(conn)
+            self._create_tables(cursor)
             
             conn.commit()
             logger.info(f"Base de données de statistiques initialisée: {self.db_path}")
     
+    def _create_tables(self, cursor):
+        # Table des événements de connexion
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS connection_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ip TEXT NOT NULL,
+                hostname TEXT,
+                site TEXT DEFAULT '',
+                event_type TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                duration_seconds INTEGER DEFAULT NULL
+            )
+        ''')
+        
+        # Index : (ip, ts) pour l'historique d'un hôte, (event_type, ts, ...) couvrant
+        # pour les totaux par période, ts pour les événements récents
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_ip_ts ON connection_events(ip, ts)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_type_ts
+            ON connection_events(event_type, ts, ip, duration_seconds)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_ts ON connection_events(ts)
+        ''')
+    
+    def _migrate_to_epoch(self, conn):
+        """
+        Version 1 du schéma : colonne timestamp (texte en heure locale) -> ts (secondes UTC).
+        Table renommée, copiée puis supprimée dans une seule transaction.
+        """
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(connection_events)')]
+        conn.execute('BEGIN')
+        try:
+            if 'timestamp' in columns:
+                conn.execute('ALTER TABLE connection_events RENAME TO connection_events_v0')
+                # Les anciens index suivent la table renommée ; supprimés avec elle
+                self._create_tables(conn.cursor())
+                site = "COALESCE(site, '')" if 'site' in columns else "''"
+                conn.execute(f'''
+                    INSERT INTO connection_events (id, ip, hostname, site, event_type, ts, duration_seconds)
+                    SELECT id, ip, hostname, {site}, event_type, {local_text_to_epoch_sql('timestamp')}, duration_seconds
+                    FROM connection_events_v0
+                    WHERE timestamp IS NOT NULL
+                ''')
+                conn.execute('DROP TABLE connection_events_v0')
+                logger.info("Table connection_events convertie en horodatages UTC")
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
     @contextmanager
     def _get_connection(self):
         """Contexte manager pour les connexions SQLite thread-safe."""
@@ -86,9 +121,9 @@ class ConnectionStatsManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT INTO connection_events (ip, hostname, site, event_type, timestamp)
-                    VALUES (?, ?, ?, 'disconnect', datetime('now', 'localtime'))
-                ''', (ip, hostname or '', site or ''))
+                    INSERT INTO connection_events (ip, hostname, site, event_type, ts)
+                    VALUES (?, ?, ?, 'disconnect', ?)
+                ''', (ip, hostname or '', site or '', utc_now()))
                 conn.commit()
                 logger.info(f"[STATS] Déconnexion enregistrée: {ip} ({hostname}) [site: {site or 'N/A'}]")
         except Exception as e:
@@ -102,30 +137,24 @@ class ConnectionStatsManager:
                 
                 # Trouver la dernière déconnexion pour cet hôte
                 cursor.execute('''
-                    SELECT id, timestamp FROM connection_events
+                    SELECT id, ts FROM connection_events
                     WHERE ip = ? AND event_type = 'disconnect'
-                    ORDER BY timestamp DESC
+                    ORDER BY ts DESC
                     LIMIT 1
                 ''', (ip,))
                 last_disconnect = cursor.fetchone()
                 
+                now = utc_now()
                 duration_seconds = None
                 if last_disconnect:
-                    try:
-                        disconnect_time = datetime.strptime(
-                            last_disconnect['timestamp'], 
-                            '%Y-%m-%d %H:%M:%S'
-                        )
-                        now = datetime.now()
-                        duration_seconds = int((now - disconnect_time).total_seconds())
-                    except Exception as e:
-                        logger.warning(f"Erreur calcul durée: {e}")
+                    # Secondes UTC : durée exacte, même à travers un changement d'heure
+                    duration_seconds = max(0, now - last_disconnect['ts'])
                 
                 # Enregistrer la reconnexion avec la durée
                 cursor.execute('''
-                    INSERT INTO connection_events (ip, hostname, site, event_type, timestamp, duration_seconds)
-                    VALUES (?, ?, ?, 'reconnect', datetime('now', 'localtime'), ?)
-                ''', (ip, hostname or '', site or '', duration_seconds))
+                    INSERT INTO connection_events (ip, hostname, site, event_type, ts, duration_seconds)
+                    VALUES (?, ?, ?, 'reconnect', ?, ?)
+                ''', (ip, hostname or '', site or '', now, duration_seconds))
                 conn.commit()
                 
                 duration_str = f"{duration_seconds}s" if duration_seconds else "inconnue"
@@ -138,42 +167,41 @@ class ConnectionStatsManager:
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff = datetime.now() - timedelta(days=days)
-                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+                cutoff = utc_now() - days * 86400
                 
                 # Total déconnexions
                 cursor.execute('''
                     SELECT COUNT(*) as count FROM connection_events
-                    WHERE event_type = 'disconnect' AND timestamp >= ?
-                ''', (cutoff_str,))
+                    WHERE event_type = 'disconnect' AND ts >= ?
+                ''', (cutoff,))
                 total_disconnects = cursor.fetchone()['count']
                 
                 # Total reconnexions
                 cursor.execute('''
                     SELECT COUNT(*) as count FROM connection_events
-                    WHERE event_type = 'reconnect' AND timestamp >= ?
-                ''', (cutoff_str,))
+                    WHERE event_type = 'reconnect' AND ts >= ?
+                ''', (cutoff,))
                 total_reconnects = cursor.fetchone()['count']
                 
                 # Durée moyenne des pannes
                 cursor.execute('''
                     SELECT AVG(duration_seconds) as avg_duration FROM connection_events
-                    WHERE event_type = 'reconnect' AND duration_seconds IS NOT NULL AND timestamp >= ?
-                ''', (cutoff_str,))
+                    WHERE event_type = 'reconnect' AND duration_seconds IS NOT NULL AND ts >= ?
+                ''', (cutoff,))
                 avg_duration = cursor.fetchone()['avg_duration'] or 0
                 
                 # Durée totale des pannes
                 cursor.execute('''
                     SELECT SUM(duration_seconds) as total_duration FROM connection_events
-                    WHERE event_type = 'reconnect' AND duration_seconds IS NOT NULL AND timestamp >= ?
-                ''', (cutoff_str,))
+                    WHERE event_type = 'reconnect' AND duration_seconds IS NOT NULL AND ts >= ?
+                ''', (cutoff,))
                 total_duration = cursor.fetchone()['total_duration'] or 0
                 
                 # Hôtes uniques affectés
                 cursor.execute('''
                     SELECT COUNT(DISTINCT ip) as count FROM connection_events
-                    WHERE event_type = 'disconnect' AND timestamp >= ?
-                ''', (cutoff_str,))
+                    WHERE event_type = 'disconnect' AND ts >= ?
+                ''', (cutoff,))
                 unique_hosts = cursor.fetchone()['count']
                 
                 # Stats par période
@@ -197,13 +225,12 @@ class ConnectionStatsManager:
     def _get_period_stats(self, conn, days: int) -> dict:
         """Statistiques pour une période donnée."""
         cursor = conn.cursor()
-        cutoff = datetime.now() - timedelta(days=days)
-        cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+        cutoff = utc_now() - days * 86400
         
         cursor.execute('''
             SELECT COUNT(*) as count FROM connection_events
-            WHERE event_type = 'disconnect' AND timestamp >= ?
-        ''', (cutoff_str,))
+            WHERE event_type = 'disconnect' AND ts >= ?
+        ''', (cutoff,))
         disconnects = cursor.fetchone()['count']
         
         return {'disconnects': disconnects, 'period_days': days}
@@ -213,8 +240,7 @@ class ConnectionStatsManager:
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff = datetime.now() - timedelta(days=days)
-                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+                cutoff = utc_now() - days * 86400
                 
                 cursor.execute('''
                     SELECT 
@@ -222,13 +248,13 @@ class ConnectionStatsManager:
                         hostname,
                         site,
                         COUNT(*) as disconnect_count,
-                        MAX(timestamp) as last_disconnect
+                        MAX(ts) as last_disconnect
                     FROM connection_events
-                    WHERE event_type = 'disconnect' AND timestamp >= ?
+                    WHERE event_type = 'disconnect' AND ts >= ?
                     GROUP BY ip
                     ORDER BY disconnect_count DESC
                     LIMIT ?
-                ''', (cutoff_str, limit))
+                ''', (cutoff, limit))
                 
                 results = []
                 for row in cursor.fetchall():
@@ -236,8 +262,8 @@ class ConnectionStatsManager:
                     cursor.execute('''
                         SELECT SUM(duration_seconds) as total FROM connection_events
                         WHERE ip = ? AND event_type = 'reconnect' 
-                        AND duration_seconds IS NOT NULL AND timestamp >= ?
-                    ''', (row['ip'], cutoff_str))
+                        AND duration_seconds IS NOT NULL AND ts >= ?
+                    ''', (row['ip'], cutoff))
                     total_downtime = cursor.fetchone()['total'] or 0
                     
                     results.append({
@@ -245,7 +271,7 @@ class ConnectionStatsManager:
                         'hostname': row['hostname'] or row['ip'],
                         'site': row['site'] or '',
                         'disconnect_count': row['disconnect_count'],
-                        'last_disconnect': row['last_disconnect'],
+                        'last_disconnect': to_local(row['last_disconnect']),
                         'total_downtime_seconds': total_downtime
                     })
                 
@@ -265,8 +291,8 @@ class ConnectionStatsManager:
                     SELECT 
                         hostname,
                         COUNT(*) as total_events,
-                        MIN(timestamp) as first_event,
-                        MAX(timestamp) as last_event
+                        MIN(ts) as first_event,
+                        MAX(ts) as last_event
                     FROM connection_events
                     WHERE ip = ?
                 ''', (ip,))
@@ -298,8 +324,8 @@ class ConnectionStatsManager:
                     'ip': ip,
                     'exists': True,
                     'hostname': info['hostname'] or ip,
-                    'first_event': info['first_event'],
-                    'last_event': info['last_event'],
+                    'first_event': to_local(info['first_event']),
+                    'last_event': to_local(info['last_event']),
                     'disconnect_count': disconnect_count,
                     'avg_duration_seconds': round(durations['avg_duration'] or 0, 0),
                     'total_downtime_seconds': durations['total_duration'] or 0,
@@ -316,14 +342,14 @@ class ConnectionStatsManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT id, event_type, timestamp, duration_seconds
+                    SELECT id, event_type, ts, duration_seconds
                     FROM connection_events
                     WHERE ip = ?
-                    ORDER BY timestamp DESC
+                    ORDER BY ts DESC
                     LIMIT ?
                 ''', (ip, limit))
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return [self._event(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Erreur récupération événements hôte {ip}: {e}")
             return []
@@ -334,17 +360,24 @@ class ConnectionStatsManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT id, ip, hostname, site, event_type, timestamp, duration_seconds
+                    SELECT id, ip, hostname, site, event_type, ts, duration_seconds
                     FROM connection_events
-                    ORDER BY timestamp DESC
+                    ORDER BY ts DESC
                     LIMIT ?
                 ''', (limit,))
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return [self._event(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Erreur récupération événements récents: {e}")
             return []
     
+    @staticmethod
+    def _event(row) -> dict:
+        """Ligne d'événement -> dict, avec l'heure locale dans 'timestamp'."""
+        event = dict(row)
+        event['timestamp'] = to_local(event['ts'])
+        return event
+    
     def get_all_tracked_hosts(self) -> list:
         """Retourne la liste de tous les hôtes avec des événements."""
         try:
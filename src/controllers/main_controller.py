@@ -1,6 +1,7 @@
 from src import var
 from src.fcy_ping import PingManager
 from src.core.alert_manager import AlertManager
+from src.host_manager import HostState
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -26,6 +27,7 @@ class MainController:
             try:
                 from src import db
                 db.lire_param_db()
+                db.load_probe_params()
                 logger.info(f"Paramètres chargés: Mail={var.mail}, Telegram={var.telegram}, Popup={var.popup}")
             except Exception as e:
                 logger.error(f"Erreur rechargement paramètres DB: {e}")
@@ -62,6 +64,7 @@ class MainController:
             )
             # Connexion des signaux de résultat
             self.ping_manager.result_signal.connect(self.on_monitoring_result)
+            self.ping_manager.results_signal.connect(self.on_monitoring_results)
             
             self.alert_manager = AlertManager(
                 self.main_window,
@@ -148,14 +151,52 @@ class MainController:
             logger.error(f"Erreur get_ips_to_monitor: {e}")
         return list(ips_set)
 
-    def on_monitoring_result(self, ip, latency, color, temperature, bandwidth):
-        """Gère le résultat d'un ping ou d'une mise à jour SNMP et met à jour le modèle Qt."""
+    def on_monitoring_result(self, ip, latency, color, temperature, bandwidth, probe=None):
+        """Gère un résultat isolé (mise à jour SNMP) puis diffuse aux clients web."""
+        self._apply_result(ip, latency, color, temperature, bandwidth, probe)
+        self._broadcast_web()
+
+    def on_monitoring_results(self, batch):
+        """
+        Applique un lot de résultats de ping en une seule passe :
+        un seul index IP -> ligne et une seule diffusion web pour tout le lot.
+        """
+        rows = self._build_row_index()
+        for ip, latency, color, temperature, bandwidth, probe in batch:
+            self._apply_result(ip, latency, color, temperature, bandwidth, probe, rows=rows)
+        self._broadcast_web()
+
+    def _build_row_index(self):
+        """Construit l'index {ip: ligne} du modèle (première occurrence)."""
+        rows = {}
+        model = self.main_window.treeIpModel
+        for row in range(model.rowCount()):
+            item = model.item(row, 1)
+            if item:
+                rows.setdefault(item.text(), row)
+        return rows
+
+    def _broadcast_web(self):
+        """Diffuse la mise à jour aux clients web (si serveur actif)."""
+        if hasattr(self.main_window, 'host_manager') and \
+                hasattr(self.main_window, 'web_server') and self.main_window.web_server:
+            try:
+                self.main_window.web_server.broadcast_update()
+            except Exception as ws_err:
+                logger.error(f"Erreur broadcast web: {ws_err}")
+
+    def _apply_result(self, ip, latency, color, temperature, bandwidth, probe=None, rows=None):
+        """
+        Met à jour le modèle Qt et le HostManager pour un résultat de ping ou SNMP.
+        `probe` contient les statistiques de la rafale (pertes, min/moy/max, gigue) ou None.
+        `rows` : index {ip: ligne} précalculé pour les traitements par lot.
+        """
         try:
             from src.utils.headless_compat import QStandardItem, QBrush, QColor, Qt
             from src.utils.colors import AppColors
             
             model = self.main_window.treeIpModel
-            row = self.find_item_row(ip)
+            row = rows.get(ip, -1) if rows is not None else self.find_item_row(ip)
             if row == -1: return
 
             # Vérifier l'exclusion
@@ -184,6 +225,14 @@ class MainController:
                             item_lat.setText("HS")
                     else:
                         item_lat.setText(f"{latency:.1f} ms")
+                
+                # Détail de la rafale en infobulle (pertes partielles, gigue)
+                if probe:
+                    item_lat.setToolTip(
+                        f"{probe['received']}/{probe['sent']} reçus, perte {probe['loss'] * 100:.0f}%"
+                        + (f"\nmin/moy/max {probe['min']}/{probe['avg']}/{probe['max']} ms, gigue {probe['jitter']} ms"
+                           if probe['received'] else "")
+                    )
             
             # Cas spécial : SNMP OK (latency = -1.0)
             elif latency == -1.0:
@@ -242,37 +291,22 @@ class MainController:
             # Synchronisation Thread-Safe avec HostManager pour le serveur Web
             if hasattr(self.main_window, 'host_manager'):
                 try:
-                    # Récupérer l'état actuel de l'hôte pour ne pas tout écraser si latency = -1
-                    current_host = self.main_window.host_manager.get_host_by_ip(ip)
-                    
-                    lat_text = current_host.get('latence', 'HS') if current_host else "HS"
-                    status = current_host.get('status', 'offline') if current_host else "offline"
-                    
-                    # Mise à jour seulement si c'est un résultat de Ping (latency >= 0)
+                    # Champs typés : libellés et couleur sont dérivés par le HostManager
                     if latency >= 0:
-                        status = "offline"
-                        lat_text = "HS"
-                        if not is_excluded and latency < 500:
-                            lat_text = f"{latency:.1f} ms"
-                            status = "online"
-                    
-                    # Mise à jour HostManager
-                    self.main_window.host_manager.update_host_status(
-                        ip, 
-                        lat_text, 
-                        status, 
-                        str(temperature) if temperature is not None else (current_host.get('temp') if current_host else None)
-                    )
+                        online = not is_excluded and latency < 500
+                        self.main_window.host_manager.update_host_status(
+                            ip,
+                            latency if online else None,
+                            HostState.ONLINE if online else HostState.OFFLINE,
+                            temperature,
+                            probe=probe
+                        )
+                    else:
+                        # Résultat SNMP seul : latence et état inchangés
+                        self.main_window.host_manager.update_host_status(ip, temp=temperature, probe=probe)
                 except Exception as hm_err:
                     logger.error(f"Erreur update HostManager: {hm_err}")
 
-                # Diffuser la mise à jour aux clients web (si serveur actif)
-                if hasattr(self.main_window, 'web_server') and self.main_window.web_server:
-                    try:
-                        self.main_window.web_server.broadcast_update()
-                    except Exception as ws_err:
-                        logger.error(f"Erreur broadcast web: {ws_err}")
-
         except Exception as e:
             logger.error(f"Erreur on_monitoring_result pour {ip}: {e}")
 
@@ -0,0 +1,114 @@
+"""
+Résultat d'une sonde multi-paquets.
+Résume une rafale de paquets (envoyés/reçus, pertes, RTT min/moy/max/mdev et
+gigue) pour que les pertes partielles et l'instabilité d'un lien soient visibles
+avant que l'hôte ne tombe complètement.
+"""
+
+import math
+from typing import Iterable, List, Optional
+
+# Latence conventionnelle d'un hôte qui ne répond pas
+TIMEOUT_LATENCY = 500.0
+
+
+class ProbeResult:
+    """Statistiques d'une rafale de paquets. Les RTT sont en ms, dans l'ordre de réception."""
+    __slots__ = ('sent', 'rtts')
+
+    def __init__(self, sent: int = 0, rtts: Optional[Iterable[float]] = None):
+        self.rtts: List[float] = [float(rtt) for rtt in (rtts or [])]
+        self.sent = max(int(sent), len(self.rtts))
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[Optional[float]]) -> 'ProbeResult':
+        """Construit le résultat à partir d'une liste de RTT (None = paquet perdu)."""
+        samples = list(samples)
+        return cls(len(samples), [rtt for rtt in samples if rtt is not None])
+
+    @classmethod
+    def from_hedged(cls, samples: Iterable[Optional[float]]) -> 'ProbeResult':
+        """
+        Paquets redondants envoyés en parallèle (la première réponse suffit, les
+        autres requêtes sont annulées) : une seule sonde, quel que soit le paquet
+        qui répond. Pertes 0 si un paquet a répondu, 1 sinon ; RTT le plus court.
+        """
+        rtts = [rtt for rtt in samples if rtt is not None]
+        return cls(1, [min(rtts)] if rtts else [])
+
+    @classmethod
+    def single(cls, latency: float) -> 'ProbeResult':
+        """Résultat d'une mesure unique (TCP, HTTP) ; >= 500 ms signifie échec."""
+        if latency is None or latency >= TIMEOUT_LATENCY:
+            return cls(1, [])
+        return cls(1, [latency])
+
+    def merge(self, other: 'ProbeResult') -> 'ProbeResult':
+        """Cumule deux rafales (tentative initiale et nouvelles tentatives)."""
+        return ProbeResult(self.sent + other.sent, self.rtts + other.rtts)
+
+    @property
+    def received(self) -> int:
+        return len(self.rtts)
+
+    @property
+    def loss(self) -> float:
+        """Taux de perte entre 0 et 1."""
+        if not self.sent:
+            return 1.0
+        return 1.0 - self.received / self.sent
+
+    @property
+    def min(self) -> Optional[float]:
+        return min(self.rtts) if self.rtts else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return max(self.rtts) if self.rtts else None
+
+    @property
+    def avg(self) -> Optional[float]:
+        return sum(self.rtts) / len(self.rtts) if self.rtts else None
+
+    @property
+    def mdev(self) -> Optional[float]:
+        """Écart type des RTT (comme le mdev de la commande ping)."""
+        if not self.rtts:
+            return None
+        avg = self.avg
+        return math.sqrt(sum((rtt - avg) ** 2 for rtt in self.rtts) / len(self.rtts))
+
+    @property
+    def jitter(self) -> Optional[float]:
+        """Gigue : moyenne des écarts absolus entre RTT successifs (0 si une seule réponse)."""
+        if not self.rtts:
+            return None
+        if len(self.rtts) < 2:
+            return 0.0
+        diffs = [abs(b - a) for a, b in zip(self.rtts, self.rtts[1:])]
+        return sum(diffs) / len(diffs)
+
+    @property
+    def latency(self) -> float:
+        """Latence moyenne arrondie, ou 500.0 si aucune réponse."""
+        if not self.rtts:
+            return TIMEOUT_LATENCY
+        return round(self.avg, 2)
+
+    def to_dict(self) -> dict:
+        """Représentation compacte pour les signaux et l'API web."""
+        def r(value):
+            return round(value, 2) if value is not None else None
+        return {
+            'sent': self.sent,
+            'received': self.received,
+            'loss': round(self.loss, 3),
+            'min': r(self.min),
+            'avg': r(self.avg),
+            'max': r(self.max),
+            'mdev': r(self.mdev),
+            'jitter': r(self.jitter),
+        }
+
+    def __repr__(self):
+        return f"ProbeResult(sent={self.sent}, received={self.received}, avg={self.avg})"
@@ -0,0 +1,118 @@
+"""
+Ordonnanceur de sondes par hôte (tas binaire).
+Chaque hôte possède sa propre échéance et son propre intervalle ; les nouveaux
+hôtes sont répartis uniformément sur l'intervalle pour lisser la charge au lieu
+de tout sonder par vagues.
+"""
+
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Optional
+
+
+class ProbeScheduler:
+    """
+    Tas d'échéances (due, ordre, hôte) avec suppression paresseuse.
+    Non thread-safe : utilisé uniquement depuis la boucle asyncio du worker.
+    """
+
+    def __init__(self, default_interval: float = 5.0):
+        self.default_interval = max(0.1, float(default_interval))
+        self._heap = []
+        self._counter = itertools.count()
+        # hôte -> échéance courante (seule l'entrée correspondante du tas est valide)
+        self._due: Dict[str, float] = {}
+        # hôte -> intervalle spécifique (sinon default_interval)
+        self._intervals: Dict[str, float] = {}
+
+    def __len__(self):
+        return len(self._due)
+
+    def __contains__(self, host):
+        return host in self._due
+
+    @property
+    def hosts(self) -> List[str]:
+        return list(self._due)
+
+    def interval_for(self, host: str) -> float:
+        """Retourne l'intervalle de sondage d'un hôte."""
+        return self._intervals.get(host, self.default_interval)
+
+    def set_default_interval(self, interval: float):
+        """Change l'intervalle par défaut (pris en compte au prochain passage de chaque hôte)."""
+        self.default_interval = max(0.1, float(interval))
+
+    def set_intervals(self, intervals: Dict[str, float]):
+        """Remplace les intervalles spécifiques par hôte (valeurs None/0 ignorées)."""
+        self._intervals = {
+            host: max(0.1, float(value))
+            for host, value in (intervals or {}).items()
+            if value
+        }
+
+    def _push(self, host: str, due: float):
+        self._due[host] = due
+        heapq.heappush(self._heap, (due, next(self._counter), host))
+
+    def set_hosts(self, hosts: Iterable[str], now: float):
+        """
+        Synchronise la liste des hôtes.
+        Les hôtes conservés gardent leur échéance ; les nouveaux sont étalés
+        uniformément sur leur intervalle à partir de `now`.
+        """
+        wanted = list(dict.fromkeys(h for h in hosts if h))
+        wanted_set = set(wanted)
+
+        for host in list(self._due):
+            if host not in wanted_set:
+                # Suppression paresseuse : l'entrée du tas sera ignorée
+                del self._due[host]
+
+        new_hosts = [h for h in wanted if h not in self._due]
+        count = len(new_hosts)
+        for index, host in enumerate(new_hosts):
+            offset = self.interval_for(host) * index / count
+            self._push(host, now + offset)
+
+        # Compacter le tas si trop d'entrées obsolètes
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(due, order, host) for due, order, host in self._heap
+                          if self._due.get(host) == due]
+            heapq.heapify(self._heap)
+
+    def remove(self, host: str):
+        self._due.pop(host, None)
+
+    def next_due(self) -> Optional[float]:
+        """Retourne la prochaine échéance (ou None si aucun hôte)."""
+        while self._heap:
+            due, _order, host = self._heap[0]
+            if self._due.get(host) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float, limit: Optional[int] = None) -> List[str]:
+        """
+        Retire et retourne les hôtes arrivés à échéance, puis les replanifie.
+        La prochaine échéance est calculée à partir de l'échéance précédente
+        (cadence stable) ; si l'hôte a pris plus d'un intervalle de retard, elle
+        repart de `now` pour éviter une rafale de rattrapage.
+        """
+        due_hosts = []
+        while self._heap and (limit is None or len(due_hosts) < limit):
+            due, _order, host = self._heap[0]
+            if self._due.get(host) != due:
+                heapq.heappop(self._heap)
+                continue
+            if due > now:
+                break
+            heapq.heappop(self._heap)
+            interval = self.interval_for(host)
+            next_due = due + interval
+            if next_due <= now:
+                next_due = now + interval
+            self._push(host, next_due)
+            due_hosts.append(host)
+        return due_hosts
@@ -0,0 +1,303 @@
+"""
+Moteur de sondes multi-processus (mode réparti).
+La liste des hôtes est répartie entre N processus, par hachage de l'adresse ou
+par site. Chaque processus exécute sa propre boucle de sondes (AsyncPingWorker)
+et renvoie ses résultats par lots sur un pipe : le processus principal ne fait
+plus que les relayer, le débit suit le nombre de cœurs et l'interface web
+reste réactive pendant les gros tours.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from multiprocessing.connection import wait as wait_connections
+from typing import Dict, List, Optional
+
+import src.var as var
+from src.utils.logger import get_logger
+from src.utils.headless_compat import QThread, Signal
+
+logger = get_logger(__name__)
+
+SHARD_MODES = ('hash', 'site')
+
+# Paramètres de src.var recopiés dans les processus de sonde
+_SHARED_SETTINGS = (
+    'delais', 'ping_backend', 'probe_max_inflight', 'probe_rate_pps',
+    'probe_max_web', 'probe_retry_mode', 'probe_rtt_multiplier',
+)
+
+# Envoi des résultats par lots : toutes les 100 ms ou 500 résultats
+FLUSH_INTERVAL = 0.1
+FLUSH_SIZE = 500
+# Envoi des statistiques même sans résultat
+STATS_INTERVAL = 1.0
+
+# Modification temporaire de os.environ pendant le lancement d'un processus
+_SPAWN_ENV_LOCK = threading.Lock()
+
+
+def shard_of(host: str, shards: int) -> int:
+    """Processus attribué à un hôte en mode hachage (stable d'un lancement à l'autre)."""
+    return zlib.crc32(host.encode('utf-8')) % shards
+
+
+def partition_hosts(hosts: List[str], shards: int, mode: str = 'hash',
+                    sites: Optional[Dict[str, str]] = None) -> List[List[str]]:
+    """
+    Répartit les hôtes entre `shards` processus.
+
+    Args:
+        mode: 'hash' (CRC32 de l'adresse) ou 'site' (un site entier par processus,
+              les plus gros sites d'abord dans le processus le moins chargé)
+        sites: Dict {hôte: site} utilisé en mode 'site'
+    """
+    parts = [[] for _ in range(shards)]
+    if mode == 'site':
+        groups = {}
+        for host in hosts:
+            groups.setdefault((sites or {}).get(host, ''), []).append(host)
+        for site in sorted(groups, key=lambda s: (-len(groups[s]), s)):
+            target = min(range(shards), key=lambda i: len(parts[i]))
+            parts[target].extend(groups[site])
+    else:
+        for host in hosts:
+            parts[shard_of(host, shards)].append(host)
+    return parts
+
+
+def _shard_settings(shards: int) -> dict:
+    """Paramètres d'un processus : les limites globales sont partagées entre les processus."""
+    settings = {name: getattr(var, name) for name in _SHARED_SETTINGS if hasattr(var, name)}
+    settings['probe_max_inflight'] = max(1, math.ceil(int(var.probe_max_inflight) / shards))
+    settings['probe_max_web'] = max(1, math.ceil(int(var.probe_max_web) / shards))
+    settings['probe_rate_pps'] = float(var.probe_rate_pps or 0) / shards
+    return settings
+
+
+def _apply_settings(settings: dict):
+    for name, value in (settings or {}).items():
+        setattr(var, name, value)
+    var.probe_settings_version += 1
+
+
+def _shard_main(conn, index: int, settings: dict):
+    """
+    Point d'entrée d'un processus de sonde.
+    HEADLESS est défini par le processus principal avant le lancement : il doit
+    l'être avant l'import de src.utils.headless_compat (au chargement de ce module).
+    """
+    _apply_settings(settings)
+    from src.fcy_ping import AsyncPingWorker
+
+    worker = AsyncPingWorker()
+    pending = []
+    lock = threading.Lock()
+
+    def on_results(batch):
+        with lock:
+            pending.extend((ip, latency, color, probe)
+                           for ip, latency, color, _temp, _bandwidth, probe in batch)
+
+    worker.results_signal.connect(on_results)
+
+    def reader():
+        """Commandes du processus principal : liste d'hôtes, paramètres, arrêt."""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                message = ('stop',)
+            if message[0] == 'hosts':
+                _apply_settings(message[3])
+                worker.update_hosts(message[1], message[2])
+            elif message[0] == 'stop':
+                worker.stop()
+                return
+
+    def flusher():
+        """Renvoie les résultats par lots avec les statistiques du processus."""
+        last_stats = 0.0
+        while worker.is_running:
+            time.sleep(FLUSH_INTERVAL)
+            with lock:
+                batch = pending[:]
+                pending.clear()
+            now = time.monotonic()
+            if not batch and now - last_stats < STATS_INTERVAL:
+                continue
+            last_stats = now
+            try:
+                for start in range(0, max(1, len(batch)), FLUSH_SIZE):
+                    conn.send(('results', batch[start:start + FLUSH_SIZE], dict(worker.stats)))
+            except (OSError, ValueError):
+                worker.stop()
+                return
+
+    threading.Thread(target=reader, name=f"ProbeShard{index}-reader", daemon=True).start()
+    threading.Thread(target=flusher, name=f"ProbeShard{index}-flush", daemon=True).start()
+    # Boucle de sondes dans le thread principal du processus, jusqu'à stop()
+    worker.run()
+
+
+class ShardedProbeService(QThread):
+    """
+    Remplaçant multi-processus d'AsyncPingWorker (mêmes signaux, même interface).
+    Le thread relaie les résultats des processus vers le thread principal.
+    """
+    results_signal = Signal(object)  # Lot de tuples (ip, latence, couleur, température, bandwidth, sonde)
+    ups_alert_signal = Signal(str, str)
+    cycle_signal = Signal()
+
+    # Délai avant relance d'un processus de sonde arrêté anormalement (s)
+    RESTART_DELAY = 2.0
+
+    def __init__(self, processes: int, mode: str = 'hash'):
+        super().__init__()
+        self.is_running = True
+        self.processes = max(2, int(processes))
+        self.mode = mode if mode in SHARD_MODES else 'hash'
+        self._context = multiprocessing.get_context('spawn')
+        self._shards = [None] * self.processes  # [(process, connection)]
+        self._partitions = [[] for _ in range(self.processes)]
+        self._hosts = ([], {})
+        self._send_lock = threading.Lock()
+        self._shard_stats = {}
+        self.stats = {}
+
+    def _spawn(self, index: int):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_shard_main,
+            args=(child_conn, index, _shard_settings(self.processes)),
+            name=f"PinguProbe-{index}",
+            daemon=True
+        )
+        # Pas d'interface graphique dans les processus de sonde : l'environnement est
+        # hérité au lancement, avant tout import (PySide6 n'est jamais chargé)
+        with _SPAWN_ENV_LOCK:
+            previous = os.environ.get('HEADLESS')
+            os.environ['HEADLESS'] = '1'
+            try:
+                process.start()
+            finally:
+                if previous is None:
+                    os.environ.pop('HEADLESS', None)
+                else:
+                    os.environ['HEADLESS'] = previous
+        child_conn.close()
+        self._shards[index] = (process, parent_conn)
+        logger.info(f"Processus de sonde {index} démarré (pid {process.pid})")
+
+    def start(self):
+        """Lance les processus de sonde puis le thread de relais."""
+        for index in range(self.processes):
+            self._spawn(index)
+        self._send_hosts()
+        super().start()
+
+    def _send(self, index: int, message):
+        shard = self._shards[index]
+        if shard is None:
+            return
+        try:
+            with self._send_lock:
+                shard[1].send(message)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Envoi impossible au processus de sonde {index}: {e}")
+
+    def update_hosts(self, ips, intervals=None):
+        """Répartit la liste d'hôtes entre les processus (appelable depuis n'importe quel thread)."""
+        self._hosts = (list(ips or []), dict(intervals or {}))
+        self._send_hosts()
+
+    def _send_hosts(self):
+        ips, intervals = self._hosts
+        sites = None
+        if self.mode == 'site':
+            try:
+                from src.host_manager import HostManager
+                sites = {h.get('ip'): h.get('site', '') for h in HostManager().get_all_hosts()}
+            except Exception as e:
+                logger.debug(f"Sites indisponibles pour la répartition: {e}")
+        self._partitions = partition_hosts(ips, self.processes, self.mode, sites)
+        settings = _shard_settings(self.processes)
+        for index, part in enumerate(self._partitions):
+            part_intervals = {ip: intervals[ip] for ip in part if ip in intervals}
+            self._send(index, ('hosts', part, part_intervals, settings))
+
+    def run(self):
+        """Relaie les résultats des processus et émet cycle_signal à chaque intervalle."""
+        next_cycle = time.monotonic() + max(1, int(var.delais))
+        try:
+            while self.is_running:
+                connections = {shard[1]: index for index, shard in enumerate(self._shards) if shard}
+                timeout = max(0.05, min(0.5, next_cycle - time.monotonic()))
+                for conn in wait_connections(list(connections), timeout=timeout):
+                    index = connections[conn]
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError):
+                        self._on_shard_exit(index)
+                        continue
+                    if message[0] == 'results':
+                        self._shard_stats[index] = message[2]
+                        if message[1]:
+                            self.results_signal.emit([(ip, latency, color, None, None, probe)
+                                                      for ip, latency, color, probe in message[1]])
+                self._update_stats()
+
+                if time.monotonic() >= next_cycle:
+                    self.cycle_signal.emit()
+                    next_cycle = time.monotonic() + max(1, int(var.delais))
+        except Exception as e:
+            logger.error(f"Erreur relais des processus de sonde: {e}", exc_info=True)
+        finally:
+            self._stop_shards()
+
+    def _on_shard_exit(self, index: int):
+        """Un processus s'est arrêté : relance et renvoi de sa part de la liste."""
+        process, conn = self._shards[index]
+        self._shards[index] = None
+        conn.close()
+        process.join(0.5)
+        if not self.is_running:
+            return
+        logger.warning(f"Processus de sonde {index} arrêté (code {process.exitcode}), relance...")
+        time.sleep(self.RESTART_DELAY)
+        if not self.is_running:
+            return
+        self._spawn(index)
+        part = self._partitions[index] if index < len(self._partitions) else []
+        intervals = self._hosts[1]
+        self._send(index, ('hosts', part, {ip: intervals[ip] for ip in part if ip in intervals},
+                           _shard_settings(self.processes)))
+
+    def _update_stats(self):
+        stats = {'processes': self.processes, 'shard_mode': self.mode}
+        for shard_stats in self._shard_stats.values():
+            for key, value in shard_stats.items():
+                if isinstance(value, (int, float)):
+                    stats[key] = stats.get(key, 0) + value
+        self.stats = stats
+
+    def _stop_shards(self):
+        for index in range(self.processes):
+            self._send(index, ('stop',))
+        deadline = time.monotonic() + 3.0
+        for shard in self._shards:
+            if shard is None:
+                continue
+            process, conn = shard
+            process.join(max(0.1, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+            conn.close()
+        self._shards = [None] * self.processes
+
+    def stop(self):
+        self.is_running = False
@@ -0,0 +1,68 @@
+"""
+Limiteur de débit à seau de jetons (token bucket) pour les sondes.
+Plafonne le nombre de paquets émis par seconde pour ne pas saturer les liens WAN.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Seau de jetons asynchrone.
+    `rate` jetons sont ajoutés par seconde, jusqu'à `capacity` (rafale maximale).
+    Un débit <= 0 désactive la limitation.
+    """
+
+    def __init__(self, rate: float = 0, capacity: float = None):
+        self._lock = None
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self.rate = 0.0
+        self.capacity = 1.0
+        self.set_rate(rate, capacity)
+        # Seau plein au démarrage : une rafale initiale est autorisée
+        self._tokens = self.capacity
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def set_rate(self, rate: float, capacity: float = None):
+        """Modifie le débit (jetons/s) ; la capacité par défaut vaut une seconde de débit."""
+        rate = float(rate or 0)
+        self._refill()
+        self.rate = max(0.0, rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Consomme des jetons sans attendre. Retourne False si insuffisants."""
+        if not self.enabled:
+            return True
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1):
+        """Attend que `tokens` jetons soient disponibles puis les consomme (ordre FIFO)."""
+        if not self.enabled:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while self.enabled:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -0,0 +1,157 @@
+"""
+Politique de nouvelle tentative des sondes ICMP.
+Adapte le nombre de paquets, leur délai d'attente et leur envoi (successif ou
+en parallèle) à l'historique de chaque hôte :
+- hôte déjà hors service : une seule sonde courte pour confirmer ;
+- hôte instable (pertes récentes) : paquets redondants envoyés en parallèle ;
+- hôte stable : sonde normale puis nouvelle tentative parallèle en cas d'échec.
+Les délais d'attente suivent le RTT observé (multiple du p99).
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class Attempt:
+    """
+    Une tentative : `count` paquets espacés de `interval` s, attente `timeout` s,
+    lancée après une pause de `delay` s.
+    """
+    __slots__ = ('count', 'timeout', 'interval', 'delay')
+
+    def __init__(self, count: int, timeout: float, interval: float = 0.2, delay: float = 0.0):
+        self.count = count
+        self.timeout = timeout
+        self.interval = interval
+        self.delay = delay
+
+    @property
+    def hedged(self) -> bool:
+        """Paquets redondants envoyés en parallèle : comptés comme une seule sonde."""
+        return self.count > 1 and self.interval <= 0
+
+    def __repr__(self):
+        return (f"Attempt(count={self.count}, timeout={self.timeout}, "
+                f"interval={self.interval}, delay={self.delay})")
+
+
+class _HostHistory:
+    """Historique récent d'un hôte (RTT et résultats)."""
+    __slots__ = ('rtts', 'outcomes', 'down')
+
+    def __init__(self, window: int):
+        self.rtts = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.down = False
+
+
+class RetryPolicy:
+    """
+    Planifie les tentatives de sonde d'un hôte et mémorise leurs résultats.
+    Non thread-safe : utilisée uniquement depuis la boucle asyncio du worker.
+    """
+
+    MODES = ('adaptive', 'classic')
+
+    def __init__(self, mode: str = 'adaptive', base_timeout: float = 4.0,
+                 rtt_multiplier: float = 4.0, min_timeout: float = 0.5,
+                 down_timeout: float = 1.0, hedge_count: int = 3,
+                 window: int = 50, min_samples: int = 5, flaky_window: int = 10):
+        """
+        Args:
+            mode: 'adaptive' ou 'classic' (comportement historique : 2 puis 3 paquets)
+            base_timeout: Délai d'attente sans historique (s)
+            rtt_multiplier: Délai adaptatif = rtt_multiplier × p99 du RTT
+            min_timeout: Borne basse du délai adaptatif (s)
+            down_timeout: Délai de la sonde de confirmation d'un hôte hors service (s)
+            hedge_count: Nombre de paquets envoyés en parallèle
+            window: Nombre de mesures conservées par hôte
+            min_samples: Mesures nécessaires avant d'adapter le délai
+            flaky_window: Nombre de résultats récents examinés pour détecter l'instabilité
+        """
+        self.mode = mode if mode in self.MODES else 'adaptive'
+        self.base_timeout = base_timeout
+        self.rtt_multiplier = rtt_multiplier
+        self.min_timeout = min_timeout
+        self.down_timeout = down_timeout
+        self.hedge_count = max(1, int(hedge_count))
+        self.window = window
+        self.min_samples = min_samples
+        self.flaky_window = flaky_window
+        self._hosts: Dict[str, _HostHistory] = {}
+
+    def _history(self, host: str) -> _HostHistory:
+        history = self._hosts.get(host)
+        if history is None:
+            history = _HostHistory(self.window)
+            self._hosts[host] = history
+        return history
+
+    def forget_missing(self, hosts: Iterable[str]):
+        """Oublie l'historique des hôtes qui ne sont plus surveillés."""
+        keep = set(hosts)
+        for host in list(self._hosts):
+            if host not in keep:
+                del self._hosts[host]
+
+    def p99(self, host: str) -> Optional[float]:
+        """p99 des RTT récents en ms (None si historique insuffisant)."""
+        history = self._hosts.get(host)
+        if history is None or len(history.rtts) < self.min_samples:
+            return None
+        rtts = sorted(history.rtts)
+        return rtts[int(0.99 * (len(rtts) - 1))]
+
+    def timeout_for(self, host: str) -> float:
+        """Délai d'attente adaptatif (s), borné par [min_timeout, base_timeout]."""
+        p99 = self.p99(host)
+        if p99 is None:
+            return self.base_timeout
+        timeout = self.rtt_multiplier * p99 / 1000.0
+        return round(max(self.min_timeout, min(self.base_timeout, timeout)), 3)
+
+    def is_down(self, host: str) -> bool:
+        history = self._hosts.get(host)
+        return history is not None and history.down
+
+    def is_flaky(self, host: str) -> bool:
+        """Hôte joignable mais avec au moins un échec parmi les derniers résultats."""
+        history = self._hosts.get(host)
+        if history is None or history.down:
+            return False
+        recent = list(history.outcomes)[-self.flaky_window:]
+        return False in recent
+
+    def plan(self, host: str) -> List[Attempt]:
+        """Retourne la liste ordonnée des tentatives pour la prochaine sonde de l'hôte."""
+        if self.mode == 'classic':
+            return [Attempt(2, self.base_timeout), Attempt(3, 3.0, delay=0.5)]
+
+        timeout = self.timeout_for(host)
+        if self.is_down(host):
+            # Confirmation rapide : un seul paquet court (allongé si le RTT connu l'exige)
+            if self.p99(host) is not None:
+                return [Attempt(1, max(self.down_timeout, timeout))]
+            return [Attempt(1, self.down_timeout)]
+        if self.is_flaky(host):
+            # Paquets redondants en parallèle, la première réponse suffit
+            return [Attempt(self.hedge_count, timeout, interval=0)]
+        # Sans historique, la nouvelle tentative parallèle attend moitié moins longtemps
+        retry_timeout = timeout if self.p99(host) is not None else self.base_timeout / 2
+        return [Attempt(2, timeout), Attempt(self.hedge_count, retry_timeout, interval=0)]
+
+    def record(self, host: str, latency: Optional[float], attempts: int = 1):
+        """
+        Mémorise le résultat final d'une sonde.
+
+        Args:
+            latency: Latence en ms (None ou >= 500 : échec)
+            attempts: Nombre de tentatives utilisées (un succès après nouvelle
+                tentative compte comme une perte pour la détection d'instabilité)
+        """
+        history = self._history(host)
+        success = latency is not None and latency < 500.0
+        history.outcomes.append(success and attempts == 1)
+        history.down = not success
+        if success:
+            history.rtts.append(latency)
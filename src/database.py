@@ -72,6 +72,13 @@ def init_db():
         )
         ''')
         
+        # Intervalle de sondage spécifique par hôte (migration)
+        try:
+            cursor.execute('ALTER TABLE host_settings ADD COLUMN probe_interval REAL DEFAULT NULL')
+            logger.info("Colonne 'probe_interval' ajoutée à la table host_settings")
+        except sqlite3.OperationalError:
+            pass  # Colonne existe déjà
+        
         conn.commit()
         logger.info("Base de données initialisée avec succès")
         return True
@@ -107,6 +114,30 @@ def get_host_notification_settings(ip):
     finally:
         conn.close()
 
+def get_hosts_notification_settings():
+    """
+    Récupère les paramètres de notification de tous les hôtes configurés.
+    Retourne un dict {ip: {'email': bool, 'telegram': bool}} (hôtes absents : défaut activé).
+    """
+    conn = get_db_connection()
+    if not conn:
+        return {}
+        
+    try:
+        rows = conn.execute('SELECT host_ip, email_enabled, telegram_enabled FROM host_settings').fetchall()
+        return {
+            row['host_ip']: {
+                'email': bool(row['email_enabled']),
+                'telegram': bool(row['telegram_enabled'])
+            }
+            for row in rows
+        }
+    except Exception as e:
+        logger.error(f"Erreur lecture settings hosts: {e}")
+        return {}
+    finally:
+        conn.close()
+
 def set_host_notification_settings(ip, email_enabled, telegram_enabled):
     """Définit les paramètres de notification pour une IP"""
     conn = get_db_connection()
@@ -130,6 +161,51 @@ def set_host_notification_settings(ip, email_enabled, telegram_enabled):
     finally:
         conn.close()
 
+def get_host_probe_intervals():
+    """
+    Récupère les intervalles de sondage spécifiques.
+    Retourne un dict {ip: secondes} (les hôtes sans intervalle spécifique sont absents).
+    """
+    conn = get_db_connection()
+    if not conn:
+        return {}
+        
+    try:
+        rows = conn.execute('SELECT host_ip, probe_interval FROM host_settings WHERE probe_interval > 0').fetchall()
+        return {row['host_ip']: float(row['probe_interval']) for row in rows}
+    except Exception as e:
+        logger.debug(f"Erreur lecture intervalles de sondage: {e}")
+        return {}
+    finally:
+        conn.close()
+
+def get_host_probe_interval(ip):
+    """Retourne l'intervalle de sondage spécifique d'une IP (None = intervalle global)."""
+    return get_host_probe_intervals().get(ip)
+
+def set_host_probe_interval(ip, interval):
+    """Définit l'intervalle de sondage d'une IP (None ou 0 = intervalle global)"""
+    conn = get_db_connection()
+    if not conn:
+        return False
+        
+    try:
+        value = float(interval) if interval else None
+        conn.execute('''
+        INSERT INTO host_settings (host_ip, probe_interval, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(host_ip) DO UPDATE SET
+            probe_interval = excluded.probe_interval,
+            updated_at = CURRENT_TIMESTAMP
+        ''', (ip, value))
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Erreur écriture intervalle host {ip}: {e}")
+        return False
+    finally:
+        conn.close()
+
 # --- Fonctions pour les tableaux de bord ---
 
 def create_dashboard(name, user_id=None):
@@ -78,6 +78,41 @@ def save_param_gene(param_site, param_li, param_theme, param_advanced_title=None
         logger.error(f"Erreur sauvegarde param gene: {inst}", exc_info=True)
 
 
+def load_probe_params():
+    """Charge les paramètres du pipeline de sondes (parallélisme et débit) dans var."""
+    try:
+        config = secure_config.load_general_config()
+        var.probe_max_inflight = max(1, int(config.get('probe_max_inflight', var.probe_max_inflight)))
+        var.probe_rate_pps = max(0, float(config.get('probe_rate_pps', var.probe_rate_pps)))
+        var.probe_max_web = max(1, int(config.get('probe_max_web', var.probe_max_web)))
+        if config.get('probe_retry_mode') in ('adaptive', 'classic'):
+            var.probe_retry_mode = config['probe_retry_mode']
+        var.probe_rtt_multiplier = max(1.0, float(config.get('probe_rtt_multiplier', var.probe_rtt_multiplier)))
+        var.probe_processes = max(0, int(config.get('probe_processes', var.probe_processes)))
+        if config.get('probe_shard_mode') in ('hash', 'site'):
+            var.probe_shard_mode = config['probe_shard_mode']
+        var.web_broadcast_window_ms = max(0, min(5000, int(config.get('web_broadcast_window_ms', var.web_broadcast_window_ms))))
+        var.probe_settings_version += 1
+    except Exception as inst:
+        logger.error(f"Erreur lecture param sondes: {inst}", exc_info=True)
+
+def save_probe_params():
+    """Sauvegarde les paramètres du pipeline de sondes."""
+    try:
+        secure_config.save_general_config(
+            probe_max_inflight=int(var.probe_max_inflight),
+            probe_rate_pps=float(var.probe_rate_pps),
+            probe_max_web=int(var.probe_max_web),
+            probe_retry_mode=var.probe_retry_mode,
+            probe_rtt_multiplier=float(var.probe_rtt_multiplier),
+            probe_processes=int(var.probe_processes),
+            probe_shard_mode=var.probe_shard_mode,
+            web_broadcast_window_ms=int(var.web_broadcast_window_ms)
+        )
+    except Exception as inst:
+        logger.error(f"Erreur sauvegarde param sondes: {inst}", exc_info=True)
+
+
 """**************
     DB Param
 **************"""
@@ -1,14 +1,26 @@
 import time
 import asyncio
 import platform
+import math
+import queue
 import re
+from collections import deque
 import sys
 import subprocess
 import shutil
 import src.var as var
 from src.utils.logger import get_logger
 from src.utils.colors import AppColors
-from src.database import get_host_notification_settings
+from src.database import (
+    get_host_notification_settings, get_hosts_notification_settings, get_host_probe_intervals
+)
+from src.core.probe_scheduler import ProbeScheduler
+from src.core.rate_limiter import TokenBucket
+from src.core.retry_policy import RetryPolicy
+from src.core.probe_result import ProbeResult
+from src.utils.dns_cache import dns_cache
+from src.utils.bandwidth_store import bandwidth_store
+from src.latency_history import get_latency_history
 
 # Initialize logger first
 logger = get_logger(__name__)
@@ -32,6 +44,11 @@ from src.utils.headless_compat import (
 
 logger = get_logger(__name__)
 
+# Moteur ICMP natif (repli automatique sur la commande ping si indisponible)
+from src.utils.icmp_engine import ICMPEngine
+
+IPV4_PATTERN = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
+
 # Import du parser d'URL pour gérer les ports
 try:
     from src.utils.url_parser import parse_host_port
@@ -73,13 +90,19 @@ async def check_tcp_port(host, port, timeout=2):
     Returns:
         float: Temps de réponse en ms si succès, 500.0 si échec
     """
-    import time
+    # Résolution hors mesure (cache DNS partagé)
+    try:
+        target = await dns_cache.resolve(host)
+    except OSError as e:
+        logger.debug(f"TCP check: résolution impossible pour {host}: {e}")
+        return 500.0
+    
     start_time = time.time()
     
     try:
         # Tenter une connexion TCP
         reader, writer = await asyncio.wait_for(
-            asyncio.open_connection(host, port),
+            asyncio.open_connection(target, port),
             timeout=timeout
         )
         
@@ -113,18 +136,95 @@ except ImportError as e:
 
 class AsyncPingWorker(QThread):
     """
-    Thread dédié à l'exécution de la boucle d'événements asyncio.
+    Service de sondage : un thread et une boucle asyncio pour toute la durée du monitoring.
+    Chaque hôte est sondé selon sa propre échéance (ProbeScheduler). La liste des
+    hôtes arrive du thread principal par une file thread-safe (update_hosts) et les
+    ressources partagées (socket ICMP, sessions, caches) survivent entre les tours.
     """
-    result_signal = Signal(str, float, str, object, object)  # ip, latence, couleur, température, bandwidth
+    # Lot de résultats : liste de tuples (ip, latence, couleur, température, bandwidth, sonde)
+    results_signal = Signal(object)
     ups_alert_signal = Signal(str, str)  # ip, message d'alerte UPS
+    cycle_signal = Signal()  # Émis à chaque intervalle global (remplace la fin de vague)
+
+    # Temps de sommeil maximal de la boucle d'ordonnancement
+    MAX_IDLE = 0.5
+    # Envoi des résultats par lots : au plus tard 100 ms après le premier, ou dès 200 résultats
+    FLUSH_INTERVAL = 0.1
+    FLUSH_SIZE = 200
 
-    def __init__(self, ips, traffic_cache=None):
+    def __init__(self, traffic_cache=None):
         super().__init__()
-        self.ips = ips
         self.is_running = True
         self.system = platform.system().lower()
         # Cache pour stocker les données de trafic précédentes (pour calculer le débit)
         self.traffic_cache = traffic_cache if traffic_cache is not None else {}
+        # Moteur ICMP natif (ouvert dans la boucle du thread)
+        self.icmp_engine = None
+        # Échéances de sondage par hôte
+        self.scheduler = ProbeScheduler(max(1, int(var.delais)))
+        # Hôtes dont la sonde est en cours (pas de chevauchement pour un même hôte)
+        self._in_flight = set()
+        # Files d'attente des hôtes arrivés à échéance (IP et sites web séparés)
+        self._queue_ip = deque()
+        self._queue_web = deque()
+        self._queued = set()
+        self._active_ip = 0
+        self._active_web = 0
+        # Limiteur de débit global (paquets/s), partagé par tous les types de sonde
+        self.rate_limiter = TokenBucket(getattr(var, 'probe_rate_pps', 0))
+        # Tentatives ICMP adaptées à l'historique de chaque hôte
+        self.retry_policy = RetryPolicy(
+            mode=getattr(var, 'probe_retry_mode', 'adaptive'),
+            base_timeout=2 if self.system == "windows" else 4,
+            rtt_multiplier=getattr(var, 'probe_rtt_multiplier', 4.0)
+        )
+        # Statistiques du pipeline (lues depuis d'autres threads : dict remplacé, jamais modifié)
+        self._probes_total = 0
+        self._skipped_total = 0
+        self.stats = {}
+        # File thread-safe des mises à jour de la liste d'hôtes (thread principal -> boucle)
+        self._host_updates = queue.Queue()
+        self._loop = None
+        self._wakeup = None
+        # Résultats en attente d'envoi vers le thread principal
+        self._results = []
+        self._flush_at = None
+        # Version des paramètres de sonde déjà appliqués (var.probe_settings_version)
+        self._settings_version = None
+
+    def update_hosts(self, ips, intervals=None):
+        """
+        Transmet une nouvelle liste d'hôtes au service (appelable depuis n'importe quel thread).
+        
+        Args:
+            ips: Liste des adresses à sonder
+            intervals: Dict {ip: secondes} des intervalles spécifiques
+        """
+        self._host_updates.put((list(ips or []), dict(intervals or {})))
+        self._wake()
+
+    def _wake(self):
+        """Réveille la boucle d'ordonnancement si elle attend."""
+        loop = self._loop
+        if loop is not None and self._wakeup is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # Boucle en cours de fermeture
+
+    def _open_icmp_engine(self, loop):
+        """Ouvre le moteur ICMP natif selon var.ping_backend."""
+        backend = getattr(var, 'ping_backend', 'auto')
+        if backend == 'subprocess':
+            return None
+        engine = ICMPEngine()
+        if engine.open(loop):
+            return engine
+        if backend == 'icmp':
+            logger.warning("Moteur ICMP natif demandé mais indisponible, repli sur la commande ping")
+        else:
+            logger.debug("Moteur ICMP natif indisponible, utilisation de la commande ping")
+        return None
 
     def run(self):
         """Point d'entrée du thread."""
@@ -138,49 +238,227 @@ class AsyncPingWorker(QThread):
             
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.ping_all(self.ips))
-            loop.close()
+            self._loop = loop
+            try:
+                loop.run_until_complete(self._startup())
+                loop.run_until_complete(self.run_schedule())
+            finally:
+                loop.run_until_complete(self._shutdown())
+                self._loop = None
+                loop.close()
         except Exception as e:
             logger.error(f"Erreur boucle asyncio: {e}", exc_info=True)
 
+    async def _startup(self):
+        """Ouvre les ressources partagées pour toute la durée du service."""
+        self._wakeup = asyncio.Event()
+        self.icmp_engine = self._open_icmp_engine(asyncio.get_event_loop())
+        if self.icmp_engine:
+            self.icmp_engine.rate_limiter = self.rate_limiter
+
+    async def _shutdown(self):
+        """Libère les ressources partagées à l'arrêt du service."""
+        if self.icmp_engine:
+            self.icmp_engine.close()
+            self.icmp_engine = None
+        if HTTP_CHECKER_AVAILABLE and http_checker:
+            try:
+                await http_checker.close()
+            except Exception as e:
+                logger.debug(f"Erreur fermeture session HTTP: {e}")
+
     def stop(self):
         self.is_running = False
+        self._wake()
+
+    def _apply_host_updates(self, now):
+        """Applique la dernière liste d'hôtes reçue du thread principal."""
+        latest = None
+        while True:
+            try:
+                latest = self._host_updates.get_nowait()
+            except queue.Empty:
+                break
+        if latest is None:
+            return
+        
+        ips, intervals = latest
+        self.scheduler.set_default_interval(max(1, int(var.delais)))
+        self.scheduler.set_intervals(intervals)
+        self.scheduler.set_hosts(ips, now)
+        self.retry_policy.forget_missing(ips)
+
+    def _max_inflight(self):
+        """Limite de sondes IP simultanées (var.probe_max_inflight)."""
+        try:
+            return max(1, int(getattr(var, 'probe_max_inflight', 100)))
+        except (TypeError, ValueError):
+            return 100
 
-    async def ping_all(self, ips):
+    def _max_web(self):
+        """Limite de vérifications de sites web simultanées (var.probe_max_web)."""
+        try:
+            return max(1, int(getattr(var, 'probe_max_web', 10)))
+        except (TypeError, ValueError):
+            return 10
+
+    def _apply_probe_settings(self):
+        """Répercute les changements de débit et de politique de nouvelle tentative."""
+        version = getattr(var, 'probe_settings_version', 0)
+        if version == self._settings_version:
+            return
+        self._settings_version = version
+        mode = getattr(var, 'probe_retry_mode', 'adaptive')
+        if mode in RetryPolicy.MODES:
+            self.retry_policy.mode = mode
+        try:
+            self.retry_policy.rtt_multiplier = max(1.0, float(getattr(var, 'probe_rtt_multiplier', 4.0)))
+        except (TypeError, ValueError):
+            pass
+
+        try:
+            rate = max(0.0, float(getattr(var, 'probe_rate_pps', 0) or 0))
+        except (TypeError, ValueError):
+            rate = 0.0
+        if rate != self.rate_limiter.rate:
+            self.rate_limiter.set_rate(rate)
+            logger.info(f"Limite de débit des sondes: {rate or 'illimitée'} paquets/s")
+
+    def _enqueue_due(self, now):
+        """Place les hôtes arrivés à échéance dans les files d'attente."""
+        for host in self.scheduler.pop_due(now):
+            if host in self._in_flight or host in self._queued:
+                # Sonde précédente encore en cours ou en attente : on saute ce tour
+                self._skipped_total += 1
+                continue
+            if self._is_url(host):
+                self._queue_web.append(host)
+            else:
+                self._queue_ip.append(host)
+            self._queued.add(host)
+
+    def _dispatch(self, loop, tasks):
+        """Lance les sondes en attente dans la limite de parallélisme."""
+        max_inflight = self._max_inflight()
+        while self._queue_ip and self._active_ip < max_inflight:
+            self._start_probe(loop, tasks, self._queue_ip.popleft(), web=False)
+        # Sites web : parallélisme propre, les connexions du pool HTTP sont réutilisées
+        max_web = self._max_web()
+        while self._queue_web and self._active_web < max_web:
+            self._start_probe(loop, tasks, self._queue_web.popleft(), web=True)
+
+        self.stats = {
+            'hosts': len(self.scheduler),
+            'queued': len(self._queue_ip) + len(self._queue_web),
+            'in_flight': self._active_ip + self._active_web,
+            'max_inflight': max_inflight,
+            'web_in_flight': self._active_web,
+            'max_web': max_web,
+            'rate_pps': self.rate_limiter.rate,
+            'probes_total': self._probes_total,
+            'skipped_total': self._skipped_total,
+        }
+
+    def _start_probe(self, loop, tasks, host, web):
+        self._queued.discard(host)
+        if host not in self.scheduler:
+            return  # Retiré de la liste pendant l'attente
+        if web:
+            self._active_web += 1
+        else:
+            self._active_ip += 1
+        self._probes_total += 1
+        task = loop.create_task(self._probe(host, web))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def run_schedule(self):
         """
-        Lance les pings de manière optimisée :
-        - Sites web (URLs) : testés séquentiellement pour éviter les pertes
-        - Adresses IP : testées en parallèle par lots de 20 pour la performance
+        Boucle d'ordonnancement : lance la sonde de chaque hôte à son échéance.
+        Les sondes sont réparties sur l'intervalle, la charge reste donc régulière
+        et un hôte lent ne retarde plus les autres. Les hôtes dus attendent dans
+        une file tant que la limite de sondes simultanées est atteinte.
         """
-        # Séparer les sites web des adresses IP
-        websites = []
-        ip_addresses = []
+        loop = asyncio.get_event_loop()
+        tasks = set()
         
-        for ip in ips:
-            if self._is_url(ip):
-                websites.append(ip)
-            else:
-                ip_addresses.append(ip)
+        next_cycle = loop.time() + self.scheduler.default_interval
         
-        # 1. Tester les sites web de manière SÉQUENTIELLE (un par un)
-        if websites:
-            logger.info(f"Test séquentiel de {len(websites)} site(s) web...")
-            for website in websites:
-                if not self.is_running:
-                    break
-                await self.ping_host(website)
-        
-        # 2. Tester les adresses IP en PARALLÈLE par lots (comme avant)
-        if ip_addresses:
-            logger.debug(f"Test parallèle de {len(ip_addresses)} adresse(s) IP...")
-            batch_size = 20  # Nombre d'hôtes testés en parallèle
-            for i in range(0, len(ip_addresses), batch_size):
-                if not self.is_running:
-                    break
-                batch = ip_addresses[i:i + batch_size]
-                # Lance les pings en parallèle
-                tasks = [self.ping_host(ip) for ip in batch]
-                await asyncio.gather(*tasks)
+        while self.is_running:
+            now = loop.time()
+            self._apply_host_updates(now)
+            self._apply_probe_settings()
+            self._enqueue_due(now)
+            self._dispatch(loop, tasks)
+            
+            if self._results and (len(self._results) >= self.FLUSH_SIZE or now >= self._flush_at):
+                self._flush_results()
+            
+            if now >= next_cycle:
+                self.cycle_signal.emit()
+                next_cycle = now + self.scheduler.default_interval
+            
+            wake = next_cycle
+            next_due = self.scheduler.next_due()
+            if next_due is not None:
+                wake = min(wake, next_due)
+            if self._results:
+                wake = min(wake, self._flush_at)
+            
+            # Attente jusqu'à la prochaine échéance, une fin de sonde ou une mise à jour de la liste
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=min(self.MAX_IDLE, max(0.01, wake - loop.time()))
+                )
+            except asyncio.TimeoutError:
+                pass
+        
+        # Arrêt : annuler les sondes en cours et vider les files
+        self._queue_ip.clear()
+        self._queue_web.clear()
+        self._queued.clear()
+        for task in list(tasks):
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush_results()
+
+    def _queue_result(self, ip, latency, color, temperature, bandwidth, probe):
+        """Met un résultat en attente ; il partira avec le prochain lot."""
+        if not self._results:
+            self._flush_at = asyncio.get_event_loop().time() + self.FLUSH_INTERVAL
+        self._results.append((ip, latency, color, temperature, bandwidth, probe))
+        if len(self._results) >= self.FLUSH_SIZE and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _flush_results(self):
+        """Envoie les résultats en attente au thread principal en un seul signal."""
+        if not self._results:
+            return
+        batch, self._results = self._results, []
+        self._flush_at = None
+        self.results_signal.emit(batch)
+
+    async def _probe(self, host, web=False):
+        """Sonde un hôte puis libère sa place dans le pipeline."""
+        self._in_flight.add(host)
+        try:
+            await self.ping_host(host)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erreur sonde {host}: {e}", exc_info=True)
+        finally:
+            self._in_flight.discard(host)
+            if web:
+                self._active_web -= 1
+            else:
+                self._active_ip -= 1
+            # Une place s'est libérée : relancer la distribution
+            if self._wakeup is not None:
+                self._wakeup.set()
 
     async def ping_host(self, ip):
         """Ping un hôte spécifique de manière asynchrone via le système ou HTTP pour les sites web."""
@@ -188,6 +466,7 @@ class AsyncPingWorker(QThread):
             return
 
         latency = 500.0  # Valeur par défaut (Timeout/Erreur)
+        probe = None  # Statistiques de la rafale (ProbeResult)
         original_address = ip
         
         # Parser l'adresse pour extraire l'hôte et le port si présent
@@ -209,6 +488,7 @@ class AsyncPingWorker(QThread):
         if is_website and HTTP_CHECKER_AVAILABLE and http_checker:
             # Mode site web: utiliser HTTP checker
             try:
+                await self.rate_limiter.acquire()
                 logger.info(f"[HTTP] Vérification du site web: {original_address}")
                 result = await http_checker.check_website(original_address)
                 
@@ -225,10 +505,12 @@ class AsyncPingWorker(QThread):
             except Exception as e:
                 logger.error(f"[HTTP] Exception lors de la vérification de {original_address}: {e}", exc_info=True)
                 latency = 500.0
+            probe = ProbeResult.single(latency)
         
         # Cas 2: IP ou domaine avec port personnalisé -> TCP check
         elif has_custom_port and port:
             try:
+                await self.rate_limiter.acquire()
                 logger.info(f"[TCP] Vérification TCP sur {host}:{port}")
                 latency = await check_tcp_port(host, port, timeout=2)
                 
@@ -239,191 +521,186 @@ class AsyncPingWorker(QThread):
             except Exception as e:
                 logger.error(f"[TCP] Exception lors de la vérification de {host}:{port}: {e}", exc_info=True)
                 latency = 500.0
+            probe = ProbeResult.single(latency)
         
         # Cas 3: IP ou domaine sans port -> ICMP ping classique
         else:
-            # Mode ICMP classique pour les IP
+            # Résolution DNS préalable pour les noms d'hôtes (cache partagé, TTL respecté)
+            # Cela évite que la commande ping n'échoue ou ne prenne trop de temps sur le DNS
+            # et permet de préciser l'erreur
+            target_ip = host
             try:
-                # Résolution DNS préalable pour les noms d'hôtes
-                # Cela évite que la commande ping n'échoue ou ne prenne trop de temps sur le DNS
-                # et permet de préciser l'erreur
-                target_ip = host
+                target_ip = await dns_cache.resolve(host)
+            except Exception as e:
+                 logger.warning(f"Échec résolution DNS pour {host}: {e}")
+                 # On continue quand même avec le nom, au cas où (ex: mDNS local, etc)
+                 target_ip = host
+
+            # Tentatives selon l'historique de l'hôte (voir RetryPolicy) :
+            # hôte HS -> 1 paquet court, hôte instable -> paquets en parallèle,
+            # sinon 2 paquets puis nouvelle tentative parallèle en cas d'échec
+            # Les paquets de toutes les tentatives sont cumulés dans un seul résultat
+            attempts = self.retry_policy.plan(ip)
+            probe = ProbeResult()
+            used = 0
+            for index, attempt in enumerate(attempts):
+                if index and not self.is_running:
+                    break
+                used += 1
                 try:
-                    # Ne pas résoudre si c'est déjà une IP (simple check)
-                    if not re.match(r'^(\d{1,3}\.){3}\d{1,3}$', host):
-                         import socket
-                         target_ip = await asyncio.get_event_loop().run_in_executor(
-                             None, 
-                             socket.gethostbyname, 
-                             host
-                         )
-                         logger.debug(f"Résolution DNS: {host} -> {target_ip}")
+                    if attempt.delay:
+                        await asyncio.sleep(attempt.delay)
+                    if index:
+                        logger.debug(f"[RETRY] Tentative {index + 1} pour {host} ({attempt})")
+                    result = await self.icmp_ping(host, target_ip, count=attempt.count,
+                                                  timeout=attempt.timeout, interval=attempt.interval)
                 except Exception as e:
-                     logger.warning(f"Échec résolution DNS pour {host}: {e}")
-                     # On continue quand même avec le nom, au cas où (ex: mDNS local, etc)
-                     target_ip = host
+                    logger.error(f"Erreur ping {host}: {e}")
+                    result = ProbeResult(1 if attempt.hedged else attempt.count)
+                probe = probe.merge(result)
+                if result.received:
+                    if index:
+                        logger.info(f"[RETRY] {host} récupéré à la tentative {index + 1} ({result.latency}ms)")
+                    break
+            latency = probe.latency
+            self.retry_policy.record(ip, latency, used)
 
-                # Commande selon l'OS
-                if self.system == "windows":
-                    # -n 2 : deux pings
-                    # -w 2000 : timeout 2000ms
-                    # -4 : forcer IPv4
-                    cmd = ["ping", "-n", "2", "-w", "2000", "-4", target_ip]
-                else:
-                    # -c 2 : deux pings
-                    # -W 4 : timeout 4s (augmenté pour éviter les faux positifs)
-                    # Utiliser le chemin complet pour éviter "No such file or directory"
-                    ping_path = shutil.which("ping") or "/usr/bin/ping"
-                    cmd = [ping_path, "-c", "2", "-W", "4", target_ip]
-
-                # Création du sous-processus
-                # Sur Windows, masquer la fenêtre CMD
+        # Interrogation SNMP pour la température uniquement (optimisé pour beaucoup d'équipements)
+        # Les débits sont récupérés par le serveur web à la demande (non-bloquant)
+        temperature = None
+        bandwidth = None
+        # La récupération SNMP est maintenant gérée par le SNMPWorker dédié
+        
+        # Emission du résultat
+        color = AppColors.get_latency_color(latency)
+        self._queue_result(ip, latency, color, temperature, bandwidth,
+                           probe.to_dict() if probe is not None else None)
+    
+    async def icmp_ping(self, host, target_ip, count, timeout, interval=0.2):
+        """
+        Ping ICMP via le moteur natif si disponible, sinon via la commande système.
+        Avec interval=0 (paquets redondants en parallèle), la rafale compte pour une
+        seule sonde (ProbeResult.from_hedged).
+        
+        Returns:
+            ProbeResult: Statistiques de la rafale (latency = 500.0 si aucune réponse)
+        """
+        hedged = count > 1 and interval <= 0
+        if self.icmp_engine and self.icmp_engine.is_open and IPV4_PATTERN.match(target_ip):
+            try:
+                rtts = await self.icmp_engine.ping(target_ip, count=count, timeout=timeout,
+                                                   interval=interval)
+                result = ProbeResult.from_hedged(rtts) if hedged else ProbeResult.from_samples(rtts)
+                if not result.received:
+                    logger.debug(f"Ping ICMP sans réponse pour {host} ({count} paquets)")
+                return result
+            except Exception as e:
+                logger.debug(f"Erreur moteur ICMP pour {host}, repli sur la commande ping: {e}")
+        
+        result = await self._ping_subprocess(host, target_ip, count, timeout)
+        return ProbeResult.from_hedged(result.rtts) if hedged else result
+
+    async def _ping_subprocess(self, host, target_ip, count, timeout):
+        """Ping via la commande système `ping` (backend de repli)."""
+        result = ProbeResult(count)
+        try:
+            # Un jeton par paquet envoyé par la commande
+            await self.rate_limiter.acquire(count)
+            # Commande selon l'OS
+            if self.system == "windows":
+                # -n : nombre de pings
+                # -w : timeout en ms
+                # -4 : forcer IPv4
+                cmd = ["ping", "-n", str(count), "-w", str(int(timeout * 1000)), "-4", target_ip]
+            else:
+                # -c : nombre de pings
+                # -W : timeout en secondes
+                # Utiliser le chemin complet pour éviter "No such file or directory"
+                ping_path = shutil.which("ping") or "/usr/bin/ping"
+                cmd = [ping_path, "-c", str(count), "-W", str(max(1, math.ceil(timeout))), target_ip]
+
+            # Création du sous-processus
+            # Sur Windows, masquer la fenêtre CMD
+            if self.system == "windows":
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    creationflags=subprocess.CREATE_NO_WINDOW
+                )
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+
+            stdout, stderr = await process.communicate()
+            
+            # Décoder la sortie avec l'encodage approprié pour Windows français
+            try:
+                # Windows français utilise souvent cp850 ou cp1252
                 if self.system == "windows":
-                    import subprocess
-                    process = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
+                    output = stdout.decode('cp850', errors='ignore')
                 else:
-                    process = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE
-                    )
-
-                stdout, stderr = await process.communicate()
-                
-                # Décoder la sortie avec l'encodage approprié pour Windows français
-                try:
-                    # Windows français utilise souvent cp850 ou cp1252
-                    if self.system == "windows":
-                        output = stdout.decode('cp850', errors='ignore')
-                    else:
-                        output = stdout.decode('utf-8', errors='ignore')
-                except:
                     output = stdout.decode('utf-8', errors='ignore')
-                
-                # Analyse robuste du résultat
-                # On considère le ping réussi si :
-                # 1. Le code de retour est 0 (standard)
-                # 2. OU si on trouve "TTL=" dans la sortie (même si le code est != 0, ça arrive)
-                # 3. ET qu'on n'a pas 100% de perte de paquets
-                
-                has_ttl = "TTL=" in output.upper() or "ttl=" in output.lower()
-                
-                # Recherche de perte de paquets (100% perte = HS)
-                # Supporte français ("100% perte"), anglais ("100% packet loss"), etc.
-                loss_match = re.search(r"(\d+)% [^,\n]*?(perte|loss)", output, re.IGNORECASE)
-                is_100_percent_loss = False
-                if loss_match and loss_match.group(1) == "100":
-                    is_100_percent_loss = True
-
-                if (process.returncode == 0 or has_ttl) and not is_100_percent_loss:
+            except:
+                output = stdout.decode('utf-8', errors='ignore')
+            
+            # Analyse robuste du résultat
+            # On considère le ping réussi si :
+            # 1. Le code de retour est 0 (standard)
+            # 2. OU si on trouve "TTL=" dans la sortie (même si le code est != 0, ça arrive)
+            # 3. ET qu'on n'a pas 100% de perte de paquets
+            
+            has_ttl = "TTL=" in output.upper() or "ttl=" in output.lower()
+            
+            # Recherche de perte de paquets (100% perte = HS)
+            # Supporte français ("100% perte"), anglais ("100% packet loss"), etc.
+            loss_match = re.search(r"(\d+)% [^,\n]*?(perte|loss)", output, re.IGNORECASE)
+            is_100_percent_loss = False
+            if loss_match and loss_match.group(1) == "100":
+                is_100_percent_loss = True
+
+            if (process.returncode == 0 or has_ttl) and not is_100_percent_loss:
+                result = self.parse_probe_result(output, count)
+                if not result.received:
                     latency = self.parse_latency(output)
                     # Si le ping a réussi (TTL présent) mais parsing latence échoué (retourne 500)
                     if latency >= 500 and has_ttl:
                         # On force une latence "vivante" pour ne pas déclarer HS un hôte qui répond
                         latency = 10.0 
                         logger.debug(f"Ping OK (TTL présent) mais latence illisible pour {host}. Forcé à 10ms.")
-                else:
-                    latency = 500.0
-                    logger.warning(f"Ping échoué pour {host} (RC={process.returncode}, TTL={'Oui' if has_ttl else 'Non'}, Loss100={'Oui' if is_100_percent_loss else 'Non'}) output:\n{output.strip()}")
-
-
-            except Exception as e:
-                logger.debug(f"Erreur ping {host}: {e}")
-                latency = 500.0
-            
-            # Double vérification si échec (pour éviter les faux positifs)
-            if latency >= 500.0 and self.is_running:
-                try:
-                    await asyncio.sleep(0.5)  # Petite pause avant retry
-                    logger.debug(f"[RETRY] Seconde tentative pour {host}...")
-                    
-                    # Tentative plus robuste: 3 pings, timeout 3s
-                    retry_cmd = list(cmd)
-                    if self.system == "windows":
-                        # Remplacer -n 2 par -n 3 et -w 2000 par -w 3000
-                        try:
-                            idx_n = retry_cmd.index("-n")
-                            retry_cmd[idx_n+1] = "3"
-                            idx_w = retry_cmd.index("-w")
-                            retry_cmd[idx_w+1] = "3000"
-                        except ValueError:
-                            pass # Fallback à commande originale si options non trouvées
-                    else:
-                        # Remplacer -c 2 par -c 3 et -W 2 par -W 3
-                        try:
-                            idx_c = retry_cmd.index("-c")
-                            retry_cmd[idx_c+1] = "3"
-                            # Note: sur certaines distros, W est après c
-                            if "-W" in retry_cmd:
-                                idx_W = retry_cmd.index("-W")
-                                retry_cmd[idx_W+1] = "3"
-                        except ValueError:
-                            pass
-
-                    if self.system == "windows":
-                        process = await asyncio.create_subprocess_exec(
-                            *retry_cmd,
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
-                            creationflags=subprocess.CREATE_NO_WINDOW
-                        )
-                    else:
-                        process = await asyncio.create_subprocess_exec(
-                            *retry_cmd,
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE
-                        )
-
-
-                    stdout, stderr = await process.communicate()
-                    
-                    try:
-                        if self.system == "windows":
-                            output = stdout.decode('cp850', errors='ignore')
-                        else:
-                            output = stdout.decode('utf-8', errors='ignore')
-                    except:
-                        output = stdout.decode('utf-8', errors='ignore')
-                        
-                    has_ttl = "TTL=" in output.upper() or "ttl=" in output.lower()
-                    loss_match = re.search(r"(\d+)% [^,\n]*?(perte|loss)", output, re.IGNORECASE)
-                    is_100_percent_loss = False
-                    if loss_match and loss_match.group(1) == "100":
-                        is_100_percent_loss = True
-
-                    if (process.returncode == 0 or has_ttl) and not is_100_percent_loss:
-                        latency = self.parse_latency(output)
-                        if latency >= 500 and has_ttl:
-                            latency = 10.0
-                        logger.info(f"[RETRY] {host} récupéré au second ping ({latency}ms)")
-                    else:
-                        logger.debug(f"[RETRY] Echec confirmé pour {host} (output: {output.strip()})")
-
-                        
-                except Exception as e:
-                    logger.error(f"Erreur retry ping {host}: {e}")
+                    if latency < 500:
+                        result = ProbeResult(count, [latency])
+            else:
+                logger.warning(f"Ping échoué pour {host} (RC={process.returncode}, TTL={'Oui' if has_ttl else 'Non'}, Loss100={'Oui' if is_100_percent_loss else 'Non'}) output:\n{output.strip()}")
 
-        # Interrogation SNMP pour la température uniquement (optimisé pour beaucoup d'équipements)
-        # Les débits sont récupérés par le serveur web à la demande (non-bloquant)
-        temperature = None
-        bandwidth = None
-        # La récupération SNMP est maintenant gérée par le SNMPWorker dédié
+        except Exception as e:
+            logger.debug(f"Erreur ping {host}: {e}")
+            result = ProbeResult(count)
         
-        # Emission du résultat
-        color = AppColors.get_latency_color(latency)
-        self.result_signal.emit(ip, latency, color, temperature, bandwidth)
-    
+        return result
+
     def _is_url(self, host):
         """Détecte si la chaîne est une URL/domaine plutôt qu'une adresse IP."""
         return _is_url(host)
 
 
 
+    def parse_probe_result(self, output, count):
+        """
+        Extrait toutes les réponses d'une sortie de ping (un RTT par ligne de réponse).
+        Le nombre de paquets envoyés est lu dans les statistiques si présent.
+        """
+        rtts = [float(value.replace(',', '.')) for value in re.findall(
+            r"(?:temps|time)\s*[=<]\s*([0-9]+(?:[.,][0-9]+)?)", output, re.IGNORECASE)]
+        sent = count
+        match = re.search(r"(\d+) packets transmitted|(?:Envoyés|Sent)\s*=\s*(\d+)", output, re.IGNORECASE)
+        if match:
+            sent = int(match.group(1) or match.group(2))
+        return ProbeResult(sent, rtts[:sent])
+
     def parse_latency(self, output):
         """Extrait la latence de la sortie du ping."""
         try:
@@ -467,8 +744,12 @@ class AsyncPingWorker(QThread):
 
 
 class PingManager(QObject):
-    result_signal = Signal(str, float, str, object, object)  # ip, latence, couleur, température, bandwidth
-    finished_signal = Signal()  # Signal quand une vague est finie
+    # Période de relecture de la liste des hôtes (secondes)
+    HOST_REFRESH_PERIOD = 5.0
+
+    result_signal = Signal(str, float, str, object, object, object)  # ip, latence, couleur, température, bandwidth, sonde
+    results_signal = Signal(object)  # Lot de résultats de ping (liste de tuples, même ordre que result_signal)
+    finished_signal = Signal()  # Signal à chaque intervalle global du worker
 
     def __init__(self, get_ips_callback=None, main_window=None):
         super().__init__()
@@ -496,31 +777,47 @@ class PingManager(QObject):
         else:
             logger.warning("SNMP NON disponible, worker SNMP non démarré")
         
-        self.schedule_next_run()
+        # Service de ping unique pour toute la durée du monitoring
+        # (réparti sur plusieurs processus si probe_processes > 1)
+        processes = int(getattr(var, 'probe_processes', 0) or 0)
+        if processes > 1:
+            from src.core.probe_shards import ShardedProbeService
+            logger.info(f"Sondes réparties sur {processes} processus (mode {var.probe_shard_mode})")
+            self.worker = ShardedProbeService(processes, var.probe_shard_mode)
+        else:
+            self.worker = AsyncPingWorker(self.traffic_cache)
+        self.worker.results_signal.connect(self.handle_results)
+        self.worker.ups_alert_signal.connect(self.handle_ups_alert)
+        self.worker.cycle_signal.connect(self.on_worker_finished)
+        self.refresh_hosts()
+        self.worker.start()
+        
+        # Relecture périodique de la liste (changements de sites actifs, exclusions...)
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh_hosts)
+        self.timer.start(int(self.HOST_REFRESH_PERIOD * 1000))
 
-    def schedule_next_run(self):
-        if not var.tourne:
-            return
+    def get_probe_stats(self):
+        """Retourne l'état du pipeline de sondes (file d'attente, sondes en cours, débit)."""
+        if not self.worker:
+            return {}
+        return dict(self.worker.stats)
 
-        # Récupération des IPs via le callback
-        ips = []
-        if self.get_ips_callback:
-            ips = self.get_ips_callback()
-        
-        if not ips:
-            # Si pas d'IPs, on attend quand même
-            QTimer.singleShot(max(1, int(var.delais)) * 1000, self.schedule_next_run)
+    def refresh_hosts(self):
+        """
+        Lit la liste des hôtes depuis le thread principal et la transmet au service de ping.
+        Appelé périodiquement et lors des modifications de la liste.
+        """
+        if not self.worker or not self.get_ips_callback:
             return
-
-        # Lancement du worker
-        self.worker = AsyncPingWorker(ips, self.traffic_cache)
-        self.worker.result_signal.connect(self.handle_result)
-        self.worker.ups_alert_signal.connect(self.handle_ups_alert)
-        self.worker.finished.connect(self.on_worker_finished)
-        self.worker.start()
+        try:
+            ips = self.get_ips_callback() or []
+            self.worker.update_hosts(ips, get_host_probe_intervals())
+        except Exception as e:
+            logger.error(f"Erreur transmission liste d'hôtes au service de ping: {e}")
 
     def on_worker_finished(self):
-        """Appelé quand une vague de pings est terminée."""
+        """Appelé à chaque intervalle global du worker (ancienne fin de vague)."""
         self.finished_signal.emit()
         
         # Broadcaster les mises à jour aux clients web (mode headless ou si serveur web actif)
@@ -530,17 +827,33 @@ class PingManager(QObject):
                     self.main_window.web_server.broadcast_update()
             except Exception as e:
                 logger.debug(f"Erreur broadcast: {e}")
-        
-        if var.tourne:
-            delay_ms = max(1, int(var.delais)) * 1000
-            QTimer.singleShot(delay_ms, self.schedule_next_run)
 
-    def handle_result(self, ip, latency, color, temperature, bandwidth):
-        """Relaye le résultat et met à jour les listes internes."""
+    def handle_results(self, batch):
+        """
+        Traite un lot de résultats du worker : listes d'alertes mises à jour pour
+        chaque hôte (paramètres de notification lus une seule fois), puis un seul
+        signal vers le contrôleur.
+        """
+        settings = get_hosts_notification_settings()
+        # Hôtes sans ligne host_settings : notifications activées par défaut
+        defaults = {'email': True, 'telegram': True}
+        relayed = []
+        for ip, latency, color, temperature, bandwidth, probe in batch:
+            # Mise à jour des listes de statistiques/alertes (toujours stockées dans src.var)
+            self.update_lists(ip, latency, settings.get(ip, defaults))
+            relayed.append((ip, latency, self._visual_color(ip, latency, color), temperature, bandwidth, probe))
         
-        # Mise à jour des listes de statistiques/alertes (toujours stockées dans src.var)
-        self.update_lists(ip, latency)
+        # Historique de latence/pertes (mise en mémoire tampon, écriture par blocs)
+        try:
+            get_latency_history().record_results(batch)
+        except Exception as e:
+            logger.debug(f"Erreur enregistrement historique latence: {e}")
         
+        # Relayage vers le contrôleur pour mettre à jour le modèle en une passe
+        self.results_signal.emit(relayed)
+
+    def _visual_color(self, ip, latency, color):
+        """Couleur affichée : orange tant qu'un échec n'est pas confirmé par le seuil HS."""
         # Gestion visuelle des échecs non confirmés
         visual_color = color
         
@@ -559,8 +872,7 @@ class PingManager(QObject):
             except Exception as e:
                 logger.debug(f"Erreur calcul couleur visuelle pour {ip}: {e}")
 
-        # Relayage vers le signal principal pour que le contrôleur mette à jour le modèle
-        self.result_signal.emit(ip, latency, visual_color, temperature, bandwidth)
+        return visual_color
 
 
     def handle_snmp_result(self, ip, temp, bandwidth):
@@ -570,18 +882,19 @@ class PingManager(QObject):
 
         # Relayer les données SNMP pour affichage (température/bandwidth)
         color = ""  # Pas de couleur spécifique pour SNMP
-        self.result_signal.emit(ip, -1.0, color, temp, bandwidth)
+        self.result_signal.emit(ip, -1.0, color, temp, bandwidth, None)
 
 
-    def update_lists(self, ip, latency):
+    def update_lists(self, ip, latency, settings=None):
         # Les listes HS/Mail/Telegram dépendent de l'état d'exclusion.
         # Idéalement, PingManager ne devrait pas avoir à vérifier l'exclusion lui-même.
         # Mais pour l'instant on garde la compatibilité avec src.var.
         
         try:
-            # Récupérer les paramètres de notification (cache ? ou direct DB)
-            # Puisqu'on est dans le thread principal ou GUI, accès DB rapide (SQLite local)
-            settings = get_host_notification_settings(ip)
+            # Paramètres fournis par handle_results pour tout le lot ; lecture
+            # individuelle en base pour les autres appelants
+            if settings is None:
+                settings = get_host_notification_settings(ip)
             
             # Stats toujours mises à jour
             if latency >= 500:
@@ -704,6 +1017,10 @@ class PingManager(QObject):
         """Arrête le cycle et nettoie le cache SNMP."""
         logger.info("Arrêt AsyncPingManager")
         
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        
         # Arrêter le worker SNMP
         if hasattr(self, 'snmp_worker') and self.snmp_worker:
             self.snmp_worker.stop()
@@ -852,11 +1169,15 @@ class SNMPWorker(QThread):
             )
             
             if bandwidth_result:
-                bandwidth = {
-                    'in_mbps': bandwidth_result['in_mbps'],
-                    'out_mbps': bandwidth_result['out_mbps']
-                }
                 self.traffic_cache[ip] = bandwidth_result['raw_data']
+                # Mesure de référence seule (premier relevé, compteur remis à zéro) : pas de débit
+                if bandwidth_result.get('measured', True):
+                    bandwidth = {
+                        'in_mbps': bandwidth_result['in_mbps'],
+                        'out_mbps': bandwidth_result['out_mbps']
+                    }
+                    # Débit calculé une fois par cycle, lu tel quel par le serveur web
+                    bandwidth_store.publish(ip, bandwidth['in_mbps'], bandwidth['out_mbps'])
                 # logger.info(f"Bandwidth updated for {ip}")
         except asyncio.TimeoutError:
             pass
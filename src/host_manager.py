@@ -1,13 +1,68 @@
 import threading
-from copy import deepcopy
 import logging
+import re
+import time
+from enum import Enum
+
+from src.utils.colors import AppColors
 
 logger = logging.getLogger(__name__)
 
+_NUMBER_RE = re.compile(r'-?\d+(?:[.,]\d+)?')
+
+
+class HostState(str, Enum):
+    """État d'un hôte (sous-classe de str : sérialisable et comparable à 'online'/'offline')."""
+    ONLINE = 'online'
+    OFFLINE = 'offline'
+    UNKNOWN = 'unknown'
+
+    @classmethod
+    def parse(cls, value):
+        try:
+            return cls(value)
+        except ValueError:
+            return cls.UNKNOWN
+
+
+def parse_number(value):
+    """Premier nombre d'un texte affiché ("45.2 ms", "38,5") ou None ("HS", vide)."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER_RE.search(str(value))
+    return float(match.group(0).replace(',', '.')) if match else None
+
+
+def _derive_fields(host):
+    """Libellé de latence et couleur, calculés une seule fois à l'écriture."""
+    latency = host.get('latency_ms')
+    if host.get('status') == HostState.ONLINE and latency is not None:
+        host['latence'] = f"{latency:.1f} ms"
+        host['latency_color'] = AppColors.get_latency_color(latency)
+    else:
+        if host.get('status') == HostState.OFFLINE:
+            host['latence'] = "HS"
+        host['latency_color'] = AppColors.ROUGE_PALE
+
+
 class HostManager:
     """
     Gestionnaire d'état des hôtes thread-safe.
     Sert de source de vérité pour le serveur web, découplé de l'interface Qt.
+
+    Les lignes sont indexées par IP (les doublons restent possibles : l'index
+    conserve toutes les positions d'une même IP). Les écritures ne modifient
+    jamais une ligne en place : la ligne est remplacée par une copie et la
+    version est incrémentée. Les lecteurs partagent un instantané immuable
+    (tuple) reconstruit au plus une fois par version, sans copie profonde.
+    Les dicts d'un instantané ne doivent pas être modifiés par les appelants.
+
+    Chaque ligne porte des champs typés (latency_ms: float ou None, status:
+    HostState, temp_c: float ou None, changed_at: horodatage du dernier
+    changement d'état) ; les libellés affichés ('latence', 'temp') et la couleur
+    ('latency_color') en sont dérivés à l'écriture.
     """
     _instance = None
     _lock = threading.RLock()
@@ -17,44 +72,121 @@ class HostManager:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super(HostManager, cls).__new__(cls)
-                    cls._instance.hosts = {} # Dict[id, dict] ou Dict[ip, dict] ? 
-                    # Utilisons un dict interne simple, la clé peut être l'IP si unique, ou une ID.
-                    # Comme l'app utilise beaucoup l'IP comme clé, essayons de mapper par IP.
-                    # Attention les doublons sont possibles dans l'app Qt, mais problématiques pour un dict par IP.
-                    # Le serveur web itérait sur les lignes, donc supportait les doublons.
-                    # Pour supporter les doublons, utilisons une liste ou un dict par ID de ligne.
-                    # Mais l'ID de ligne change si on supprime.
-                    # Utilisons l'ID unique (colonne 0) si stable, sinon une liste.
-                    cls._instance.hosts = [] 
+                    # Liste de lignes (les doublons d'IP sont possibles dans l'app Qt)
+                    cls._instance.hosts = []
+                    # IP -> positions des lignes dans self.hosts
+                    cls._instance._index = {}
+                    cls._instance.version = 0
+                    cls._instance._snapshot = ()
+                    cls._instance._snapshot_version = 0
                     cls._instance.data_lock = threading.RLock()
         return cls._instance
 
+    def _rebuild_index(self):
+        index = {}
+        for position, host in enumerate(self.hosts):
+            index.setdefault(host.get('ip'), []).append(position)
+        self._index = index
+
     def clear(self):
         with self.data_lock:
             self.hosts = []
+            self._index = {}
+            self.version += 1
 
     def set_hosts(self, hosts_list):
-        """Remplace toute la liste (pour initialisation ou resync complète)."""
-        with self.data_lock:
-            self.hosts = deepcopy(hosts_list)
+        """
+        Remplace toute la liste (pour initialisation ou resync complète).
+        Les textes du modèle Qt sont convertis une fois en champs typés ; l'horodatage
+        de changement et la dernière sonde des hôtes déjà connus sont conservés.
 
-    def update_host_status(self, ip, latency, status, temp=None):
-        """Met à jour le statut d'un ou plusieurs hôtes par IP."""
+        Returns:
+            set: IP des hôtes retirés de la liste
+        """
+        now = time.time()
         with self.data_lock:
+            previous = {}
             for host in self.hosts:
-                if host.get('ip') == ip:
-                    host['latence'] = latency
+                previous.setdefault(host.get('ip'), host)
+            hosts = []
+            for source in hosts_list:
+                host = dict(source)
+                host['status'] = HostState.parse(host.get('status'))
+                host['latency_ms'] = parse_number(host.get('latence')) if host['status'] == HostState.ONLINE else None
+                host['temp_c'] = parse_number(host.get('temp'))
+                old = previous.get(host.get('ip'))
+                if old is not None and old.get('status') == host['status']:
+                    host['changed_at'] = old.get('changed_at', now)
+                    if 'probe' in old:
+                        host.setdefault('probe', old['probe'])
+                else:
+                    host['changed_at'] = now
+                _derive_fields(host)
+                hosts.append(host)
+            self.hosts = hosts
+            self._rebuild_index()
+            self.version += 1
+            return set(previous) - set(self._index)
+
+    def update_host_status(self, ip, latency=None, status=None, temp=None, probe=None):
+        """
+        Met à jour le statut d'un ou plusieurs hôtes par IP.
+
+        Args:
+            latency: Latence en ms (float ; un texte "12.3 ms" est accepté), ignorée si l'hôte est hors ligne
+            status: HostState (ou 'online'/'offline') ; None conserve latence et état (résultat SNMP seul)
+            temp: Température (float ou texte), None = inchangée
+            probe: Statistiques de la dernière sonde (sent, received, loss, min, avg, max, mdev, jitter)
+        """
+        if status is not None:
+            status = HostState.parse(status)
+            latency = parse_number(latency) if status == HostState.ONLINE else None
+        temp_c = parse_number(temp)
+        now = time.time()
+        with self.data_lock:
+            positions = self._index.get(ip)
+            if not positions:
+                return
+            for position in positions:
+                # Copie de la ligne : les instantanés déjà publiés restent inchangés
+                host = dict(self.hosts[position])
+                if status is not None:
+                    if host.get('status') != status:
+                        host['changed_at'] = now
                     host['status'] = status
-                    if temp:
-                        host['temp'] = temp
+                    host['latency_ms'] = latency
+                if temp_c is not None:
+                    host['temp_c'] = temp_c
+                    host['temp'] = str(temp)
+                if probe is not None:
+                    host['probe'] = dict(probe)
+                _derive_fields(host)
+                self.hosts[position] = host
+            self.version += 1
 
-    def get_all_hosts(self):
+    def get_snapshot(self):
+        """
+        Retourne (version, hôtes) : tuple immuable partagé entre les lecteurs,
+        reconstruit seulement si l'état a changé depuis le dernier appel.
+        """
         with self.data_lock:
-            return deepcopy(self.hosts)
+            if self._snapshot_version != self.version:
+                self._snapshot = tuple(self.hosts)
+                self._snapshot_version = self.version
+            return self._snapshot_version, self._snapshot
+
+    def get_all_hosts(self):
+        """Instantané courant des hôtes (lecture seule, partagé sans copie)."""
+        return self.get_snapshot()[1]
 
     def get_host_by_ip(self, ip):
         with self.data_lock:
-            for host in self.hosts:
-                if host.get('ip') == ip:
-                    return deepcopy(host)
+            positions = self._index.get(ip)
+            if positions:
+                return dict(self.hosts[positions[0]])
         return None
+
+    def get_hosts_by_ip(self, ip):
+        """Toutes les lignes d'une IP (doublons compris), en copies."""
+        with self.data_lock:
+            return [dict(self.hosts[position]) for position in self._index.get(ip, ())]
@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+Historique de latence et de pertes des sondes (ping, TCP, HTTP).
+
+Les mesures ne sont pas stockées une ligne SQLite par mesure : elles sont
+regroupées par hôte en blocs d'au plus BLOCK_SAMPLES mesures (une heure au
+maximum), encodés de façon compacte puis compressés :
+- horodatages (secondes UTC) en deltas de deltas (0 pour un intervalle régulier)
+- RTT quantifiés au 1/10 de ms, en deltas (0 = aucune réponse)
+- pertes en pourcentage, un octet par mesure
+Chaque bloc est une ligne (ip, start_ts) de la table latency_blocks : une
+lecture de plage ne décode que les blocs qui la recouvrent.
+
+Le bloc en cours de chaque hôte reste en mémoire ; un thread unique écrit
+toutes les FLUSH_INTERVAL secondes (une transaction, connexion persistante en
+mode WAL) :
+- les blocs terminés, une seule fois chacun ;
+- les mesures ajoutées aux blocs en cours depuis l'écriture précédente, en
+  petits fragments dans la table latency_tail (chaque mesure n'est écrite
+  qu'une fois : le volume écrit reste proportionnel au nombre de mesures).
+Les fragments d'un bloc sont supprimés quand le bloc terminé est écrit ; ceux
+laissés par un arrêt brutal sont regroupés en blocs au démarrage suivant.
+Un bloc terminé reste lisible en mémoire jusqu'à la validation de son écriture.
+close() écrit tout ce qui est en attente.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 1
+# Résolution des RTT : 0,1 ms
+RTT_SCALE = 10
+# Latence conventionnelle d'un hôte qui ne répond pas (voir ProbeResult)
+TIMEOUT_LATENCY = 500.0
+
+# Mesure : (horodatage en secondes UTC, RTT en ms ou None si aucune réponse, pertes entre 0 et 1)
+Sample = Tuple[int, Optional[float], float]
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+def _put_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_block(samples: List[Sample]) -> bytes:
+    """Encode un bloc de mesures (horodatages croissants) en binaire compressé."""
+    out = bytearray([FORMAT_VERSION])
+    _put_varint(out, len(samples))
+    previous_ts = samples[0][0]
+    previous_delta = 0
+    _put_varint(out, previous_ts)
+    for ts, _, _ in samples[1:]:
+        delta = ts - previous_ts
+        _put_varint(out, _zigzag(delta - previous_delta))
+        previous_ts, previous_delta = ts, delta
+    previous = 0
+    for _, rtt, _ in samples:
+        quantized = 0 if rtt is None else int(round(rtt * RTT_SCALE)) + 1
+        _put_varint(out, _zigzag(quantized - previous))
+        previous = quantized
+    out.extend(min(100, max(0, int(round(loss * 100)))) for _, _, loss in samples)
+    return zlib.compress(bytes(out), 6)
+
+
+def decode_block(blob: bytes) -> List[Sample]:
+    """Inverse de encode_block()."""
+    data = zlib.decompress(blob)
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Version de bloc de latence inconnue: {data[0]}")
+    count, pos = _get_varint(data, 1)
+    if not count:
+        return []
+    ts, pos = _get_varint(data, pos)
+    timestamps = [ts]
+    delta = 0
+    for _ in range(count - 1):
+        value, pos = _get_varint(data, pos)
+        delta += _unzigzag(value)
+        ts += delta
+        timestamps.append(ts)
+    rtts = []
+    quantized = 0
+    for _ in range(count):
+        value, pos = _get_varint(data, pos)
+        quantized += _unzigzag(value)
+        rtts.append((quantized - 1) / RTT_SCALE if quantized else None)
+    losses = data[pos:pos + count]
+    return [(timestamps[i], rtts[i], losses[i] / 100) for i in range(count)]
+
+
+class LatencyHistoryStore:
+    """Stockage par blocs de l'historique de latence/pertes, thread-safe."""
+
+    # Un bloc couvre au plus BLOCK_SAMPLES mesures et moins de BLOCK_SECONDS secondes
+    BLOCK_SAMPLES = 720
+    BLOCK_SECONDS = 3600
+    # Écriture des blocs terminés et des nouvelles mesures des blocs en cours toutes
+    # les FLUSH_INTERVAL secondes (au plus FLUSH_INTERVAL secondes perdues en cas d'arrêt brutal)
+    FLUSH_INTERVAL = 10.0
+    # Durée de conservation (un nettoyage au plus par heure)
+    RETENTION_DAYS = 366
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            # Chemin par défaut dans le dossier bd/
+            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            bd_path = os.path.join(base_path, 'bd')
+            os.makedirs(bd_path, exist_ok=True)
+            db_path = os.path.join(bd_path, 'latency_history.db')
+
+        self.db_path = db_path
+        # IP -> mesures du bloc en cours
+        self._open: Dict[str, List[Sample]] = {}
+        # IP -> nombre de mesures du bloc en cours déjà écrites dans latency_tail
+        self._tail_written: Dict[str, int] = {}
+        # Blocs terminés en attente d'écriture : (ip, mesures), retirés une fois écrits
+        self._sealed: List[Tuple[str, List[Sample]]] = []
+        self._cond = threading.Condition()
+        self._write_conn = None
+        self._write_lock = threading.Lock()
+        self._writer = None
+        self._running = False
+        self._last_cleanup = 0.0
+        self.stats = {'samples': 0, 'blocks_written': 0, 'bytes_written': 0}
+        self._init_db()
+        self._recover_tail()
+
+    def _get_connection(self):
+        """Connexion de lecture."""
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        try:
+            with self._get_connection() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS latency_blocks (
+                        ip TEXT NOT NULL,
+                        start_ts INTEGER NOT NULL,
+                        end_ts INTEGER NOT NULL,
+                        count INTEGER NOT NULL,
+                        data BLOB NOT NULL,
+                        PRIMARY KEY (ip, start_ts)
+                    ) WITHOUT ROWID
+                ''')
+                # Mesures récentes des blocs en cours (fragments ajoutés à chaque écriture)
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS latency_tail (
+                        ip TEXT NOT NULL,
+                        block_ts INTEGER NOT NULL,
+                        count INTEGER NOT NULL,
+                        data BLOB NOT NULL
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_latency_tail_block ON latency_tail(ip, block_ts)')
+                # Hôtes ayant un historique (évite un parcours des blocs)
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS latency_hosts (
+                        ip TEXT PRIMARY KEY,
+                        first_ts INTEGER NOT NULL,
+                        last_ts INTEGER NOT NULL
+                    )
+                ''')
+                logger.info(f"Base de données latence initialisée: {self.db_path}")
+        except Exception as e:
+            logger.error(f"Erreur initialisation BDD latence: {e}")
+
+    def _recover_tail(self):
+        """Regroupe en blocs les fragments laissés par un arrêt (bloc en cours non terminé)."""
+        try:
+            with self._get_connection() as conn:
+                pending: Dict[Tuple[str, int], List[Sample]] = {}
+                for ip, block_ts, data in conn.execute(
+                        'SELECT ip, block_ts, data FROM latency_tail ORDER BY rowid'):
+                    pending.setdefault((ip, block_ts), []).extend(decode_block(data))
+                if not pending:
+                    return
+                # Un bloc déjà écrit pour la même clé est complet : il est conservé
+                conn.executemany('''
+                    INSERT OR IGNORE INTO latency_blocks (ip, start_ts, end_ts, count, data)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(ip, block_ts, samples[-1][0], len(samples), encode_block(samples))
+                      for (ip, block_ts), samples in pending.items()])
+                conn.execute('DELETE FROM latency_tail')
+                logger.info(f"Historique latence: {len(pending)} blocs en cours récupérés")
+        except Exception as e:
+            logger.error(f"Erreur récupération blocs en cours latence: {e}")
+
+    def record(self, ip: str, rtt: Optional[float], loss: float = None, ts: int = None):
+        """
+        Enregistre une mesure.
+
+        Args:
+            rtt: Latence en ms, None (ou >= 500) si aucune réponse
+            loss: Taux de pertes entre 0 et 1 (déduit de rtt si absent)
+            ts: Horodatage en secondes UTC (maintenant par défaut)
+        """
+        if rtt is not None and rtt >= TIMEOUT_LATENCY:
+            rtt = None
+        if loss is None:
+            loss = 1.0 if rtt is None else 0.0
+        ts = int(time.time()) if ts is None else int(ts)
+        with self._cond:
+            block = self._open.get(ip)
+            if block:
+                # Horodatages croissants dans un bloc (horloge système reculée)
+                ts = max(ts, block[-1][0])
+                if len(block) >= self.BLOCK_SAMPLES or ts - block[0][0] >= self.BLOCK_SECONDS:
+                    self._sealed.append((ip, block))
+                    self._tail_written.pop(ip, None)
+                    block = None
+            if block is None:
+                block = []
+                self._open[ip] = block
+            block.append((ts, rtt, float(loss)))
+            self.stats['samples'] += 1
+            if not self._running:
+                self._start_writer()
+
+    def record_results(self, batch):
+        """Enregistre un lot de résultats du service de ping (ip, latence, couleur, temp, débit, sonde)."""
+        ts = int(time.time())
+        for ip, latency, _, _, _, probe in batch:
+            if latency is None or latency < 0:
+                continue
+            loss = probe.get('loss') if isinstance(probe, dict) else None
+            self.record(ip, latency, loss, ts)
+
+    def _start_writer(self):
+        """Démarre le thread d'écriture (appelé sous self._cond)."""
+        self._running = True
+        self._writer = threading.Thread(target=self._writer_loop, name='LatencyHistoryWriter', daemon=True)
+        self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                if self._running:
+                    self._cond.wait(self.FLUSH_INTERVAL)
+                running = self._running
+            self.flush()
+            if running and time.time() - self._last_cleanup >= 3600:
+                self._last_cleanup = time.time()
+                self.cleanup_old_data(self.RETENTION_DAYS)
+            if not running:
+                return
+
+    def _get_write_connection(self):
+        if self._write_conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._write_conn = conn
+        return self._write_conn
+
+    def flush(self, include_open: bool = True):
+        """
+        Écrit les blocs terminés et, si include_open, les mesures ajoutées aux blocs
+        en cours depuis l'écriture précédente (une transaction).
+        """
+        with self._write_lock:
+            with self._cond:
+                # Les blocs terminés restent dans self._sealed (lus par get_range) jusqu'à la validation
+                sealed = list(self._sealed)
+                # Fragments : (ip, début du bloc, mesures déjà écrites, nouvelles mesures)
+                tails = []
+                if include_open:
+                    for ip, block in self._open.items():
+                        written = self._tail_written.get(ip, 0)
+                        if len(block) > written:
+                            tails.append((ip, block[0][0], written, block[written:]))
+                            self._tail_written[ip] = len(block)
+            if not sealed and not tails:
+                return
+            rows = []
+            tail_rows = []
+            hosts = {}
+            for ip, samples in sealed:
+                rows.append((ip, samples[0][0], samples[-1][0], len(samples), encode_block(samples)))
+            for ip, block_ts, _, samples in tails:
+                tail_rows.append((ip, block_ts, len(samples), encode_block(samples)))
+            for ip, samples in sealed + [(ip, samples) for ip, _, _, samples in tails]:
+                first, last = hosts.get(ip, (samples[0][0], samples[-1][0]))
+                hosts[ip] = (min(first, samples[0][0]), max(last, samples[-1][0]))
+            try:
+                conn = self._get_write_connection()
+                with conn:
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO latency_blocks (ip, start_ts, end_ts, count, data)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', rows)
+                    # Fragments devenus inutiles : le bloc terminé contient toutes ses mesures
+                    conn.executemany('DELETE FROM latency_tail WHERE ip = ? AND block_ts = ?',
+                                     [(row[0], row[1]) for row in rows])
+                    conn.executemany('''
+                        INSERT INTO latency_tail (ip, block_ts, count, data) VALUES (?, ?, ?, ?)
+                    ''', tail_rows)
+                    conn.executemany('''
+                        INSERT INTO latency_hosts (ip, first_ts, last_ts) VALUES (?, ?, ?)
+                        ON CONFLICT(ip) DO UPDATE SET
+                            first_ts = MIN(first_ts, excluded.first_ts),
+                            last_ts = MAX(last_ts, excluded.last_ts)
+                    ''', [(ip, first, last) for ip, (first, last) in hosts.items()])
+                self.stats['blocks_written'] += len(rows)
+                self.stats['bytes_written'] += (sum(len(row[4]) for row in rows)
+                                                + sum(len(row[3]) for row in tail_rows))
+            except Exception as e:
+                logger.error(f"Erreur écriture historique latence ({len(rows)} blocs, "
+                             f"{len(tail_rows)} fragments): {e}")
+                self._close_write_connection()
+                # Nouvelle tentative au prochain cycle (blocs terminés toujours en attente)
+                with self._cond:
+                    for ip, block_ts, written, _ in tails:
+                        block = self._open.get(ip)
+                        if block and block[0][0] == block_ts:
+                            self._tail_written[ip] = min(self._tail_written.get(ip, 0), written)
+                return
+            if sealed:
+                written = {id(samples) for _, samples in sealed}
+                with self._cond:
+                    self._sealed = [entry for entry in self._sealed if id(entry[1]) not in written]
+
+    def _close_write_connection(self):
+        if self._write_conn is not None:
+            try:
+                self._write_conn.close()
+            except Exception:
+                pass
+            self._write_conn = None
+
+    def close(self):
+        """Arrête le thread d'écriture après avoir écrit les blocs en attente."""
+        with self._cond:
+            writer = self._writer
+            self._running = False
+            self._cond.notify()
+        if writer is not None and writer.is_alive() and writer is not threading.current_thread():
+            writer.join(timeout=10)
+        self.flush()
+        with self._write_lock:
+            self._close_write_connection()
+
+    def cleanup_old_data(self, days: int = None):
+        """Supprime les blocs plus anciens que le nombre de jours spécifié."""
+        cutoff = int(time.time()) - int(days or self.RETENTION_DAYS) * 86400
+        try:
+            with self._write_lock:
+                conn = self._get_write_connection()
+                with conn:
+                    deleted = conn.execute('DELETE FROM latency_blocks WHERE end_ts < ?', (cutoff,)).rowcount
+                    conn.execute('DELETE FROM latency_hosts WHERE last_ts < ?', (cutoff,))
+                    conn.execute('UPDATE latency_hosts SET first_ts = ? WHERE first_ts < ?', (cutoff, cutoff))
+            if deleted:
+                logger.info(f"Nettoyage historique latence: {deleted} blocs supprimés")
+        except Exception as e:
+            logger.error(f"Erreur nettoyage historique latence: {e}")
+
+    def get_range(self, ip: str, start: int, end: int = None) -> List[Sample]:
+        """Mesures d'un hôte entre start et end (secondes UTC, bornes incluses), par ordre chronologique."""
+        end = int(time.time()) if end is None else int(end)
+        start = int(start)
+        blocks: Dict[int, List[Sample]] = {}
+        try:
+            with self._get_connection() as conn:
+                # Un bloc couvre moins de BLOCK_SECONDS : recherche bornée sur la clé (ip, start_ts)
+                cursor = conn.execute('''
+                    SELECT start_ts, data FROM latency_blocks
+                    WHERE ip = ? AND start_ts > ? AND start_ts <= ? AND end_ts >= ?
+                    ORDER BY start_ts
+                ''', (ip, start - self.BLOCK_SECONDS, end, start))
+                for start_ts, data in cursor:
+                    blocks[start_ts] = decode_block(data)
+        except Exception as e:
+            logger.error(f"Erreur lecture historique latence {ip}: {e}")
+        # Blocs en mémoire (plus récents que leur version écrite)
+        with self._cond:
+            for sealed_ip, samples in self._sealed:
+                if sealed_ip == ip:
+                    blocks[samples[0][0]] = list(samples)
+            current = self._open.get(ip)
+            if current:
+                blocks[current[0][0]] = list(current)
+        result = []
+        for start_ts in sorted(blocks):
+            result.extend(sample for sample in blocks[start_ts] if start <= sample[0] <= end)
+        return result
+
+    def get_hosts(self) -> Dict[str, Tuple[int, int]]:
+        """IP -> (première, dernière mesure) des hôtes ayant un historique."""
+        hosts = {}
+        try:
+            with self._get_connection() as conn:
+                for ip, first_ts, last_ts in conn.execute('SELECT ip, first_ts, last_ts FROM latency_hosts'):
+                    hosts[ip] = (first_ts, last_ts)
+        except Exception as e:
+            logger.error(f"Erreur liste hôtes historique latence: {e}")
+        with self._cond:
+            pending = self._sealed + [(ip, samples) for ip, samples in self._open.items()]
+            for ip, samples in pending:
+                if samples:
+                    first, last = hosts.get(ip, (samples[0][0], samples[-1][0]))
+                    hosts[ip] = (min(first, samples[0][0]), max(last, samples[-1][0]))
+        return hosts
+
+
+# Instance globale
+latency_history = None
+
+
+def get_latency_history() -> LatencyHistoryStore:
+    """Retourne l'instance globale de l'historique de latence."""
+    global latency_history
+    if latency_history is None:
+        latency_history = LatencyHistoryStore()
+        # Filet de sécurité : blocs en attente écrits à la sortie de l'interpréteur
+        atexit.register(latency_history.close)
+    return latency_history
+
+
+def close_latency_history():
+    """Écrit les blocs en attente et ferme l'instance globale (arrêt de l'application)."""
+    if latency_history is not None:
+        try:
+            latency_history.close()
+        except Exception as e:
+            logger.error(f"Erreur fermeture historique latence: {e}")
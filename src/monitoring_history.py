@@ -2,13 +2,32 @@
 """
 Module de gestion de l'historique des données de monitoring (température et débit).
 Stocke les données dans une base SQLite pour permettre l'affichage de graphiques.
+
+Les mesures ne sont pas écrites une à une : elles sont mises en mémoire tampon
+puis écrites par un thread unique, par lots (executemany dans une seule
+transaction) toutes les FLUSH_INTERVAL secondes ou dès FLUSH_ROWS mesures, sur
+une connexion persistante en mode WAL. Le tampon est vidé à l'arrêt (close()).
+
+Agrégats : dans la même transaction, chaque lot met à jour des agrégats par
+tranches de 1 minute, 15 minutes et 1 heure (nombre, min, somme, max), chacun
+avec sa propre durée de conservation. Les lectures utilisent la résolution la
+plus grossière donnant encore MIN_POINTS points sur la période demandée : un
+graphique sur un mois lit quelques centaines de lignes au lieu des mesures brutes.
+
+Horodatages : secondes UTC entières (colonne ts, index couvrants (ip, ts) ;
+agrégats en tables WITHOUT ROWID), converties en heure locale à la lecture. Le schéma est versionné par
+PRAGMA user_version ; la version 1 convertit les anciennes colonnes texte en
+heure locale.
 """
 
+import atexit
 import sqlite3
 import os
-from datetime import datetime, timedelta
+import threading
+import time
 from typing import List, Dict, Optional
 from src.utils.logger import get_logger
+from src.utils.timestamps import local_text_to_epoch_sql, to_local, utc_now
 
 logger = get_logger(__name__)
 
@@ -16,6 +35,23 @@ logger = get_logger(__name__)
 class MonitoringHistoryManager:
     """Gestionnaire d'historique des données de monitoring."""
     
+    # Écriture au plus tard toutes les FLUSH_INTERVAL secondes, ou dès FLUSH_ROWS mesures en attente
+    FLUSH_INTERVAL = 5.0
+    FLUSH_ROWS = 500
+    # Au-delà (base inaccessible), les mesures les plus anciennes sont abandonnées
+    MAX_PENDING = 100000
+    
+    # Résolutions des agrégats (secondes, diviseurs d'une heure) -> conservation en jours
+    ROLLUPS = {60: 14, 900: 180, 3600: 730}
+    # Conservation des mesures brutes (jours)
+    RAW_RETENTION_DAYS = 7
+    # Nombre de points minimal visé pour un graphique
+    MIN_POINTS = 150
+    # Nettoyage selon les durées de conservation (secondes)
+    CLEANUP_INTERVAL = 3600
+    # Version du schéma (PRAGMA user_version)
+    SCHEMA_VERSION = 1
+    
     def __init__(self, db_path: str = None):
         """Initialise le gestionnaire avec le chemin de la base de données."""
         if db_path is None:
@@ -26,6 +62,16 @@ class MonitoringHistoryManager:
             db_path = os.path.join(bd_path, 'monitoring_history.db')
         
         self.db_path = db_path
+        # Mesures en attente d'écriture : (table, ligne)
+        self._pending = []
+        self._cond = threading.Condition()
+        # Connexion d'écriture persistante, utilisée sous _write_lock (thread d'écriture ou flush())
+        self._write_conn = None
+        self._write_lock = threading.Lock()
+        self._writer = None
+        self._running = False
+        self._last_cleanup = 0.0
+        self.stats = {'rows_written': 0, 'batches': 0, 'dropped': 0}
         self._init_db()
     
     def _get_connection(self):
@@ -35,120 +81,451 @@ class MonitoringHistoryManager:
         return conn
     
     def _init_db(self):
-        """Initialise les tables de la base de données."""
+        """Initialise les tables de la base de données (et migre les anciennes bases)."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Table historique température
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS temperature_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        ip TEXT NOT NULL,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        value REAL NOT NULL
-                    )
-                ''')
-                
-                # Table historique débit
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS bandwidth_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        ip TEXT NOT NULL,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        in_mbps REAL NOT NULL,
-                        out_mbps REAL NOT NULL
-                    )
-                ''')
-                
-                # Index pour accélérer les requêtes
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_temp_ip_ts 
-                    ON temperature_history(ip, timestamp)
-                ''')
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_bw_ip_ts 
-                    ON bandwidth_history(ip, timestamp)
-                ''')
-                
+                # WAL : les lectures (graphiques) ne bloquent pas les écritures et
+                # chaque transaction n'est plus synchronisée sur disque individuellement
+                conn.execute('PRAGMA journal_mode=WAL')
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                if version < 1:
+                    self._migrate_to_epoch(conn)
+                self._create_tables(conn)
+                self._backfill_rollups(conn)
                 conn.commit()
                 logger.info(f"Base de données monitoring initialisée: {self.db_path}")
         except Exception as e:
             logger.error(f"Erreur initialisation BDD monitoring: {e}")
     
+    def _create_tables(self, conn):
+        # Mesures brutes
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS temperature_history (
+                ip TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                value REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS bandwidth_history (
+                ip TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                in_mbps REAL NOT NULL,
+                out_mbps REAL NOT NULL
+            )
+        ''')
+        # Index couvrants (ip, ts, valeurs) : une lecture par plage ne touche que l'index
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_temperature_ip_ts
+            ON temperature_history(ip, ts, value)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_bandwidth_ip_ts
+            ON bandwidth_history(ip, ts, in_mbps, out_mbps)
+        ''')
+        
+        # Agrégats par tranche (bucket : début de la tranche, secondes UTC)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS temperature_rollup (
+                resolution INTEGER NOT NULL,
+                ip TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                min REAL NOT NULL,
+                sum REAL NOT NULL,
+                max REAL NOT NULL,
+                PRIMARY KEY (resolution, ip, bucket)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS bandwidth_rollup (
+                resolution INTEGER NOT NULL,
+                ip TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                in_min REAL NOT NULL,
+                in_sum REAL NOT NULL,
+                in_max REAL NOT NULL,
+                out_min REAL NOT NULL,
+                out_sum REAL NOT NULL,
+                out_max REAL NOT NULL,
+                PRIMARY KEY (resolution, ip, bucket)
+            ) WITHOUT ROWID
+        ''')
+    
+    @staticmethod
+    def _columns(conn, table: str) -> Dict[str, str]:
+        """Colonnes d'une table existante -> type déclaré ({} si la table n'existe pas)."""
+        return {row[1]: row[2].upper() for row in conn.execute(f'PRAGMA table_info({table})')}
+    
+    def _migrate_to_epoch(self, conn):
+        """
+        Version 1 du schéma : horodatages texte en heure locale -> secondes UTC entières.
+        Les anciennes tables sont renommées, copiées dans les nouvelles puis supprimées,
+        le tout dans une seule transaction.
+        """
+        legacy = [table for table in ('temperature_history', 'bandwidth_history')
+                  if 'timestamp' in self._columns(conn, table)]
+        legacy += [table for table in ('temperature_rollup', 'bandwidth_rollup')
+                   if self._columns(conn, table).get('bucket') == 'TEXT']
+        conn.execute('BEGIN')
+        try:
+            for table in legacy:
+                conn.execute(f'ALTER TABLE {table} RENAME TO {table}_v0')
+            self._create_tables(conn)
+            epoch = local_text_to_epoch_sql('timestamp')
+            if 'temperature_history' in legacy:
+                conn.execute(f'''
+                    INSERT INTO temperature_history (ip, ts, value)
+                    SELECT ip, {epoch}, value FROM temperature_history_v0
+                    WHERE timestamp IS NOT NULL
+                ''')
+            if 'bandwidth_history' in legacy:
+                conn.execute(f'''
+                    INSERT INTO bandwidth_history (ip, ts, in_mbps, out_mbps)
+                    SELECT ip, {epoch}, in_mbps, out_mbps FROM bandwidth_history_v0
+                    WHERE timestamp IS NOT NULL
+                ''')
+            # Tranches recalées sur l'heure UTC (identiques sauf fuseaux décalés d'une demi-heure)
+            bucket = local_text_to_epoch_sql('bucket')
+            if 'temperature_rollup' in legacy:
+                conn.execute(f'''
+                    INSERT INTO temperature_rollup (resolution, ip, bucket, count, min, sum, max)
+                    SELECT resolution, ip, b - b % resolution, count, min, sum, max
+                    FROM (SELECT *, {bucket} AS b FROM temperature_rollup_v0) WHERE b IS NOT NULL
+                    ON CONFLICT(resolution, ip, bucket) DO UPDATE SET {self._ROLLUP_MERGE['temperature']}
+                ''')
+            if 'bandwidth_rollup' in legacy:
+                conn.execute(f'''
+                    INSERT INTO bandwidth_rollup
+                        (resolution, ip, bucket, count, in_min, in_sum, in_max, out_min, out_sum, out_max)
+                    SELECT resolution, ip, b - b % resolution, count, in_min, in_sum, in_max, out_min, out_sum, out_max
+                    FROM (SELECT *, {bucket} AS b FROM bandwidth_rollup_v0) WHERE b IS NOT NULL
+                    ON CONFLICT(resolution, ip, bucket) DO UPDATE SET {self._ROLLUP_MERGE['bandwidth']}
+                ''')
+            for table in legacy:
+                conn.execute(f'DROP TABLE {table}_v0')
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if legacy:
+            logger.info(f"Historique monitoring converti en horodatages UTC: {', '.join(legacy)}")
+    
+    def _backfill_rollups(self, conn):
+        """Calcule les agrégats des mesures brutes existantes (base antérieure aux agrégats)."""
+        for table, backfill in (('temperature', self._BACKFILL_TEMP), ('bandwidth', self._BACKFILL_BW)):
+            if conn.execute(f'SELECT 1 FROM {table}_rollup LIMIT 1').fetchone():
+                continue
+            if not conn.execute(f'SELECT 1 FROM {table}_history LIMIT 1').fetchone():
+                continue
+            for resolution in self.ROLLUPS:
+                conn.execute(backfill, (resolution, resolution))
+            logger.info(f"Agrégats {table} calculés depuis l'historique existant")
+    
+    _BACKFILL_TEMP = '''
+        INSERT OR IGNORE INTO temperature_rollup (resolution, ip, bucket, count, min, sum, max)
+        SELECT ?1, ip, ts - ts % ?2 AS b, COUNT(*), MIN(value), SUM(value), MAX(value)
+        FROM temperature_history GROUP BY ip, b
+    '''
+    _BACKFILL_BW = '''
+        INSERT OR IGNORE INTO bandwidth_rollup
+            (resolution, ip, bucket, count, in_min, in_sum, in_max, out_min, out_sum, out_max)
+        SELECT ?1, ip, ts - ts % ?2 AS b, COUNT(*), MIN(in_mbps), SUM(in_mbps), MAX(in_mbps),
+               MIN(out_mbps), SUM(out_mbps), MAX(out_mbps)
+        FROM bandwidth_history GROUP BY ip, b
+    '''
+    
     def record_temperature(self, ip: str, value: float):
-        """Enregistre une mesure de température."""
+        """Enregistre une mesure de température (écriture différée)."""
         if value is None:
             return
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO temperature_history (ip, timestamp, value)
-                    VALUES (?, datetime('now', 'localtime'), ?)
-                ''', (ip, float(value)))
-                conn.commit()
+            self._enqueue('temperature', (ip, self._now(), float(value)))
         except Exception as e:
             logger.debug(f"Erreur enregistrement température {ip}: {e}")
     
     def record_bandwidth(self, ip: str, in_mbps: float, out_mbps: float):
-        """Enregistre une mesure de débit."""
+        """Enregistre une mesure de débit (écriture différée)."""
         if in_mbps is None and out_mbps is None:
             return
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO bandwidth_history (ip, timestamp, in_mbps, out_mbps)
-                    VALUES (?, datetime('now', 'localtime'), ?, ?)
-                ''', (ip, float(in_mbps or 0), float(out_mbps or 0)))
-                conn.commit()
+            self._enqueue('bandwidth', (ip, self._now(), float(in_mbps or 0), float(out_mbps or 0)))
         except Exception as e:
             logger.debug(f"Erreur enregistrement débit {ip}: {e}")
     
-    def get_temperature_history(self, ip: str, hours: int = 24) -> List[Dict]:
-        """Récupère l'historique de température pour un hôte."""
+    @staticmethod
+    def _now() -> int:
+        """Horodatage de la mesure (secondes UTC)."""
+        return utc_now()
+    
+    # Requêtes d'insertion par table
+    _INSERTS = {
+        'temperature': 'INSERT INTO temperature_history (ip, ts, value) VALUES (?, ?, ?)',
+        'bandwidth': 'INSERT INTO bandwidth_history (ip, ts, in_mbps, out_mbps) VALUES (?, ?, ?, ?)',
+    }
+    
+    # Fusion d'un agrégat partiel (lot) avec l'agrégat existant de la tranche
+    _ROLLUP_MERGE = {
+        'temperature': '''
+            count = count + excluded.count,
+            min = MIN(min, excluded.min),
+            sum = sum + excluded.sum,
+            max = MAX(max, excluded.max)
+        ''',
+        'bandwidth': '''
+            count = count + excluded.count,
+            in_min = MIN(in_min, excluded.in_min),
+            in_sum = in_sum + excluded.in_sum,
+            in_max = MAX(in_max, excluded.in_max),
+            out_min = MIN(out_min, excluded.out_min),
+            out_sum = out_sum + excluded.out_sum,
+            out_max = MAX(out_max, excluded.out_max)
+        ''',
+    }
+    _ROLLUP_UPSERTS = {
+        'temperature': f'''
+            INSERT INTO temperature_rollup (resolution, ip, bucket, count, min, sum, max)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(resolution, ip, bucket) DO UPDATE SET {_ROLLUP_MERGE['temperature']}
+        ''',
+        'bandwidth': f'''
+            INSERT INTO bandwidth_rollup
+                (resolution, ip, bucket, count, in_min, in_sum, in_max, out_min, out_sum, out_max)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(resolution, ip, bucket) DO UPDATE SET {_ROLLUP_MERGE['bandwidth']}
+        ''',
+    }
+    
+    @staticmethod
+    def _bucket(ts: int, resolution: int) -> int:
+        """Début de la tranche de `resolution` secondes contenant l'horodatage (secondes UTC)."""
+        return ts - ts % resolution
+    
+    def _rollup_rows(self, values: List[tuple]) -> List[tuple]:
+        """Agrégats partiels d'un lot de mesures brutes, une ligne par (résolution, ip, tranche)."""
+        aggregates = {}
+        for row in values:
+            ip, ts, measures = row[0], row[1], row[2:]
+            for resolution in self.ROLLUPS:
+                key = (resolution, ip, self._bucket(ts, resolution))
+                current = aggregates.get(key)
+                if current is None:
+                    aggregates[key] = [1] + [v for value in measures for v in (value, value, value)]
+                    continue
+                current[0] += 1
+                for i, value in enumerate(measures):
+                    base = 1 + 3 * i
+                    current[base] = min(current[base], value)
+                    current[base + 1] += value
+                    current[base + 2] = max(current[base + 2], value)
+        return [key + tuple(aggregate) for key, aggregate in aggregates.items()]
+    
+    def _enqueue(self, table: str, row: tuple):
+        with self._cond:
+            self._pending.append((table, row))
+            if len(self._pending) > self.MAX_PENDING:
+                dropped = len(self._pending) - self.MAX_PENDING
+                del self._pending[:dropped]
+                self.stats['dropped'] += dropped
+            if not self._running:
+                self._start_writer()
+            elif len(self._pending) >= self.FLUSH_ROWS:
+                self._cond.notify()
+    
+    def _start_writer(self):
+        """Démarre le thread d'écriture (appelé sous self._cond)."""
+        self._running = True
+        self._writer = threading.Thread(target=self._writer_loop, name='MonitoringHistoryWriter', daemon=True)
+        self._writer.start()
+    
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._pending) < self.FLUSH_ROWS:
+                    self._cond.wait(self.FLUSH_INTERVAL)
+                running = self._running
+            self.flush()
+            if not running:
+                return
+            if time.time() - self._last_cleanup >= self.CLEANUP_INTERVAL:
+                self._last_cleanup = time.time()
+                self.cleanup_old_data()
+    
+    def _get_write_connection(self):
+        if self._write_conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # En WAL, NORMAL ne synchronise le disque qu'aux checkpoints (usure des cartes SD)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._write_conn = conn
+        return self._write_conn
+    
+    def flush(self):
+        """Écrit immédiatement les mesures en attente (une transaction par lot)."""
+        with self._write_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            rows = {}
+            for table, row in batch:
+                rows.setdefault(table, []).append(row)
+            try:
+                conn = self._get_write_connection()
+                with conn:
+                    for table, values in rows.items():
+                        conn.executemany(self._INSERTS[table], values)
+                        conn.executemany(self._ROLLUP_UPSERTS[table], self._rollup_rows(values))
+                self.stats['rows_written'] += len(batch)
+                self.stats['batches'] += 1
+            except Exception as e:
+                logger.error(f"Erreur écriture historique monitoring ({len(batch)} mesures): {e}")
+                # Nouvelle tentative au prochain lot (connexion rouverte)
+                self._close_write_connection()
+                with self._cond:
+                    self._pending[:0] = batch
+                    if len(self._pending) > self.MAX_PENDING:
+                        dropped = len(self._pending) - self.MAX_PENDING
+                        del self._pending[:dropped]
+                        self.stats['dropped'] += dropped
+    
+    def _close_write_connection(self):
+        if self._write_conn is not None:
+            try:
+                self._write_conn.close()
+            except Exception:
+                pass
+            self._write_conn = None
+    
+    def close(self):
+        """Arrête le thread d'écriture après avoir écrit les mesures en attente."""
+        with self._cond:
+            writer = self._writer
+            self._running = False
+            self._cond.notify()
+        if writer is not None and writer.is_alive() and writer is not threading.current_thread():
+            writer.join(timeout=10)
+        self.flush()
+        with self._write_lock:
+            self._close_write_connection()
+    
+    def pick_resolution(self, hours: float) -> int:
+        """
+        Résolution de lecture pour une période : la plus grossière donnant encore
+        MIN_POINTS points, et dont la conservation couvre la période.
+        
+        Returns:
+            Résolution en secondes, 0 pour les mesures brutes
+        """
+        span = hours * 3600
+        levels = [0] + sorted(self.ROLLUPS)
+        chosen = 0
+        for resolution in levels[1:]:
+            if span / resolution >= self.MIN_POINTS:
+                chosen = resolution
+        # Période plus longue que la conservation : résolution plus grossière
+        for resolution in levels[levels.index(chosen):]:
+            chosen = resolution
+            if hours <= self._retention_days(resolution) * 24:
+                break
+        return chosen
+    
+    def _retention_days(self, resolution: int) -> int:
+        return self.ROLLUPS.get(resolution, self.RAW_RETENTION_DAYS) if resolution else self.RAW_RETENTION_DAYS
+    
+    def get_temperature_history(self, ip: str, hours: int = 24, resolution: int = None) -> List[Dict]:
+        """
+        Récupère l'historique de température pour un hôte.
+        value est la moyenne de la tranche (la mesure elle-même pour les données brutes).
+        
+        Args:
+            resolution: Résolution en secondes (0 : brut), choisie selon la période par défaut
+        """
+        if resolution is None:
+            resolution = self.pick_resolution(hours)
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff = datetime.now() - timedelta(hours=hours)
-                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+                cutoff = utc_now() - int(hours * 3600)
                 
-                cursor.execute('''
-                    SELECT timestamp, value
-                    FROM temperature_history
-                    WHERE ip = ? AND timestamp >= ?
-                    ORDER BY timestamp ASC
-                ''', (ip, cutoff_str))
+                if not resolution:
+                    cursor.execute('''
+                        SELECT ts, value
+                        FROM temperature_history
+                        WHERE ip = ? AND ts >= ?
+                        ORDER BY ts ASC
+                    ''', (ip, cutoff))
+                    return [
+                        {'ts': row['ts'], 'timestamp': to_local(row['ts']), 'value': row['value'],
+                         'min': row['value'], 'max': row['value']}
+                        for row in cursor.fetchall()
+                    ]
                 
+                cursor.execute('''
+                    SELECT bucket, count, min, sum, max
+                    FROM temperature_rollup
+                    WHERE resolution = ? AND ip = ? AND bucket >= ?
+                    ORDER BY bucket ASC
+                ''', (resolution, ip, self._bucket(cutoff, resolution)))
                 return [
-                    {'timestamp': row['timestamp'], 'value': row['value']}
+                    {'ts': row['bucket'], 'timestamp': to_local(row['bucket']), 'value': row['sum'] / row['count'],
+                     'min': row['min'], 'max': row['max']}
                     for row in cursor.fetchall()
                 ]
         except Exception as e:
             logger.error(f"Erreur lecture historique température {ip}: {e}")
             return []
     
-    def get_bandwidth_history(self, ip: str, hours: int = 24) -> List[Dict]:
-        """Récupère l'historique de débit pour un hôte."""
+    def get_bandwidth_history(self, ip: str, hours: int = 24, resolution: int = None) -> List[Dict]:
+        """
+        Récupère l'historique de débit pour un hôte.
+        in_mbps/out_mbps sont les moyennes de la tranche, in_max/out_max les pointes.
+        
+        Args:
+            resolution: Résolution en secondes (0 : brut), choisie selon la période par défaut
+        """
+        if resolution is None:
+            resolution = self.pick_resolution(hours)
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff = datetime.now() - timedelta(hours=hours)
-                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+                cutoff = utc_now() - int(hours * 3600)
                 
-                cursor.execute('''
-                    SELECT timestamp, in_mbps, out_mbps
-                    FROM bandwidth_history
-                    WHERE ip = ? AND timestamp >= ?
-                    ORDER BY timestamp ASC
-                ''', (ip, cutoff_str))
+                if not resolution:
+                    cursor.execute('''
+                        SELECT ts, in_mbps, out_mbps
+                        FROM bandwidth_history
+                        WHERE ip = ? AND ts >= ?
+                        ORDER BY ts ASC
+                    ''', (ip, cutoff))
+                    return [
+                        {
+                            'ts': row['ts'],
+                            'timestamp': to_local(row['ts']),
+                            'in_mbps': row['in_mbps'],
+                            'out_mbps': row['out_mbps'],
+                            'in_max': row['in_mbps'],
+                            'out_max': row['out_mbps']
+                        }
+                        for row in cursor.fetchall()
+                    ]
                 
+                cursor.execute('''
+                    SELECT bucket, count, in_sum, in_max, out_sum, out_max
+                    FROM bandwidth_rollup
+                    WHERE resolution = ? AND ip = ? AND bucket >= ?
+                    ORDER BY bucket ASC
+                ''', (resolution, ip, self._bucket(cutoff, resolution)))
                 return [
                     {
-                        'timestamp': row['timestamp'],
-                        'in_mbps': row['in_mbps'],
-                        'out_mbps': row['out_mbps']
+                        'ts': row['bucket'],
+                        'timestamp': to_local(row['bucket']),
+                        'in_mbps': row['in_sum'] / row['count'],
+                        'out_mbps': row['out_sum'] / row['count'],
+                        'in_max': row['in_max'],
+                        'out_max': row['out_max']
                     }
                     for row in cursor.fetchall()
                 ]
@@ -162,63 +539,72 @@ class MonitoringHistoryManager:
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
+                # Agrégats les plus grossiers : conservés le plus longtemps, une ligne par heure
+                coarsest = max(self.ROLLUPS)
                 
                 # Hôtes avec données de température
                 cursor.execute('''
-                    SELECT DISTINCT ip, MAX(timestamp) as last_update
-                    FROM temperature_history
+                    SELECT ip, MAX(bucket) as last_update
+                    FROM temperature_rollup
+                    WHERE resolution = ?
                     GROUP BY ip
-                ''')
+                ''', (coarsest,))
                 for row in cursor.fetchall():
                     ip = row['ip']
                     if ip not in result:
                         result[ip] = {'has_temperature': False, 'has_bandwidth': False}
                     result[ip]['has_temperature'] = True
-                    result[ip]['temp_last_update'] = row['last_update']
+                    result[ip]['temp_last_update'] = to_local(row['last_update'])
                 
                 # Hôtes avec données de débit
                 cursor.execute('''
-                    SELECT DISTINCT ip, MAX(timestamp) as last_update
-                    FROM bandwidth_history
+                    SELECT ip, MAX(bucket) as last_update
+                    FROM bandwidth_rollup
+                    WHERE resolution = ?
                     GROUP BY ip
-                ''')
+                ''', (coarsest,))
                 for row in cursor.fetchall():
                     ip = row['ip']
                     if ip not in result:
                         result[ip] = {'has_temperature': False, 'has_bandwidth': False}
                     result[ip]['has_bandwidth'] = True
-                    result[ip]['bw_last_update'] = row['last_update']
+                    result[ip]['bw_last_update'] = to_local(row['last_update'])
                 
         except Exception as e:
             logger.error(f"Erreur liste hôtes monitoring: {e}")
         
         return result
     
-    def cleanup_old_data(self, days: int = 7):
-        """Supprime les données plus anciennes que le nombre de jours spécifié."""
+    def cleanup_old_data(self, days: int = None):
+        """
+        Supprime les mesures brutes et les agrégats au-delà de leur durée de conservation.
+        
+        Args:
+            days: Conservation des mesures brutes (RAW_RETENTION_DAYS par défaut)
+        """
+        now = utc_now()
+        
+        def cutoff(retention_days):
+            return now - int(retention_days) * 86400
+        
+        raw_cutoff = cutoff(days if days is not None else self.RAW_RETENTION_DAYS)
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cutoff = datetime.now() - timedelta(days=days)
-                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
-                
-                cursor.execute(
-                    'DELETE FROM temperature_history WHERE timestamp < ?',
-                    (cutoff_str,)
-                )
-                temp_deleted = cursor.rowcount
-                
-                cursor.execute(
-                    'DELETE FROM bandwidth_history WHERE timestamp < ?',
-                    (cutoff_str,)
-                )
-                bw_deleted = cursor.rowcount
-                
-                conn.commit()
-                
-                if temp_deleted > 0 or bw_deleted > 0:
-                    logger.info(f"Nettoyage monitoring: {temp_deleted} temp, {bw_deleted} bw supprimés")
-                    
+            with self._write_lock:
+                conn = self._get_write_connection()
+                with conn:
+                    deleted = 0
+                    for table in ('temperature', 'bandwidth'):
+                        deleted += conn.execute(
+                            f'DELETE FROM {table}_history WHERE ts < ?', (raw_cutoff,)
+                        ).rowcount
+                        for resolution, retention_days in self.ROLLUPS.items():
+                            deleted += conn.execute(
+                                f'DELETE FROM {table}_rollup WHERE resolution = ? AND bucket < ?',
+                                (resolution, cutoff(retention_days))
+                            ).rowcount
+            
+            if deleted > 0:
+                logger.info(f"Nettoyage monitoring: {deleted} lignes supprimées")
         except Exception as e:
             logger.error(f"Erreur nettoyage données monitoring: {e}")
 
@@ -231,4 +617,15 @@ def get_monitoring_manager() -> MonitoringHistoryManager:
     global monitoring_manager
     if monitoring_manager is None:
         monitoring_manager = MonitoringHistoryManager()
+        # Filet de sécurité : mesures en attente écrites à la sortie de l'interpréteur
+        atexit.register(monitoring_manager.close)
     return monitoring_manager
+
+
+def close_monitoring_manager():
+    """Écrit les mesures en attente et ferme l'instance globale (arrêt de l'application)."""
+    if monitoring_manager is not None:
+        try:
+            monitoring_manager.close()
+        except Exception as e:
+            logger.error(f"Erreur fermeture historique monitoring: {e}")
@@ -4,6 +4,7 @@
 #     pass
 import src.ip_fct as fct_ip
 from src import var
+from src.utils.dns_cache import dns_cache
 import threading
 import multiprocessing
 import queue
@@ -92,7 +93,7 @@ def threadIp(self, comm, model, ip, tout, i, hote, port, site=""):
             # Mode "Tous" : Ajoute TOUS les hôtes (UP et DOWN)
             if is_ok:
                 try:
-                    nom = fct_ip.socket.gethostbyaddr(ip)[0]
+                    nom = dns_cache.reverse_sync(ip)
                 except Exception:
                     # Fallback SNMP
                     snmp_name = fct_ip.resolve_snmp_name(ip, timeout=0.5)
@@ -121,7 +122,7 @@ def threadIp(self, comm, model, ip, tout, i, hote, port, site=""):
             # Mode "Alive" : Ajoute UNIQUEMENT les hôtes UP
             if is_ok:
                 try:
-                    nom = fct_ip.socket.gethostbyaddr(ip)[0]
+                    nom = dns_cache.reverse_sync(ip)
                 except Exception:
                     # Fallback SNMP
                     snmp_name = fct_ip.resolve_snmp_name(ip, timeout=0.5)
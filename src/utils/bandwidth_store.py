@@ -0,0 +1,120 @@
+"""
+Débits SNMP calculés par le worker SNMP.
+Le SNMPWorker calcule les débits une fois par cycle d'interrogation (delta des
+compteurs d'octets, débordement des compteurs 32/64 bits compris) et les publie
+ici, déjà formatés pour l'affichage. Le serveur web ne fait que les lire : la
+valeur affichée ne dépend plus de la fréquence de rafraîchissement des navigateurs.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.utils.colors import format_bandwidth
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+NO_BANDWIDTH = {'in': '-', 'out': '-'}
+
+
+def counter_delta(previous: int, current: int, bits: int = 64) -> Optional[int]:
+    """
+    Nombre d'octets entre deux lectures d'un compteur SNMP.
+
+    Un compteur 32 bits (ifInOctets) qui décroît a débordé : le delta est calculé
+    modulo 2^32. Si le résultat dépasse la moitié de la plage, ou pour un compteur
+    64 bits (ifHCInOctets, qui ne déborde pas en pratique), la baisse correspond à
+    une réinitialisation (redémarrage de l'équipement) : None, la mesure sert de
+    nouvelle référence.
+    """
+    delta = current - previous
+    if delta >= 0:
+        return delta
+    if bits == 32:
+        wrapped = delta + 2 ** 32
+        if wrapped < 2 ** 31:
+            return wrapped
+    return None
+
+
+def counter_bits(data: dict) -> int:
+    """Largeur du compteur d'une mesure ('bits', sinon déduite des valeurs)."""
+    bits = data.get('bits')
+    if bits in (32, 64):
+        return bits
+    return 64 if max(data.get('in', 0), data.get('out', 0)) >= 2 ** 32 else 32
+
+
+def compute_rates(previous: Optional[dict], current: Optional[dict]) -> Optional[Tuple[float, float]]:
+    """
+    Débits (in_mbps, out_mbps) entre deux mesures {'in', 'out', 'timestamp'[, 'bits']}.
+    None s'il n'y a pas de mesure précédente exploitable (première mesure, horloge, remise à zéro).
+    """
+    if not previous or not current:
+        return None
+    time_delta = current['timestamp'] - previous['timestamp']
+    if time_delta <= 0:
+        return None
+    bits = counter_bits(current)
+    in_delta = counter_delta(previous['in'], current['in'], bits)
+    out_delta = counter_delta(previous['out'], current['out'], bits)
+    if in_delta is None or out_delta is None:
+        return None
+    # octets/s -> Mbits/s, 6 décimales pour conserver les très petits débits (quelques bps)
+    return (round(in_delta * 8 / (time_delta * 1_000_000), 6),
+            round(out_delta * 8 / (time_delta * 1_000_000), 6))
+
+
+class BandwidthStore:
+    """
+    Derniers débits connus par IP, thread-safe.
+    Chaque entrée contient les valeurs brutes (Mbps) et les libellés formatés ;
+    la version n'est incrémentée que si les libellés affichés changent.
+    """
+
+    def __init__(self):
+        self._rates: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def publish(self, ip: str, in_mbps: float, out_mbps: float):
+        """Enregistre le débit mesuré d'un hôte (appelé par le worker SNMP)."""
+        entry = {
+            'in': format_bandwidth(in_mbps),
+            'out': format_bandwidth(out_mbps),
+            'in_mbps': in_mbps,
+            'out_mbps': out_mbps,
+            'updated_at': time.time(),
+        }
+        with self._lock:
+            previous = self._rates.get(ip)
+            self._rates[ip] = entry
+            if previous is None or previous['in'] != entry['in'] or previous['out'] != entry['out']:
+                self.version += 1
+
+    def get(self, ip: str) -> dict:
+        """Libellés {'in', 'out'} du dernier débit connu, '-' si aucun."""
+        entry = self._rates.get(ip)
+        if entry is None:
+            return NO_BANDWIDTH
+        return {'in': entry['in'], 'out': entry['out']}
+
+    def get_rate(self, ip: str) -> Optional[dict]:
+        """Entrée complète (Mbps, libellés, horodatage) ou None."""
+        entry = self._rates.get(ip)
+        return dict(entry) if entry is not None else None
+
+    def remove(self, ip: str):
+        with self._lock:
+            if self._rates.pop(ip, None) is not None:
+                self.version += 1
+
+    def clear(self):
+        with self._lock:
+            self._rates.clear()
+            self.version += 1
+
+
+# Instance globale : écrite par le worker SNMP, lue par le serveur web
+bandwidth_store = BandwidthStore()
@@ -0,0 +1,235 @@
+"""
+Cache DNS asynchrone pour les cibles de sonde.
+Les noms d'hôtes sont résolus une fois puis conservés pendant leur TTL ; les
+échecs sont mis en cache (cache négatif) et les entrées sont rafraîchies en
+arrière-plan avant expiration, si bien que la latence mesurée par les sondes
+ne comprend plus le temps de résolution.
+
+Backend : aiodns (TTL réels) si installé, sinon getaddrinfo de la boucle
+asyncio avec un TTL par défaut. La résolution inverse des noms est aussi
+disponible en synchrone pour les threads (ajout d'hôtes).
+"""
+
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import aiodns
+    AIODNS_AVAILABLE = True
+except ImportError:
+    aiodns = None
+    AIODNS_AVAILABLE = False
+
+
+class _Entry:
+    """Entrée du cache : adresses (ou erreur) et échéances."""
+    __slots__ = ('addresses', 'error', 'refresh_at', 'expires')
+
+    def __init__(self, addresses, error, ttl, refresh_ratio):
+        now = time.monotonic()
+        self.addresses = addresses
+        self.error = error
+        self.refresh_at = now + ttl * refresh_ratio
+        self.expires = now + ttl
+
+
+class DNSCache:
+    """
+    Cache de résolution partagé par toutes les sondes (ICMP, TCP, HTTP).
+    Thread-safe : les entrées sont protégées par un verrou, les résolutions
+    asynchrones en cours sont mutualisées par boucle asyncio.
+    """
+
+    def __init__(self, default_ttl=300, min_ttl=30, max_ttl=3600,
+                 negative_ttl=30, refresh_ratio=0.8):
+        """
+        Args:
+            default_ttl: TTL utilisé quand le backend ne le fournit pas (s)
+            min_ttl / max_ttl: Bornes appliquées aux TTL reçus (s)
+            negative_ttl: Durée de mise en cache d'un échec (s)
+            refresh_ratio: Fraction du TTL après laquelle l'entrée est rafraîchie
+        """
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_ratio = refresh_ratio
+        # ('A', nom) ou ('PTR', ip) -> _Entry
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+        # (boucle, nom) -> tâche de résolution en cours
+        self._pending = {}
+        # Boucle -> résolveur aiodns (entrées des boucles fermées supprimées)
+        self._resolvers = {}
+        self.stats = {'hits': 0, 'misses': 0, 'negative_hits': 0, 'refreshes': 0}
+
+    @staticmethod
+    def is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    def _clamp(self, ttl) -> float:
+        return max(self.min_ttl, min(self.max_ttl, ttl))
+
+    def _get(self, key) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry.expires:
+                del self._entries[key]
+                return None
+            return entry
+
+    def _store(self, key, addresses, ttl, error=None):
+        with self._lock:
+            self._entries[key] = _Entry(addresses, error, ttl, self.refresh_ratio)
+
+    def _hit(self, entry: _Entry, host: str):
+        """Retourne les adresses d'une entrée valide ou lève l'erreur mise en cache."""
+        if entry.error:
+            self.stats['negative_hits'] += 1
+            raise socket.gaierror(socket.EAI_NONAME, f"{host}: {entry.error}")
+        self.stats['hits'] += 1
+        return list(entry.addresses)
+
+    # ==================== API asynchrone ====================
+
+    async def resolve(self, host: str) -> str:
+        """Résout un nom en une adresse IPv4 (première adresse)."""
+        return (await self.resolve_all(host))[0]
+
+    async def resolve_all(self, host: str) -> List[str]:
+        """
+        Résout un nom en adresses IPv4.
+
+        Raises:
+            socket.gaierror: si le nom ne se résout pas (y compris depuis le cache négatif)
+        """
+        if self.is_ip(host):
+            return [host]
+
+        name = host.lower()
+        entry = self._get(('A', name))
+        if entry is not None:
+            addresses = self._hit(entry, host)
+            if time.monotonic() >= entry.refresh_at:
+                self._schedule_refresh(name)
+            return addresses
+
+        self.stats['misses'] += 1
+        return await self._lookup_shared(name)
+
+    def _schedule_refresh(self, name: str):
+        """Relance la résolution en arrière-plan avant expiration de l'entrée."""
+        loop = asyncio.get_event_loop()
+        if (loop, name) in self._pending:
+            return
+        self.stats['refreshes'] += 1
+        task = loop.create_task(self._lookup_shared(name, refresh=True))
+        # Un échec de rafraîchissement est sans effet : l'ancienne entrée reste valable
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _lookup_shared(self, name: str, refresh: bool = False) -> List[str]:
+        """Mutualise les résolutions simultanées d'un même nom."""
+        loop = asyncio.get_event_loop()
+        key = (loop, name)
+        task = self._pending.get(key)
+        if task is None:
+            task = loop.create_task(self._lookup(name, refresh))
+            self._pending[key] = task
+            task.add_done_callback(lambda _t: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _lookup(self, name: str, refresh: bool) -> List[str]:
+        try:
+            addresses, ttl = await self._query(name)
+            if not addresses:
+                raise socket.gaierror(socket.EAI_NONAME, f"{name}: aucune adresse IPv4")
+        except (OSError, UnicodeError) as e:
+            if refresh and self._get(('A', name)) is not None:
+                logger.debug(f"Rafraîchissement DNS échoué pour {name}, entrée conservée: {e}")
+                raise
+            self._store(('A', name), [], self.negative_ttl, error=str(e))
+            raise socket.gaierror(socket.EAI_NONAME, f"{name}: {e}")
+
+        self._store(('A', name), addresses, self._clamp(ttl))
+        logger.debug(f"Résolution DNS: {name} -> {addresses} (TTL {int(ttl)}s)")
+        return list(addresses)
+
+    async def _query(self, name: str) -> Tuple[List[str], float]:
+        """Interroge le backend. Retourne (adresses, ttl)."""
+        loop = asyncio.get_event_loop()
+        if AIODNS_AVAILABLE:
+            try:
+                resolver = self._resolvers.get(loop)
+                if resolver is None:
+                    resolver = aiodns.DNSResolver(loop=loop)
+                    self._prune_resolvers()
+                    self._resolvers[loop] = resolver
+                answers = await resolver.query(name, 'A')
+                if answers:
+                    return [a.host for a in answers], min(a.ttl for a in answers)
+            except Exception as e:
+                # Noms locaux (hosts, mDNS...) : repli sur le résolveur système
+                logger.debug(f"aiodns sans réponse pour {name}, repli getaddrinfo: {e}")
+
+        infos = await loop.getaddrinfo(name, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos)), self.default_ttl
+
+    def _prune_resolvers(self):
+        """
+        Oublie les résolveurs des boucles fermées : check_website_sync crée une
+        boucle temporaire par vérification, leurs résolveurs ne serviront plus.
+        """
+        for loop in [loop for loop in self._resolvers if loop.is_closed()]:
+            resolver = self._resolvers.pop(loop, None)
+            try:
+                resolver.cancel()
+            except Exception:
+                pass
+
+    # ==================== API synchrone (threads) ====================
+
+    def reverse_sync(self, ip: str) -> str:
+        """
+        Résolution inverse (nom d'hôte d'une adresse IP) avec cache.
+
+        Raises:
+            socket.herror: si aucun nom n'est associé (y compris depuis le cache négatif)
+        """
+        entry = self._get(('PTR', ip))
+        if entry is not None:
+            if entry.error:
+                self.stats['negative_hits'] += 1
+                raise socket.herror(entry.error)
+            self.stats['hits'] += 1
+            return entry.addresses[0]
+
+        self.stats['misses'] += 1
+        try:
+            name = socket.gethostbyaddr(ip)[0]
+        except (OSError, UnicodeError) as e:
+            self._store(('PTR', ip), [], self.negative_ttl, error=str(e))
+            raise socket.herror(str(e))
+
+        self._store(('PTR', ip), [name], self.default_ttl)
+        return name
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Instance globale partagée par toutes les sondes
+dns_cache = DNSCache()
@@ -0,0 +1,72 @@
+"""
+Réduction côté serveur du nombre de points des séries affichées en graphique.
+
+Largest-Triangle-Three-Buckets (LTTB, S. Steinarsson) : la série est découpée en
+tranches ; dans chaque tranche, le point retenu est celui qui forme le plus grand
+triangle avec le point retenu précédemment et la moyenne de la tranche suivante.
+Les pics et les creux sont conservés, contrairement à une moyenne ou à un
+échantillonnage régulier. Le premier et le dernier point sont toujours gardés.
+"""
+
+from typing import List, Optional, Sequence
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Indices des points retenus par LTTB, par ordre croissant.
+
+    Args:
+        xs: Abscisses croissantes (horodatages)
+        ys: Valeurs (numériques)
+        threshold: Nombre de points souhaité (toute la série si < 3 ou >= len(xs))
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    indices = [0]
+    # Tranches intermédiaires : le premier et le dernier point sont fixés
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Moyenne de la tranche suivante (dernier point pour la dernière tranche)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[anchor], ys[anchor]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        indices.append(best)
+        anchor = best
+
+    indices.append(count - 1)
+    return indices
+
+
+def downsample_indices(xs: Sequence[float], series: Sequence[Sequence[float]],
+                       points: Optional[int]) -> List[int]:
+    """
+    Indices à conserver pour plusieurs séries partageant les mêmes abscisses.
+    Chaque série dispose d'une part égale des points ; l'union des indices
+    retenus garde les extrêmes de chacune (environ `points` indices).
+
+    Args:
+        points: Nombre de points souhaité, None ou <= 0 pour ne rien réduire
+    """
+    count = len(xs)
+    if not points or points <= 0 or points >= count or not series:
+        return list(range(count))
+    share = max(3, points // len(series))
+    selected = set()
+    for ys in series:
+        selected.update(lttb_indices(xs, ys, share))
+    return sorted(selected)
@@ -146,6 +146,7 @@ if not GUI_AVAILABLE:
             return self._data.get(role)
         def setBackground(self, brush): pass
         def setForeground(self, brush): pass
+        def setToolTip(self, text): pass
         def setCheckable(self, b): pass
         def setEditable(self, b): pass
         def setSelectable(self, b): pass
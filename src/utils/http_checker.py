@@ -5,18 +5,46 @@ Permet de vérifier la disponibilité d'un site web via des requêtes HTTP/HTTPS
 
 import aiohttp
 import asyncio
+import socket
+import ssl
 import time
 import re
 from urllib.parse import urlparse
 import logging
+from aiohttp.abc import AbstractResolver
+
+from src.utils.dns_cache import dns_cache
 
 logger = logging.getLogger(__name__)
 
 
+class CachedResolver(AbstractResolver):
+    """Résolveur aiohttp adossé au cache DNS partagé des sondes."""
+
+    def __init__(self):
+        # Repli pour les noms sans adresse IPv4 (sites IPv6 uniquement)
+        self._fallback = aiohttp.ThreadedResolver()
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        try:
+            addresses = await dns_cache.resolve_all(host)
+        except OSError:
+            return await self._fallback.resolve(host, port, family)
+        return [
+            {'hostname': host, 'host': address, 'port': port,
+             'family': socket.AF_INET, 'proto': 0, 'flags': socket.AI_NUMERICHOST}
+            for address in addresses
+        ]
+
+    async def close(self):
+        await self._fallback.close()
+
+
 class HTTPChecker:
     """Classe pour effectuer des vérifications HTTP/HTTPS sur des sites web."""
     
-    def __init__(self, timeout=5, follow_redirects=True, verify_ssl=True):
+    def __init__(self, timeout=5, follow_redirects=True, verify_ssl=True,
+                 pool_limit=100, limit_per_host=2, keepalive_timeout=30):
         """
         Initialise le vérificateur HTTP.
         
@@ -24,10 +52,58 @@ class HTTPChecker:
             timeout: Timeout en secondes pour les requêtes
             follow_redirects: Suivre les redirections HTTP
             verify_ssl: Vérifier les certificats SSL (False pour auto-signés)
+            pool_limit: Nombre maximal de connexions ouvertes dans le pool
+            limit_per_host: Nombre maximal de connexions par site
+            keepalive_timeout: Durée de conservation des connexions inactives (s)
         """
         self.timeout = timeout
         self.follow_redirects = follow_redirects
         self.verify_ssl = verify_ssl
+        self.pool_limit = pool_limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._ssl_context = None
+        # Une session (et son pool de connexions) par boucle asyncio
+        self._sessions = {}
+    
+    def _get_ssl_context(self):
+        """Contexte TLS unique partagé par toutes les connexions du pool."""
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self.verify_ssl:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+    
+    def _get_session(self):
+        """
+        Retourne la session de la boucle courante, créée à la première utilisation.
+        Les connexions restent ouvertes (keep-alive) entre deux vérifications.
+        """
+        loop = asyncio.get_event_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=self._get_ssl_context(),
+                limit=self.pool_limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                resolver=CachedResolver(),
+                use_dns_cache=False
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._sessions[loop] = session
+        return session
+    
+    async def close(self):
+        """Ferme la session de la boucle courante (à appeler avant la fin de la boucle)."""
+        session = self._sessions.pop(asyncio.get_event_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
     
     @staticmethod
     def is_valid_url(url):
@@ -114,72 +190,72 @@ class HTTPChecker:
             }
         
         timeout_value = timeout if timeout is not None else self.timeout
-        
-        # Préparer la session HTTP
-        connector = aiohttp.TCPConnector(ssl=self.verify_ssl)
         timeout_obj = aiohttp.ClientTimeout(total=timeout_value)
         
         start_time = time.time()
         
         try:
-            async with aiohttp.ClientSession(connector=connector, timeout=timeout_obj) as session:
-                # Essayer d'abord avec HTTPS si pas de protocole spécifié dans l'URL originale
-                urls_to_try = [normalized_url]
-                
-                # Si HTTPS échoue sur un domaine simple, essayer HTTP en fallback
-                if not url.startswith('http://') and not url.startswith('https://'):
-                    urls_to_try.append(f'http://{url}')
-                
-                last_error = None
-                
-                for try_url in urls_to_try:
-                    try:
-                        async with session.get(
-                            try_url,
-                            allow_redirects=self.follow_redirects
-                        ) as response:
-                            response_time_ms = (time.time() - start_time) * 1000
-                            
-                            # Codes 2xx et 3xx sont considérés comme succès
-                            success = 200 <= response.status < 400
-                            
-                            return {
-                                'success': success,
-                                'status_code': response.status,
-                                'response_time_ms': round(response_time_ms, 2),
-                                'final_url': str(response.url),
-                                'error': None if success else f'HTTP {response.status}'
-                            }
-                    except aiohttp.ClientSSLError as e:
-                        # Si erreur SSL avec HTTPS, essayer HTTP
-                        last_error = f'Erreur SSL: {str(e)}'
-                        logger.info(f"SSL error for {try_url}, trying next URL if available: {e}")
-                        continue
-                    except aiohttp.ClientConnectorError as e:
-                        # Erreur de connexion (DNS, réseau, etc.)
-                        last_error = f'Erreur de connexion: {str(e)}'
-                        logger.info(f"Connection error for {try_url}: {e}")
-                        continue
-                    except aiohttp.ClientError as e:
-                        # Autres erreurs client (timeout, etc.)
-                        last_error = f'Erreur client: {str(e)}'
-                        logger.info(f"Client error for {try_url}: {e}")
-                        continue
-                    except Exception as e:
-                        last_error = f'Erreur inattendue: {str(e)}'
-                        logger.warning(f"Unexpected error for {try_url}: {e}")
-                        continue
-                
-                # Si aucune URL n'a fonctionné
-                response_time_ms = (time.time() - start_time) * 1000
-                return {
-                    'success': False,
-                    'status_code': None,
-                    'response_time_ms': round(response_time_ms, 2),
-                    'final_url': normalized_url,
-                    'error': last_error or 'Connection failed'
-                }
-                
+            # Session partagée : connexions keep-alive et TLS déjà établis réutilisés
+            session = self._get_session()
+            
+            # Essayer d'abord avec HTTPS si pas de protocole spécifié dans l'URL originale
+            urls_to_try = [normalized_url]
+            
+            # Si HTTPS échoue sur un domaine simple, essayer HTTP en fallback
+            if not url.startswith('http://') and not url.startswith('https://'):
+                urls_to_try.append(f'http://{url}')
+            
+            last_error = None
+            
+            for try_url in urls_to_try:
+                try:
+                    async with session.get(
+                        try_url,
+                        allow_redirects=self.follow_redirects,
+                        timeout=timeout_obj
+                    ) as response:
+                        response_time_ms = (time.time() - start_time) * 1000
+                        
+                        # Codes 2xx et 3xx sont considérés comme succès
+                        success = 200 <= response.status < 400
+                        
+                        return {
+                            'success': success,
+                            'status_code': response.status,
+                            'response_time_ms': round(response_time_ms, 2),
+                            'final_url': str(response.url),
+                            'error': None if success else f'HTTP {response.status}'
+                        }
+                except aiohttp.ClientSSLError as e:
+                    # Si erreur SSL avec HTTPS, essayer HTTP
+                    last_error = f'Erreur SSL: {str(e)}'
+                    logger.info(f"SSL error for {try_url}, trying next URL if available: {e}")
+                    continue
+                except aiohttp.ClientConnectorError as e:
+                    # Erreur de connexion (DNS, réseau, etc.)
+                    last_error = f'Erreur de connexion: {str(e)}'
+                    logger.info(f"Connection error for {try_url}: {e}")
+                    continue
+                except aiohttp.ClientError as e:
+                    # Autres erreurs client (timeout, etc.)
+                    last_error = f'Erreur client: {str(e)}'
+                    logger.info(f"Client error for {try_url}: {e}")
+                    continue
+                except Exception as e:
+                    last_error = f'Erreur inattendue: {str(e)}'
+                    logger.warning(f"Unexpected error for {try_url}: {e}")
+                    continue
+            
+            # Si aucune URL n'a fonctionné
+            response_time_ms = (time.time() - start_time) * 1000
+            return {
+                'success': False,
+                'status_code': None,
+                'response_time_ms': round(response_time_ms, 2),
+                'final_url': normalized_url,
+                'error': last_error or 'Connection failed'
+            }
+            
         except asyncio.TimeoutError:
             response_time_ms = (time.time() - start_time) * 1000
             return {
@@ -203,7 +279,9 @@ class HTTPChecker:
 
 # Instance globale par défaut
 # Timeout augmenté à 10s pour éviter les faux positifs sur les sites lents
-http_checker = HTTPChecker(timeout=10, follow_redirects=True, verify_ssl=False)
+# Pool partagé : 2 connexions keep-alive max par site
+http_checker = HTTPChecker(timeout=10, follow_redirects=True, verify_ssl=False,
+                           pool_limit=100, limit_per_host=2)
 
 
 # Fonction helper pour usage synchrone
@@ -221,8 +299,12 @@ def check_website_sync(url, timeout=5):
     try:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(http_checker.check_website(url, timeout))
-        loop.close()
+        try:
+            result = loop.run_until_complete(http_checker.check_website(url, timeout))
+        finally:
+            # Boucle temporaire : fermer sa session avant la boucle
+            loop.run_until_complete(http_checker.close())
+            loop.close()
         return result
     except Exception as e:
         logger.error(f"Error in check_website_sync: {e}")
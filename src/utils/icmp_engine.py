@@ -0,0 +1,258 @@
+"""
+Moteur ICMP asynchrone natif pour Ping ü.
+Envoie les requêtes echo depuis le processus (sans lancer la commande `ping`)
+et multiplexe toutes les requêtes en attente sur un seul socket.
+
+Ordre de préférence des sockets :
+1. SOCK_DGRAM / IPPROTO_ICMP (non privilégié, Linux avec ping_group_range, macOS)
+2. SOCK_RAW / IPPROTO_ICMP (root ou CAP_NET_RAW)
+Si aucun n'est disponible (ou boucle Proactor sous Windows), `open()` retourne
+False et l'appelant doit se rabattre sur la commande système.
+"""
+
+import asyncio
+import os
+import socket
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# Charge utile fixe (56 octets comme la commande ping par défaut)
+_PAYLOAD = b"PingU-ICMP".ljust(56, b"\x00")
+
+
+def icmp_checksum(data: bytes) -> int:
+    """Calcule la somme de contrôle Internet (RFC 1071)."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = _PAYLOAD) -> bytes:
+    """Construit un paquet ICMP echo request."""
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident & 0xFFFF, seq & 0xFFFF)
+    checksum = icmp_checksum(header + payload)
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident & 0xFFFF, seq & 0xFFFF)
+    return header + payload
+
+
+def parse_echo_reply(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Extrait (identifiant, séquence) d'un paquet echo reply.
+    Gère la présence éventuelle de l'en-tête IP (socket raw, macOS).
+
+    Returns:
+        tuple (ident, seq) ou None si ce n'est pas un echo reply
+    """
+    if not data:
+        return None
+    # En-tête IPv4 présent : le premier octet vaut 0x4X (version 4)
+    if (data[0] >> 4) == 4 and len(data) >= 20:
+        ihl = (data[0] & 0x0F) * 4
+        data = data[ihl:]
+    if len(data) < 8:
+        return None
+    icmp_type, _code, _checksum, ident, seq = struct.unpack("!BBHHH", data[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return ident, seq
+
+
+class ICMPEngine:
+    """
+    Moteur ICMP echo asynchrone.
+    Un seul socket pour toutes les requêtes en vol ; les réponses sont associées
+    aux requêtes par (identifiant, numéro de séquence).
+    """
+
+    def __init__(self):
+        self._sock = None
+        self._loop = None
+        self.mode = None  # 'dgram' ou 'raw'
+        self._ident = os.getpid() & 0xFFFF
+        self._seq = 0
+        # seq -> (ip, t_envoi, future)
+        self._pending: Dict[int, Tuple[str, float, asyncio.Future]] = {}
+        # Limiteur optionnel (objet avec une coroutine acquire()), un jeton par paquet
+        self.rate_limiter = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._sock is not None
+
+    def open(self, loop=None) -> bool:
+        """
+        Ouvre le socket ICMP et l'enregistre auprès de la boucle asyncio.
+
+        Returns:
+            bool: True si le moteur est utilisable
+        """
+        if self._sock is not None:
+            return True
+
+        loop = loop or asyncio.get_event_loop()
+        for mode, sock_type in (("dgram", socket.SOCK_DGRAM), ("raw", socket.SOCK_RAW)):
+            try:
+                sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            except (PermissionError, OSError) as e:
+                logger.debug(f"Socket ICMP {mode} indisponible: {e}")
+                continue
+
+            try:
+                sock.setblocking(False)
+                loop.add_reader(sock.fileno(), self._on_readable)
+            except (NotImplementedError, OSError) as e:
+                # Boucle Proactor (Windows) : pas de add_reader
+                logger.debug(f"Boucle asyncio incompatible avec le socket ICMP: {e}")
+                sock.close()
+                return False
+
+            self._sock = sock
+            self._loop = loop
+            self.mode = mode
+            logger.info(f"Moteur ICMP natif actif (socket {mode})")
+            return True
+
+        return False
+
+    def close(self):
+        """Ferme le socket et annule les requêtes en attente."""
+        if self._sock is None:
+            return
+        try:
+            self._loop.remove_reader(self._sock.fileno())
+        except Exception:
+            pass
+        try:
+            self._sock.close()
+        except Exception:
+            pass
+        self._sock = None
+        for _ip, _sent, future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    def _next_seq(self) -> int:
+        """Retourne un numéro de séquence libre (16 bits)."""
+        for _ in range(0x10000):
+            self._seq = (self._seq + 1) & 0xFFFF
+            if self._seq not in self._pending:
+                return self._seq
+        raise RuntimeError("Trop de requêtes ICMP en vol")
+
+    def _on_readable(self):
+        """Lit toutes les réponses disponibles et réveille les requêtes associées."""
+        while self._sock is not None:
+            try:
+                data, addr = self._sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"Erreur lecture socket ICMP: {e}")
+                return
+
+            received = time.perf_counter()
+            parsed = parse_echo_reply(data)
+            if parsed is None:
+                continue
+            ident, seq = parsed
+
+            # Socket raw : on reçoit tout le trafic ICMP de la machine.
+            # Socket dgram : le noyau réécrit l'identifiant, le filtrage est déjà fait.
+            if self.mode == "raw" and ident != self._ident:
+                continue
+
+            entry = self._pending.get(seq)
+            if entry is None:
+                continue
+            ip, sent, future = entry
+            if addr and addr[0] != ip:
+                continue
+            del self._pending[seq]
+            if not future.done():
+                future.set_result((received - sent) * 1000.0)
+
+    async def echo(self, ip: str, timeout: float = 2.0) -> Optional[float]:
+        """
+        Envoie une requête echo et attend la réponse.
+
+        Args:
+            ip: Adresse IPv4 (déjà résolue)
+            timeout: Délai d'attente en secondes
+
+        Returns:
+            float: RTT en ms, ou None si pas de réponse
+        """
+        if self._sock is None:
+            raise RuntimeError("Moteur ICMP non ouvert")
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+            if self._sock is None:
+                return None
+
+        seq = self._next_seq()
+        packet = build_echo_request(self._ident, seq)
+        future = self._loop.create_future()
+        self._pending[seq] = (ip, time.perf_counter(), future)
+
+        try:
+            self._sock.sendto(packet, (ip, 0))
+        except OSError as e:
+            # Réseau injoignable, buffer plein, etc.
+            logger.debug(f"Échec envoi ICMP vers {ip}: {e}")
+            self._pending.pop(seq, None)
+            return None
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(seq, None)
+
+    async def ping(self, ip: str, count: int = 2, timeout: float = 2.0,
+                   interval: float = 0.2) -> List[Optional[float]]:
+        """
+        Envoie `count` requêtes echo espacées de `interval` secondes.
+        Avec interval=0 (paquets redondants en parallèle), la première réponse
+        suffit : les requêtes restantes sont annulées sans attendre leur délai
+        (voir ProbeResult.from_hedged pour le calcul des pertes).
+
+        Returns:
+            list: RTT en ms pour chaque requête (None si perdue ou annulée)
+        """
+        tasks = []
+        for i in range(max(1, count)):
+            if i:
+                await asyncio.sleep(interval)
+            tasks.append(asyncio.ensure_future(self.echo(ip, timeout)))
+        if interval > 0 or len(tasks) == 1:
+            return list(await asyncio.gather(*tasks))
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(task.result() is not None for task in done):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        return [None if task in pending else task.result() for task in tasks]
+
+    @property
+    def in_flight(self) -> int:
+        """Nombre de requêtes en attente de réponse."""
+        return len(self._pending)
@@ -10,6 +10,7 @@ import warnings
 warnings.filterwarnings('ignore', message='.*pysnmp.*deprecated.*')
 
 from src.utils.logger import get_logger
+from src.utils.bandwidth_store import compute_rates
 logger = get_logger(__name__)
 
 # Tentative d'import de pysnmp
@@ -774,18 +775,21 @@ class SNMPHelper:
             
             octets_in = await self._query_oid(ip, oid_in_hc)
             octets_out = await self._query_oid(ip, oid_out_hc)
+            bits = 64
             
             if octets_in is None or octets_out is None:
                 oid_in = f'1.3.6.1.2.1.2.2.1.10.{interface_index}'
                 oid_out = f'1.3.6.1.2.1.2.2.1.16.{interface_index}'
                 octets_in = await self._query_oid(ip, oid_in)
                 octets_out = await self._query_oid(ip, oid_out)
+                bits = 32
             
             if octets_in is not None and octets_out is not None:
                 return {
                     'in': int(octets_in),
                     'out': int(octets_out),
-                    'timestamp': time.time()
+                    'timestamp': time.time(),
+                    'bits': bits
                 }
         except Exception:
             pass
@@ -832,6 +836,7 @@ class SNMPHelper:
             # Essayer d'abord les OIDs 64 bits (supportés par les équipements modernes)
             octets_in = await self._query_oid(ip, oid_in_hc)
             octets_out = await self._query_oid(ip, oid_out_hc)
+            bits = 64
             
             # Si échec, essayer les OIDs 32 bits standards
             if octets_in is None or octets_out is None:
@@ -839,12 +844,15 @@ class SNMPHelper:
                 oid_out = f'1.3.6.1.2.1.2.2.1.16.{interface_index}'  # ifOutOctets
                 octets_in = await self._query_oid(ip, oid_in)
                 octets_out = await self._query_oid(ip, oid_out)
+                bits = 32
             
             if octets_in is not None and octets_out is not None:
+                # 'bits' : largeur du compteur, pour gérer son débordement
                 result = {
                     'in': int(octets_in),
                     'out': int(octets_out),
-                    'timestamp': time.time()
+                    'timestamp': time.time(),
+                    'bits': bits
                 }
                 self._has_snmp_cache.add(ip)
                 # logger.debug(f"📡 Compteurs SNMP récupérés pour {ip}: IN={int(octets_in):,}, OUT={int(octets_out):,} octets")
@@ -937,8 +945,10 @@ class SNMPHelper:
             previous_data: Données précédentes (dict avec 'in', 'out', 'timestamp')
             
         Returns:
-            dict: {'in_mbps': float, 'out_mbps': float, 'raw_data': current_data}
-                  ou None si échec
+            dict: {'in_mbps': float, 'out_mbps': float, 'raw_data': current_data,
+                   'measured': bool}
+                  ou None si échec. 'measured' est faux quand la mesure ne sert que de
+                  référence (pas de mesure précédente, compteur remis à zéro) : débits à 0.
         """
         # Récupérer les données actuelles
         current_data = await self.get_interface_traffic(ip, interface_index)
@@ -946,52 +956,27 @@ class SNMPHelper:
         if current_data is None:
             return None
         
-        # Si pas de données précédentes, retourner les données brutes seulement
-        if previous_data is None:
+        # Delta des compteurs (débordement 32/64 bits géré par compute_rates)
+        rates = compute_rates(previous_data, current_data)
+        if rates is None:
             return {
                 'in_mbps': 0.0,
                 'out_mbps': 0.0,
-                'raw_data': current_data
+                'raw_data': current_data,
+                'measured': False
             }
         
-        # Calculer le delta de temps (en secondes)
-        time_delta = current_data['timestamp'] - previous_data['timestamp']
-        
-        if time_delta <= 0:
-            return {
-                'in_mbps': 0.0,
-                'out_mbps': 0.0,
-                'raw_data': current_data
-            }
-        
-        # Calculer le delta d'octets
-        octets_in_delta = current_data['in'] - previous_data['in']
-        octets_out_delta = current_data['out'] - previous_data['out']
-        
-        # Log détaillé pour debug uniquement
-        logger.debug(f"Calcul débit {ip}: delta={time_delta:.1f}s")
-        
-        # Gérer le wraparound (compteur qui déborde)
-        if octets_in_delta < 0:
-            octets_in_delta = 0
-        if octets_out_delta < 0:
-            octets_out_delta = 0
-        
-        # Convertir en Mbps (octets/sec -> bits/sec -> Mbits/sec)
-        in_mbps = (octets_in_delta * 8) / (time_delta * 1_000_000)
-        out_mbps = (octets_out_delta * 8) / (time_delta * 1_000_000)
-        
-        # Utiliser 6 décimales pour capturer même les très petits débits (quelques bps)
         return {
-            'in_mbps': round(in_mbps, 6),
-            'out_mbps': round(out_mbps, 6),
-            'raw_data': current_data
+            'in_mbps': rates[0],
+            'out_mbps': rates[1],
+            'raw_data': current_data,
+            'measured': True
         }
     
     def calculate_bandwidth_sync(self, current_data, previous_data):
         """
         Version synchrone : Calcule la bande passante (débit) en Mbps entre deux mesures.
-        Utilisée par le serveur web qui a déjà les données brutes.
+        Utilisée quand les données brutes sont déjà disponibles.
         
         Args:
             current_data: Données actuelles (dict avec 'in', 'out', 'timestamp')
@@ -1001,34 +986,12 @@ class SNMPHelper:
             dict: {'in_mbps': float, 'out_mbps': float}
                   ou None si pas assez de données
         """
-        if current_data is None or previous_data is None:
-            return None
-        
-        # Calculer le delta de temps (en secondes)
-        time_delta = current_data['timestamp'] - previous_data['timestamp']
-        
-        if time_delta <= 0:
+        rates = compute_rates(previous_data, current_data)
+        if rates is None:
             return None
-        
-        # Calculer le delta d'octets
-        octets_in_delta = current_data['in'] - previous_data['in']
-        octets_out_delta = current_data['out'] - previous_data['out']
-        
-        # Gérer le wraparound (compteur qui déborde)
-        if octets_in_delta < 0:
-            octets_in_delta = 0
-        if octets_out_delta < 0:
-            octets_out_delta = 0
-        
-        # Convertir en Mbps (octets/sec -> bits/sec -> Mbits/sec)
-        in_mbps = (octets_in_delta * 8) / (time_delta * 1_000_000)
-        out_mbps = (octets_out_delta * 8) / (time_delta * 1_000_000)
-        
-        # Utiliser 6 décimales pour capturer même les très petits débits (quelques bps)
-        # Le formatage automatique s'occupera d'afficher l'unité appropriée
         return {
-            'in_mbps': round(in_mbps, 6),
-            'out_mbps': round(out_mbps, 6)
+            'in_mbps': rates[0],
+            'out_mbps': rates[1]
         }
     
     async def get_dsl_info(self, ip):
@@ -0,0 +1,31 @@
+"""
+Horodatages des bases d'historique.
+Les bases stockent des secondes UTC entières (colonne ts) : comparaisons et
+durées sont de simples opérations sur des entiers, sans ambiguïté aux
+changements d'heure. La conversion en heure locale n'est faite qu'à la lecture.
+"""
+
+import time
+
+LOCAL_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def utc_now() -> int:
+    """Secondes UTC (epoch) de l'instant présent."""
+    return int(time.time())
+
+
+def to_local(ts) -> str:
+    """Secondes UTC -> 'AAAA-MM-JJ HH:MM:SS' en heure locale (None si absent)."""
+    if ts is None:
+        return None
+    return time.strftime(LOCAL_FORMAT, time.localtime(ts))
+
+
+def local_text_to_epoch_sql(column: str) -> str:
+    """
+    Expression SQL convertissant une ancienne colonne texte en heure locale
+    ('AAAA-MM-JJ HH:MM:SS', datetime('now', 'localtime')) en secondes UTC.
+    Utilisée par les migrations de schéma.
+    """
+    return f"CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
@@ -18,6 +18,16 @@ scan_hs_hosts = []  # Liste des hôtes HS trouvés pendant le scan
 tourne = True
 delais = 5
 nbrHs = 3  # Nombre de tentatives échouées avant d'envoyer une alerte (par défaut: 3)
+ping_backend = "auto"  # Moteur de ping : "auto" (ICMP natif si possible), "icmp" ou "subprocess"
+probe_max_inflight = 100  # Nombre maximal de sondes simultanées
+probe_rate_pps = 0  # Débit maximal en paquets/seconde (0 = illimité)
+probe_max_web = 10  # Nombre maximal de sites web vérifiés simultanément
+probe_retry_mode = "adaptive"  # Nouvelles tentatives : "adaptive" (selon l'historique) ou "classic"
+probe_rtt_multiplier = 4.0  # Délai d'attente adaptatif = multiplicateur × p99 du RTT
+probe_processes = 0  # Processus de sonde (0 ou 1 = un seul thread, N > 1 = mode réparti)
+probe_shard_mode = "hash"  # Répartition entre processus : "hash" (par adresse) ou "site"
+web_broadcast_window_ms = 250  # Fenêtre de regroupement des diffusions web (0 = diffusion immédiate)
+probe_settings_version = 0  # Incrémenté à chaque modification des paramètres de sonde (relus par le service)
 
 # Événement pour arrêter proprement les threads (mail recap, etc.)
 # Utiliser stop_event.set() pour arrêter et stop_event.clear() pour réinitialiser
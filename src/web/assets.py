@@ -0,0 +1,189 @@
+"""
+Ressources statiques de l'interface web (JS, CSS, images).
+
+Construction (scripts/build_assets.py) : chaque fichier de static/ est copié dans
+static/dist/ sous un nom contenant l'empreinte de son contenu
+(js/admin.js -> dist/js/admin.<empreinte>.js), avec des versions précompressées
+.gz et .br (si le module brotli est installé) pour les fichiers compressibles.
+Le manifeste dist/manifest.json associe chaque nom source à son nom construit.
+
+Service : les templates utilisent asset_url('js/admin.js'). Si le fichier
+construit correspond au fichier source, l'URL fingerprintée /assets/... est
+servie avec un cache « immutable » d'un an et la variante compressée acceptée
+par le navigateur ; sinon (pas de construction, fichier modifié depuis) l'URL
+/static/ classique est utilisée avec ?v=<empreinte>.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import threading
+from typing import Dict, Optional
+
+from src.utils.logger import get_logger
+from src.web.payload_codec import accepts_encoding
+
+logger = get_logger(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+# Dossiers de static/ pris en compte
+ASSET_DIRS = ('js', 'css', 'img')
+# Fichiers précompressés (texte et icônes ; les PNG sont déjà compressés)
+COMPRESSIBLE = ('.js', '.css', '.svg', '.json', '.txt', '.ico')
+# Cache des fichiers fingerprintés : leur contenu ne change jamais pour une URL donnée
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    """'js/admin.js' -> 'js/admin.<empreinte>.js'"""
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest}{ext}"
+
+
+def _source_files(static_dir: str):
+    for folder in ASSET_DIRS:
+        base = os.path.join(static_dir, folder)
+        for current, _, files in os.walk(base):
+            for filename in sorted(files):
+                path = os.path.join(current, filename)
+                yield os.path.relpath(path, static_dir).replace(os.sep, '/'), path
+
+
+def build_assets(static_dir: str) -> Dict[str, str]:
+    """
+    Reconstruit static/dist/ (empreintes, .gz, .br) et son manifeste.
+
+    Returns:
+        Manifeste {nom source: nom construit relatif à static/dist/}
+    """
+    dist = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist, ignore_errors=True)
+    manifest = {}
+    for name, path in _source_files(static_dir):
+        with open(path, 'rb') as f:
+            data = f.read()
+        built = fingerprinted_name(name, fingerprint(data))
+        target = os.path.join(dist, *built.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        if name.endswith(COMPRESSIBLE):
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if BROTLI_AVAILABLE:
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+        manifest[name] = built
+    with open(os.path.join(dist, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    logger.info(f"Ressources web construites: {len(manifest)} fichiers dans {dist}"
+                f"{'' if BROTLI_AVAILABLE else ' (brotli non disponible : gzip seulement)'}")
+    return manifest
+
+
+class AssetManifest:
+    """
+    Résolution des URL des ressources statiques.
+    Une entrée du manifeste n'est utilisée que si son empreinte correspond au
+    fichier source actuel (vérifié une fois par fichier) : un fichier modifié
+    après la construction reste servi depuis sa version source.
+    """
+
+    def __init__(self, static_dir: str):
+        self.static_dir = static_dir
+        self._manifest: Optional[Dict[str, str]] = None
+        # nom source -> (endpoint, paramètres de url_for)
+        self._resolved: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        path = os.path.join(self.static_dir, DIST_DIR, MANIFEST_NAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.info("Pas de manifeste des ressources web (scripts/build_assets.py) : URL classiques")
+        except Exception as e:
+            logger.warning(f"Manifeste des ressources web illisible ({path}): {e}")
+        return {}
+
+    def resolve(self, name: str) -> tuple:
+        """(endpoint, paramètres de url_for) pour un nom source."""
+        with self._lock:
+            resolved = self._resolved.get(name)
+            if resolved is not None:
+                return resolved
+            if self._manifest is None:
+                self._manifest = self._load()
+            try:
+                with open(os.path.join(self.static_dir, *name.split('/')), 'rb') as f:
+                    digest = fingerprint(f.read())
+            except OSError:
+                # Fichier inconnu : URL classique, url_for signalera l'erreur éventuelle
+                digest = None
+            built = self._manifest.get(name)
+            if digest and built == fingerprinted_name(name, digest) and \
+                    os.path.exists(os.path.join(self.static_dir, DIST_DIR, *built.split('/'))):
+                resolved = ('assets', {'filename': built})
+            else:
+                resolved = ('static', {'filename': name, 'v': digest} if digest else {'filename': name})
+            self._resolved[name] = resolved
+            return resolved
+
+
+def precompressed_variant(path: str, accept_encoding: str) -> Optional[tuple]:
+    """(chemin, encodage) de la meilleure variante précompressée acceptée, ou None."""
+    for suffix, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+        if accepts_encoding(accept_encoding, encoding) and os.path.isfile(path + suffix):
+            return path + suffix, encoding
+    return None
+
+
+def init_assets(app):
+    """
+    Enregistre asset_url() dans les templates et la route des fichiers
+    fingerprintés (/assets/...) avec cache immutable et variantes précompressées.
+    """
+    from flask import request, send_file, url_for, abort
+    from werkzeug.security import safe_join
+
+    manifest = AssetManifest(app.static_folder)
+
+    def asset_url(name: str) -> str:
+        endpoint, params = manifest.resolve(name)
+        return url_for(endpoint, **params)
+
+    app.add_template_global(asset_url, 'asset_url')
+
+    @app.route('/assets/<path:filename>', endpoint='assets')
+    def assets(filename):
+        path = safe_join(os.path.join(app.static_folder, DIST_DIR), filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        variant = precompressed_variant(path, request.headers.get('Accept-Encoding', ''))
+        if variant:
+            response = send_file(variant[0], mimetype=mimetype, conditional=True, etag=True)
+            response.headers['Content-Encoding'] = variant[1]
+        else:
+            response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+        return response
+
+    return manifest
@@ -0,0 +1,113 @@
+"""
+Ordonnanceur des diffusions Socket.IO.
+Toutes les demandes de diffusion (résultats de sonde, synchronisation du
+modèle, routes d'administration...) passent par une fenêtre de regroupement :
+les demandes reçues pendant la fenêtre sont fusionnées et la diffusion n'a lieu
+qu'une fois par fenêtre et par cible (namespace, room).
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BroadcastScheduler:
+    """
+    Regroupe les demandes de diffusion par cible et appelle `flush(cible)` au
+    plus une fois par fenêtre. Une fenêtre nulle diffuse immédiatement dans le
+    thread appelant (comportement historique).
+    """
+
+    def __init__(self, flush: Callable[[Hashable], None],
+                 window: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            flush: Fonction de diffusion appelée avec la cible (namespace, room)
+            window: Fonction retournant la fenêtre de regroupement en secondes
+                    (lue à chaque demande pour suivre la configuration)
+        """
+        self._flush = flush
+        self._window = window or (lambda: 0.25)
+        # cible -> échéance de diffusion (time.monotonic)
+        self._pending: Dict[Hashable, float] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.stats = {'requests': 0, 'emits': 0}
+
+    def request(self, target: Hashable = ('/', None)):
+        """Demande une diffusion vers `target` ; fusionnée avec les demandes en attente."""
+        try:
+            window = max(0.0, float(self._window()))
+        except (TypeError, ValueError):
+            window = 0.25
+
+        with self._cond:
+            self.stats['requests'] += 1
+            if window == 0:
+                immediate = True
+            else:
+                immediate = False
+                if target not in self._pending:
+                    self._pending[target] = time.monotonic() + window
+                    self._ensure_thread()
+                    self._cond.notify()
+        if immediate:
+            self._emit(target)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="BroadcastScheduler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.monotonic()
+                    due = [target for target, deadline in self._pending.items() if deadline <= now]
+                    if due:
+                        for target in due:
+                            del self._pending[target]
+                        break
+                    timeout = min(self._pending.values()) - now if self._pending else None
+                    self._cond.wait(timeout)
+                else:
+                    return
+            for target in due:
+                self._emit(target)
+
+    def _emit(self, target):
+        with self._cond:
+            self.stats['emits'] += 1
+        try:
+            self._flush(target)
+        except Exception as e:
+            logger.error(f"Erreur diffusion vers {target}: {e}", exc_info=True)
+
+    def get_stats(self) -> dict:
+        """Demandes reçues, diffusions effectuées et taux de regroupement."""
+        with self._cond:
+            requests = self.stats['requests']
+            emits = self.stats['emits']
+            pending = len(self._pending)
+        return {
+            'requests': requests,
+            'emits': emits,
+            'coalesced': max(0, requests - emits - pending),
+            'coalescing_ratio': round(requests / emits, 2) if emits else 0.0,
+            'pending': pending,
+            'window_ms': int(max(0.0, float(self._window())) * 1000),
+        }
+
+    def stop(self):
+        """Arrête le thread de diffusion (les demandes en attente sont abandonnées)."""
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._cond.notify()
@@ -0,0 +1,96 @@
+"""
+Flux de changements des hôtes pour Socket.IO.
+Au lieu de rediffuser toute la liste à chaque mise à jour, le serveur compare
+la liste courante à la dernière diffusée et n'émet que les champs modifiés,
+regroupés par IP, dans un message `hosts_delta` numéroté.
+
+Chaque message porte `base` (numéro attendu par le client) et `seq` (nouveau
+numéro). Un client dont le numéro ne correspond pas (message manqué,
+reconnexion) redemande l'état : il reçoit les deltas manqués s'ils sont encore
+dans l'historique, sinon la liste complète (`hosts_update`, resynchronisation).
+Tout changement de structure (ajout, suppression, réordonnancement) provoque
+une resynchronisation complète.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Numéro de séquence des clients qui n'ont encore rien reçu
+NO_SEQ = -1
+
+
+class HostChangeFeed:
+    """Calcule les deltas successifs de la liste des hôtes (thread-safe)."""
+
+    def __init__(self, history: int = 64):
+        """
+        Args:
+            history: Nombre de deltas conservés pour rattraper un client en retard
+        """
+        self.seq = 0
+        self._rows: Optional[List[dict]] = None
+        # (base, seq, changes)
+        self._history = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.stats = {'deltas': 0, 'resyncs': 0, 'changed_hosts': 0}
+
+    @staticmethod
+    def _diff(old: Optional[List[dict]], new: List[dict]) -> Optional[Dict[str, dict]]:
+        """
+        Champs modifiés par IP, ou None si la structure a changé (ou si deux
+        lignes d'une même IP ont divergé : un delta par IP serait ambigu).
+        """
+        if old is None or len(old) != len(new):
+            return None
+        changes = {}
+        for before, after in zip(old, new):
+            ip = after.get('ip')
+            if before.get('ip') != ip or before.keys() - after.keys():
+                return None
+            fields = {key: value for key, value in after.items() if before.get(key) != value}
+            if ip in changes:
+                if changes[ip] != fields:
+                    return None
+            elif fields:
+                changes[ip] = fields
+        return changes
+
+    def publish(self, hosts: List[dict]) -> Optional[Tuple[str, dict]]:
+        """
+        Enregistre la nouvelle liste et retourne le message à diffuser :
+        ('hosts_delta', {...}), ('hosts_update', {...}) ou None si rien n'a changé.
+        """
+        with self._lock:
+            changes = self._diff(self._rows, hosts)
+            self._rows = hosts
+            if changes is None:
+                self.seq += 1
+                self._history.clear()
+                self.stats['resyncs'] += 1
+                return 'hosts_update', {'seq': self.seq, 'hosts': hosts}
+            if not changes:
+                return None
+            base = self.seq
+            self.seq += 1
+            self._history.append((base, self.seq, changes))
+            self.stats['deltas'] += 1
+            self.stats['changed_hosts'] += len(changes)
+            return 'hosts_delta', {'base': base, 'seq': self.seq, 'changes': changes}
+
+    def since(self, seq: int) -> Optional[dict]:
+        """
+        Delta cumulé depuis le numéro `seq` d'un client, ou None si l'historique
+        ne permet pas de le rattraper (resynchronisation complète nécessaire).
+        """
+        with self._lock:
+            if seq == self.seq and self._rows is not None:
+                return {'base': seq, 'seq': seq, 'changes': {}}
+            entries = [entry for entry in self._history if entry[0] >= seq]
+            if not entries or entries[0][0] != seq:
+                return None
+            merged = {}
+            for _base, _seq, changes in entries:
+                for ip, fields in changes.items():
+                    merged.setdefault(ip, {}).update(fields)
+            return {'base': seq, 'seq': self.seq, 'changes': merged}
@@ -0,0 +1,90 @@
+"""
+Requêtes sur la liste des hôtes pour l'API /api/hosts :
+filtres (site, statut, texte), tri, pagination et projection de champs.
+"""
+
+import ipaddress
+from typing import Iterable, List, Optional, Tuple
+
+# Nombre maximal d'hôtes par page
+MAX_LIMIT = 5000
+
+
+def _split(values: Iterable[str]) -> List[str]:
+    """Accepte ?site=A&site=B comme ?site=A,B"""
+    result = []
+    for value in values:
+        result.extend(part.strip() for part in str(value).split(',') if part.strip())
+    return result
+
+
+def _ip_key(value: str):
+    try:
+        return (0, int(ipaddress.ip_address(value)), '')
+    except ValueError:
+        return (1, 0, value.lower())
+
+
+def _number_key(value) -> float:
+    """Valeur numérique typée ; absente (hôte HS, pas de mesure) en dernier."""
+    return float(value) if value is not None else float('inf')
+
+
+# Champs affichés triés selon leur champ typé (HostManager)
+_TYPED_FIELDS = {'latence': 'latency_ms', 'latency_ms': 'latency_ms', 'temp': 'temp_c', 'temp_c': 'temp_c',
+                 'changed_at': 'changed_at'}
+
+
+def sort_key(field: str):
+    """Clé de tri d'un champ : IP numérique, champs typés (latence, température), texte sinon."""
+    if field == 'ip':
+        return lambda host: _ip_key(str(host.get('ip', '')))
+    if field in _TYPED_FIELDS:
+        typed = _TYPED_FIELDS[field]
+        return lambda host: _number_key(host.get(typed))
+    return lambda host: str(host.get(field, '') or '').lower()
+
+
+def query_hosts(hosts: List[dict], sites: Iterable[str] = (), status: Optional[str] = None,
+                text: Optional[str] = None, sort: Optional[str] = None, offset: int = 0,
+                limit: Optional[int] = None, fields: Iterable[str] = ()) -> Tuple[int, List[dict]]:
+    """
+    Applique filtres, tri, pagination et projection.
+
+    Args:
+        sites: Sites acceptés (vide = tous)
+        status: 'online' ou 'offline'
+        text: Recherche (insensible à la casse) dans l'IP, le nom, la MAC et le commentaire
+        sort: Champ de tri, préfixé par '-' pour un tri décroissant
+        offset / limit: Pagination (limit None = jusqu'à la fin)
+        fields: Champs retournés (vide = tous)
+
+    Returns:
+        (nombre total d'hôtes après filtrage, page d'hôtes)
+    """
+    sites = set(_split(sites))
+    result = hosts
+    if sites:
+        result = [host for host in result if host.get('site', '') in sites]
+    if status:
+        result = [host for host in result if host.get('status') == status]
+    if text:
+        needle = text.lower()
+        result = [host for host in result
+                  if any(needle in str(host.get(key, '') or '').lower()
+                         for key in ('ip', 'nom', 'mac', 'commentaire'))]
+    if sort:
+        descending = sort.startswith('-')
+        result = sorted(result, key=sort_key(sort.lstrip('-+')), reverse=descending)
+
+    total = len(result)
+    offset = max(0, int(offset or 0))
+    if limit is None:
+        page = result[offset:]
+    else:
+        page = result[offset:offset + max(0, min(MAX_LIMIT, int(limit)))]
+
+    fields = _split(fields)
+    if fields:
+        page = [{key: host.get(key) for key in fields} for host in page]
+    return total, page
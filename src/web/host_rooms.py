@@ -0,0 +1,153 @@
+"""
+Rooms Socket.IO des hôtes.
+Chaque client s'abonne à une room correspondant à son filtre : tous les hôtes,
+un ensemble de sites ou un tableau de bord. Le serveur calcule une seule fois
+la liste filtrée de chaque room active et ne diffuse aux membres que les hôtes
+concernés, avec un flux de changements (hosts_delta) propre à la room.
+L'encodage des listes complètes négocié par le client (voir payload_codec)
+fait partie du nom de la room : la charge utile n'est encodée qu'une fois.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.web.change_feed import HostChangeFeed
+from src.web.payload_codec import ENCODINGS
+
+logger = get_logger(__name__)
+
+ALL_HOSTS_ROOM = 'hosts:all'
+
+
+def room_for(spec: Optional[dict]) -> str:
+    """
+    Nom de room normalisé d'un filtre client :
+    {} -> 'hosts:all', {'sites': [...]} -> 'hosts:sites:<sites triés>',
+    {'dashboard': id} -> 'hosts:dashboard:<id>'.
+    Un encodage autre que 'json' ({'encoding': 'columnar'}) est ajouté en suffixe '|<encodage>'.
+    """
+    spec = spec or {}
+    dashboard = spec.get('dashboard')
+    sites = sorted({str(site) for site in (spec.get('sites') or [])})
+    if dashboard not in (None, ''):
+        room = f"hosts:dashboard:{int(dashboard)}"
+    elif sites:
+        room = 'hosts:sites:' + '\x1f'.join(sites)
+    else:
+        room = ALL_HOSTS_ROOM
+    encoding = spec.get('encoding')
+    if encoding in ENCODINGS and encoding != 'json':
+        room += '|' + encoding
+    return room
+
+
+class _Room:
+    __slots__ = ('sites', 'dashboard', 'ips', 'encoding', 'feed', 'members')
+
+    def __init__(self, name: str):
+        self.sites = None
+        self.dashboard = None
+        self.ips = None
+        self.feed = HostChangeFeed()
+        self.members = 0
+        name, _, encoding = name.partition('|')
+        self.encoding = encoding or 'json'
+        if name.startswith('hosts:sites:'):
+            self.sites = set(name[len('hosts:sites:'):].split('\x1f'))
+        elif name.startswith('hosts:dashboard:'):
+            self.dashboard = int(name[len('hosts:dashboard:'):])
+
+
+class HostRooms:
+    """Registre thread-safe des rooms actives et de l'abonnement de chaque client."""
+
+    def __init__(self):
+        # La room de tous les hôtes existe toujours (clients sans filtre)
+        self._rooms: Dict[str, _Room] = {ALL_HOSTS_ROOM: _Room(ALL_HOSTS_ROOM)}
+        self._clients: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, sid: str, spec: Optional[dict]) -> Tuple[Optional[str], str]:
+        """Abonne un client ; retourne (ancienne room, nouvelle room)."""
+        room = room_for(spec)
+        with self._lock:
+            previous = self._leave(sid)
+            entry = self._rooms.get(room)
+            if entry is None:
+                entry = _Room(room)
+                self._rooms[room] = entry
+            entry.members += 1
+            self._clients[sid] = room
+        return previous, room
+
+    def leave(self, sid: str) -> Optional[str]:
+        """Désabonne un client (déconnexion) ; retourne sa room."""
+        with self._lock:
+            return self._leave(sid)
+
+    def _leave(self, sid: str) -> Optional[str]:
+        room = self._clients.pop(sid, None)
+        entry = self._rooms.get(room)
+        if entry is not None:
+            entry.members -= 1
+            if entry.members <= 0 and room != ALL_HOSTS_ROOM:
+                del self._rooms[room]
+        return room
+
+    def room_of(self, sid: str) -> str:
+        with self._lock:
+            return self._clients.get(sid, ALL_HOSTS_ROOM)
+
+    def feed(self, room: str) -> HostChangeFeed:
+        with self._lock:
+            entry = self._rooms.get(room) or self._rooms[ALL_HOSTS_ROOM]
+            return entry.feed
+
+    def encoding(self, room: str) -> str:
+        """Encodage des listes complètes envoyées à une room."""
+        with self._lock:
+            entry = self._rooms.get(room)
+            return entry.encoding if entry is not None else 'json'
+
+    def active_rooms(self) -> List[str]:
+        """Rooms à diffuser : celles qui ont des membres (la room globale toujours)."""
+        with self._lock:
+            return [name for name, entry in self._rooms.items()
+                    if entry.members > 0 or name == ALL_HOSTS_ROOM]
+
+    def filter_hosts(self, room: str, hosts: List[dict]) -> List[dict]:
+        """Hôtes visibles dans une room."""
+        with self._lock:
+            entry = self._rooms.get(room)
+        if entry is None or (entry.sites is None and entry.dashboard is None):
+            return hosts
+        if entry.sites is not None:
+            return [host for host in hosts if host.get('site', '') in entry.sites]
+        ips = entry.ips
+        if ips is None:
+            ips = self._load_dashboard(entry.dashboard)
+            entry.ips = ips
+        return [host for host in hosts if host.get('ip') in ips]
+
+    @staticmethod
+    def _load_dashboard(dashboard_id: int) -> set:
+        try:
+            from src.database import get_dashboard
+            dashboard = get_dashboard(dashboard_id)
+            return set(dashboard.get('hosts', [])) if dashboard else set()
+        except Exception as e:
+            logger.error(f"Erreur lecture dashboard {dashboard_id} pour room: {e}")
+            return set()
+
+    def invalidate_dashboards(self):
+        """Relit les hôtes des tableaux de bord à la prochaine diffusion (après modification)."""
+        with self._lock:
+            for entry in self._rooms.values():
+                entry.ips = None
+
+    def stats(self) -> dict:
+        """Membres et compteurs du flux de changements par room."""
+        with self._lock:
+            return {name: {'members': entry.members, **entry.feed.stats}
+                    for name, entry in self._rooms.items()}
@@ -0,0 +1,293 @@
+"""
+Lecture du fichier de logs pour l'interface web.
+
+- tail_lines()  : N dernières lignes, lues par blocs depuis la fin du fichier
+                  (coût proportionnel aux lignes retournées, pas à la taille du fichier)
+- LogFilter     : filtre par niveau minimal, module (préfixe du logger) et texte ;
+                  les lignes de suite (traces d'exception) suivent leur enregistrement
+- LogFollower   : lit les lignes ajoutées depuis la lecture précédente et suit la
+                  rotation du fichier (RotatingFileHandler : app.log -> app.log.1)
+- LogStream     : suivi en continu pour les clients Socket.IO abonnés, un filtre
+                  par combinaison (niveau, module, texte)
+
+Le fichier n'est jamais gardé ouvert entre deux lectures : sous Windows, un
+fichier ouvert empêcherait la rotation par renommage.
+"""
+
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+# Volume maximal lu par cycle de suivi (rafale de logs) ; la suite est lue au cycle suivant
+MAX_READ_BYTES = 1024 * 1024
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+
+# Format de setup_logging : "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_HEADER_RE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d+)? - (\S+) - ([A-Z]+) - ')
+
+
+def _decode(data: bytes) -> List[str]:
+    return data.decode('utf-8', errors='replace').splitlines()
+
+
+def tail_lines(path: str, count: int, end: Optional[int] = None) -> List[str]:
+    """
+    Retourne les `count` dernières lignes du fichier (sans fin de ligne).
+
+    Args:
+        end: Position de fin de lecture (octets), fin du fichier par défaut
+    """
+    if count <= 0:
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell() if end is None else min(end, f.tell())
+        blocks = []
+        newlines = 0
+        # Une ligne de plus que demandé : la première, tronquée, est écartée
+        while position > 0 and newlines <= count:
+            size = min(BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            newlines += block.count(b'\n')
+            blocks.append(block)
+    lines = _decode(b''.join(reversed(blocks)))
+    if position > 0:
+        lines = lines[1:]
+    return lines[-count:]
+
+
+class LogFilter:
+    """Filtre de lignes de log (niveau minimal, préfixe de module, texte insensible à la casse)."""
+
+    def __init__(self, level: Optional[str] = None, module: Optional[str] = None,
+                 text: Optional[str] = None):
+        level = (level or '').upper()
+        self.level = level if level in LEVELS else None
+        self.module = (module or '').strip() or None
+        self.text = (text or '').strip().lower() or None
+        # Décision pour l'enregistrement en cours (lignes de suite d'une trace)
+        self._keep = True
+
+    @classmethod
+    def from_dict(cls, spec: Optional[dict]) -> 'LogFilter':
+        spec = spec if isinstance(spec, dict) else {}
+        return cls(spec.get('level'), spec.get('module'), spec.get('text'))
+
+    @property
+    def key(self) -> Tuple:
+        return self.level, self.module, self.text
+
+    @property
+    def active(self) -> bool:
+        return any(self.key)
+
+    def _matches(self, line: str, module: str, level: str) -> bool:
+        if self.level and LEVELS.get(level, 0) < LEVELS[self.level]:
+            return False
+        if self.module and not (module == self.module or module.startswith(self.module + '.')):
+            return False
+        if self.text and self.text not in line.lower():
+            return False
+        return True
+
+    def apply(self, lines: List[str]) -> List[str]:
+        """Lignes retenues ; l'état est conservé d'un appel à l'autre (suivi continu)."""
+        if not self.active:
+            return lines
+        kept = []
+        for line in lines:
+            match = _HEADER_RE.match(line)
+            if match:
+                self._keep = self._matches(line, match.group(1), match.group(2))
+            if self._keep:
+                kept.append(line)
+        return kept
+
+
+def _identity(stat) -> Tuple[int, int]:
+    return stat.st_dev, stat.st_ino
+
+
+class LogFollower:
+    """Lit les lignes complètes ajoutées au fichier depuis la lecture précédente."""
+
+    def __init__(self, path: str, from_start: bool = False):
+        self.path = path
+        self.position = 0
+        self._identity = None
+        self._partial = b''
+        if not from_start:
+            try:
+                stat = os.stat(path)
+                self.position = stat.st_size
+                self._identity = _identity(stat)
+            except OSError:
+                pass
+
+    @property
+    def line_position(self) -> int:
+        """Fin de la dernière ligne complète déjà lue."""
+        return self.position - len(self._partial)
+
+    def _read(self, path: str, start: int, stop: int) -> bytes:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            return f.read(max(0, stop - start))
+
+    def _drain_rotated(self) -> bytes:
+        """Fin de l'ancien fichier, renommé en .1 par la rotation depuis la dernière lecture."""
+        rotated = self.path + '.1'
+        try:
+            stat = os.stat(rotated)
+            if _identity(stat) == self._identity and stat.st_size > self.position:
+                return self._read(rotated, self.position, min(stat.st_size, self.position + MAX_READ_BYTES))
+        except OSError:
+            pass
+        return b''
+
+    def read_new(self) -> List[str]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+        data = b''
+        if self._identity is not None and _identity(stat) != self._identity:
+            # Rotation : fin de l'ancien fichier, puis le nouveau depuis le début
+            data = self._partial + self._drain_rotated()
+            if data and not data.endswith(b'\n'):
+                data += b'\n'
+            self._partial = b''
+            self.position = 0
+        elif stat.st_size < self.position:
+            # Fichier tronqué (effacement des logs)
+            self._partial = b''
+            self.position = 0
+        self._identity = _identity(stat)
+
+        if stat.st_size > self.position:
+            chunk = self._read(self.path, self.position, min(stat.st_size, self.position + MAX_READ_BYTES))
+            self.position += len(chunk)
+            chunk = self._partial + chunk
+            # Ligne en cours d'écriture : complétée à la lecture suivante
+            cut = chunk.rfind(b'\n') + 1
+            self._partial = chunk[cut:]
+            data += chunk[:cut]
+        return _decode(data)
+
+
+class LogStream:
+    """
+    Suivi du fichier de logs pour les clients abonnés.
+    Un thread lit les nouvelles lignes à intervalle régulier tant qu'il y a des
+    abonnés ; chaque filtre distinct n'est appliqué qu'une fois par cycle, puis
+    `emit(sid, lignes)` est appelé pour chaque abonné concerné.
+    """
+
+    def __init__(self, path: str, emit: Callable[[str, List[str]], None], interval: float = 1.0):
+        self.path = path
+        self._emit = emit
+        self.interval = interval
+        # clé de filtre -> (filtre, ensemble de sid)
+        self._groups: Dict[Tuple, Tuple[LogFilter, set]] = {}
+        self._clients: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._follower = None
+        self._thread = None
+
+    def subscribe(self, sid: str, spec: Optional[dict], lines: int = 200) -> List[str]:
+        """
+        Abonne (ou réabonne avec un autre filtre) un client.
+        Retourne les dernières lignes filtrées jusqu'à la position de suivi :
+        le flux reprend exactement après, sans doublon ni ligne manquée.
+        """
+        log_filter = LogFilter.from_dict(spec)
+        with self._lock:
+            self._remove(sid)
+            group = self._groups.get(log_filter.key)
+            if group is None:
+                group = (log_filter, set())
+                self._groups[log_filter.key] = group
+            group[1].add(sid)
+            self._clients[sid] = log_filter.key
+            if self._follower is None:
+                self._follower = LogFollower(self.path)
+            end = self._follower.line_position
+            if self._thread is None or not self._thread.is_alive():
+                self._wakeup.clear()
+                self._thread = threading.Thread(target=self._run, name='LogStream', daemon=True)
+                self._thread.start()
+        try:
+            initial = tail_lines(self.path, lines, end=end)
+        except OSError:
+            return []
+        return LogFilter.from_dict(spec).apply(initial)
+
+    def unsubscribe(self, sid: str):
+        with self._lock:
+            self._remove(sid)
+            if not self._clients:
+                self._wakeup.set()
+
+    def _remove(self, sid: str):
+        key = self._clients.pop(sid, None)
+        group = self._groups.get(key)
+        if group is not None:
+            group[1].discard(sid)
+            if not group[1]:
+                del self._groups[key]
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def poll(self):
+        """Un cycle : lit les nouvelles lignes et les envoie aux abonnés de chaque filtre."""
+        with self._lock:
+            follower = self._follower
+            groups = [(log_filter, list(sids)) for log_filter, sids in self._groups.values()]
+            if follower is None:
+                return
+            lines = follower.read_new()
+            if not lines:
+                return
+            batches = [(log_filter.apply(lines), sids) for log_filter, sids in groups]
+        for kept, sids in batches:
+            if not kept:
+                continue
+            for sid in sids:
+                try:
+                    self._emit(sid, kept)
+                except Exception as e:
+                    logger.debug(f"Erreur envoi logs au client {sid}: {e}")
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            with self._lock:
+                if not self._clients:
+                    # Plus d'abonnés : le prochain abonné repartira de la fin du fichier
+                    self._follower = None
+                    self._thread = None
+                    return
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Erreur suivi des logs: {e}", exc_info=True)
+
+    def stop(self):
+        with self._lock:
+            self._groups.clear()
+            self._clients.clear()
+        self._wakeup.set()
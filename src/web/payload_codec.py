@@ -0,0 +1,103 @@
+"""
+Encodages compacts des listes d'hôtes (Socket.IO et API REST).
+
+- 'json'            : liste de dicts (format historique)
+- 'columnar'        : table des clés + une ligne de valeurs par hôte
+                      {'c': [clés], 'r': [[valeurs], ...]}
+- 'columnar-gzip'   : format colonnes sérialisé en JSON puis compressé (gzip),
+                      envoyé en binaire (décompressé par DecompressionStream côté navigateur)
+
+Pour l'API REST, la compression gzip est négociée par Accept-Encoding et
+MessagePack par Accept (si le module msgpack est installé).
+"""
+
+import gzip
+import json
+from typing import List
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+ENCODINGS = ('json', 'columnar', 'columnar-gzip')
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+# En dessous de cette taille, la compression coûte plus qu'elle ne rapporte
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+
+def to_columnar(hosts: List[dict]) -> dict:
+    """Liste de dicts -> {'c': clés, 'r': lignes} (clés dans l'ordre de première apparition)."""
+    keys = {}
+    for host in hosts:
+        for key in host:
+            if key not in keys:
+                keys[key] = len(keys)
+    columns = list(keys)
+    return {'c': columns, 'r': [[host.get(key) for key in columns] for host in hosts]}
+
+
+def from_columnar(payload: dict) -> List[dict]:
+    """Inverse de to_columnar()."""
+    columns = payload.get('c', [])
+    return [dict(zip(columns, row)) for row in payload.get('r', [])]
+
+
+def encode_hosts(hosts: List[dict], encoding: str = 'json'):
+    """Encode une liste d'hôtes pour Socket.IO selon l'encodage négocié par le client."""
+    if encoding == 'columnar':
+        return to_columnar(hosts)
+    if encoding == 'columnar-gzip':
+        data = json.dumps(to_columnar(hosts), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return gzip.compress(data, compresslevel=GZIP_LEVEL)
+    return hosts
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """Vrai si l'en-tête Accept-Encoding accepte l'encodage ('gzip', 'br') avec q > 0."""
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip().lower() in (encoding, '*'):
+            params = params.replace(' ', '')
+            return params not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Vrai si l'en-tête Accept-Encoding accepte gzip (q > 0)."""
+    return accepts_encoding(accept_encoding, 'gzip')
+
+
+def compress_response(response, accept_encoding: str):
+    """
+    Compresse une réponse Flask (gzip) si le client l'accepte et si le contenu
+    s'y prête (texte/JSON, taille suffisante, pas déjà encodé ni en streaming).
+    """
+    try:
+        if (response.direct_passthrough or response.status_code < 200 or response.status_code >= 300
+                or 'Content-Encoding' in response.headers):
+            return response
+        mimetype = response.mimetype or ''
+        if not (mimetype.startswith('text/') or mimetype in ('application/json', 'application/javascript',
+                                                               MSGPACK_MIMETYPE)):
+            return response
+        response.vary.add('Accept-Encoding')
+        if not accepts_gzip(accept_encoding):
+            return response
+        data = response.get_data()
+        if len(data) < GZIP_MIN_SIZE:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+        # Les ETag de l'application sont faibles : valables pour la variante compressée
+        response.headers['Content-Encoding'] = 'gzip'
+    except Exception as e:
+        logger.debug(f"Compression de réponse ignorée: {e}")
+    return response
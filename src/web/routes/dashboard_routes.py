@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app
 from src.web_auth import WebAuth
 from src.utils.logger import get_logger
 from src.database import create_dashboard, get_dashboards, get_dashboard, update_dashboard, delete_dashboard
@@ -7,6 +7,13 @@ logger = get_logger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+def _refresh_dashboard_rooms():
+    """Recalcule les rooms Socket.IO des tableaux de bord après modification"""
+    web_server = current_app.config.get('WEB_SERVER')
+    if web_server:
+        web_server.host_rooms.invalidate_dashboards()
+        web_server.broadcast_update()
+
 @dashboard_bp.route('/api/dashboards', methods=['GET'])
 @WebAuth.login_required
 def list_dashboards():
@@ -61,6 +68,7 @@ def update_dashboard_route(dash_id):
             return jsonify({'success': False, 'error': 'Nom requis'}), 400
             
         if update_dashboard(dash_id, name, hosts):
+            _refresh_dashboard_rooms()
             return jsonify({'success': True})
         else:
             return jsonify({'success': False, 'error': 'Erreur mise à jour'}), 500
@@ -73,6 +81,7 @@ def update_dashboard_route(dash_id):
 def delete_dashboard_route(dash_id):
     try:
         if delete_dashboard(dash_id):
+            _refresh_dashboard_rooms()
             return jsonify({'success': True})
         else:
             return jsonify({'success': False, 'error': 'Erreur suppression'}), 500
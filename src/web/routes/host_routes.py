@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify, current_app
+import zlib
 from src.web_auth import WebAuth
 from src.utils.logger import get_logger
+from src.web.host_query import query_hosts
+from src.web.payload_codec import to_columnar, MSGPACK_AVAILABLE, MSGPACK_MIMETYPE
+if MSGPACK_AVAILABLE:
+    import msgpack
 try:
     from PySide6.QtGui import QStandardItem
 except ImportError:
@@ -13,9 +18,58 @@ host_bp = Blueprint('host', __name__)
 
 @host_bp.route('/api/hosts')
 def get_hosts():
-    server = current_app.config['WEB_SERVER']
-    hosts = server._get_hosts_data(apply_filter=False)
-    return jsonify(hosts)
+    """
+    Liste des hôtes. Paramètres optionnels :
+    offset, limit, sort (champ, '-champ' = décroissant), site (répétable ou séparé
+    par des virgules), status (online/offline), q (recherche), fields (projection),
+    format=columnar ({'c': clés, 'r': lignes}). Avec Accept: application/x-msgpack
+    (et msgpack installé), la réponse est encodée en MessagePack.
+    Le total après filtrage est dans l'en-tête X-Total-Count. L'ETag suit la
+    version de l'état des hôtes : If-None-Match retourne 304 sans recalcul.
+    """
+    try:
+        server = current_app.config['WEB_SERVER']
+        wants_msgpack = MSGPACK_AVAILABLE and request.accept_mimetypes.best_match(
+            ['application/json', MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+        query_hash = zlib.crc32((request.query_string or b'') + (b'|msgpack' if wants_msgpack else b''))
+        
+        def make_etag(version):
+            return f'{version}-{query_hash:08x}' if version is not None else None
+        
+        # Réponse 304 sans reconstruire la liste si l'état n'a pas changé
+        etag = make_etag(server.hosts_version())
+        if etag and request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+        
+        version, hosts = server.get_hosts_snapshot()
+        etag = make_etag(version)
+        total, page = query_hosts(
+            hosts,
+            sites=request.args.getlist('site'),
+            status=request.args.get('status'),
+            text=request.args.get('q'),
+            sort=request.args.get('sort'),
+            offset=request.args.get('offset', 0, type=int),
+            limit=request.args.get('limit', type=int),
+            fields=request.args.getlist('fields')
+        )
+        body = to_columnar(page) if request.args.get('format') == 'columnar' else page
+        if wants_msgpack:
+            response = current_app.response_class(msgpack.packb(body, use_bin_type=True),
+                                                  mimetype=MSGPACK_MIMETYPE)
+        else:
+            response = jsonify(body)
+        response.vary.add('Accept')
+        response.headers['X-Total-Count'] = str(total)
+        if etag:
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        logger.error(f"Erreur get_hosts: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 @host_bp.route('/api/delete_host', methods=['POST'])
 @WebAuth.login_required
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, jsonify, request, current_app
 from src.web_auth import WebAuth
 from src.utils.logger import get_logger
+from src.web.log_tail import tail_lines, LogFilter
 import os
 
 logger = get_logger(__name__)
@@ -19,21 +20,19 @@ def view_logs():
 @log_bp.route('/api/logs/content')
 @WebAuth.login_required
 def get_log_content():
-    """Récupère le contenu des logs (les N dernières lignes)"""
+    """Récupère le contenu des logs (les N dernières lignes, ?level=, ?module=, ?text=)"""
     try:
         lines_count = int(request.args.get('lines', 200))
         if not os.path.exists(LOG_FILE):
             return jsonify({'success': False, 'error': 'Fichier de logs introuvable'}), 404
             
-        logs = []
-        with open(LOG_FILE, 'r', encoding='utf-8', errors='replace') as f:
-            # Lire tout et garder les dernières lignes
-            # Pour un gros fichier, ce n'est pas optimal mais suffisant pour < 10MB
-            # Une optimisation serait d'utiliser seek() depuis la fin
-            all_lines = f.readlines()
-            logs = all_lines[-lines_count:]
+        # Lecture par blocs depuis la fin du fichier : seules les dernières lignes sont lues
+        logs = tail_lines(LOG_FILE, lines_count)
+        # Filtres optionnels (niveau minimal, module, texte) appliqués à ces lignes
+        logs = LogFilter(request.args.get('level'), request.args.get('module'),
+                         request.args.get('text')).apply(logs)
             
-        return jsonify({'success': True, 'logs': ''.join(logs)})
+        return jsonify({'success': True, 'logs': ''.join(line + '\n' for line in logs)})
     except Exception as e:
         logger.error(f"Erreur lecture logs: {e}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
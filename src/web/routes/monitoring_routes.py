@@ -1,7 +1,10 @@
+import time
 from flask import Blueprint, jsonify, request, current_app
 from src.web_auth import WebAuth
 from src.utils.logger import get_logger
 from src.monitoring_history import get_monitoring_manager
+from src.latency_history import get_latency_history, TIMEOUT_LATENCY
+from src.utils.downsample import downsample_indices
 
 logger = get_logger(__name__)
 
@@ -13,6 +16,7 @@ def get_monitoring_hosts():
     try:
         manager = get_monitoring_manager()
         hosts_data = manager.get_hosts_with_data()
+        latency_hosts = get_latency_history().get_hosts()
         
         # Récupérer les noms d'hôtes via le HostManager
         host_manager = None
@@ -28,13 +32,15 @@ def get_monitoring_hosts():
 
         # Convertir en liste pour le frontend
         hosts_list = []
-        for ip, data in hosts_data.items():
+        for ip in set(hosts_data) | set(latency_hosts):
+            data = hosts_data.get(ip, {})
             hostname = all_hosts_info.get(ip, ip)
             hosts_list.append({
                 'ip': ip,
                 'hostname': hostname,
                 'has_temperature': data.get('has_temperature', False),
-                'has_bandwidth': data.get('has_bandwidth', False)
+                'has_bandwidth': data.get('has_bandwidth', False),
+                'has_latency': ip in latency_hosts
             })
             
         # Trier par nom
@@ -45,18 +51,74 @@ def get_monitoring_hosts():
         logger.error(f"Erreur API monitoring hosts: {e}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Réduction côté serveur (points=) : nombre de points maximal accepté
+MAX_POINTS = 5000
+# Nombre d'hôtes maximal d'une requête groupée
+MAX_BATCH_HOSTS = 200
+
+def _points_arg():
+    """Paramètre points= : None (toutes les mesures) s'il est absent ou invalide."""
+    points = request.args.get('points', type=int)
+    if not points or points <= 0:
+        return None
+    return min(max(points, 3), MAX_POINTS)
+
+def _temperature_series(ip, hours, points):
+    manager = get_monitoring_manager()
+    resolution = manager.pick_resolution(hours)
+    data = manager.get_temperature_history(ip, hours, resolution)
+    if points and len(data) > points:
+        xs = [r['ts'] for r in data]
+        data = [data[i] for i in downsample_indices(xs, [[r['value'] for r in data]], points)]
+    
+    # Transformer pour l'API (ts : secondes UTC, timestamp : heure locale du serveur ;
+    # value : moyenne de la tranche pour les agrégats)
+    result = [{'ts': r['ts'], 'timestamp': r['timestamp'], 'value': r['value'], 'min': r['min'], 'max': r['max']} for r in data]
+    return {'data': result, 'resolution': resolution}
+
+def _bandwidth_series(ip, hours, points):
+    manager = get_monitoring_manager()
+    resolution = manager.pick_resolution(hours)
+    data = manager.get_bandwidth_history(ip, hours, resolution)
+    if points and len(data) > points:
+        xs = [r['ts'] for r in data]
+        series = [[r['in_mbps'] for r in data], [r['out_mbps'] for r in data]]
+        data = [data[i] for i in downsample_indices(xs, series, points)]
+    
+    # Transformer pour l'API (moyennes et pointes de la tranche pour les agrégats)
+    result = [{'ts': r['ts'], 'timestamp': r['timestamp'], 'in_mbps': r['in_mbps'], 'out_mbps': r['out_mbps'],
+               'in_max': r['in_max'], 'out_max': r['out_max']} for r in data]
+    return {'data': result, 'resolution': resolution}
+
+def _latency_series(ip, hours, points):
+    end = int(time.time())
+    samples = get_latency_history().get_range(ip, end - hours * 3600, end)
+    if points and len(samples) > points:
+        # Mesure sans réponse comptée comme une latence HS : les coupures restent visibles
+        rtts = [s[1] if s[1] is not None else TIMEOUT_LATENCY for s in samples]
+        indices = downsample_indices([s[0] for s in samples], [rtts, [s[2] for s in samples]], points)
+        samples = [samples[i] for i in indices]
+    
+    # Colonnes plutôt qu'objets : réponse plus compacte pour de longues périodes
+    result = {
+        't': [s[0] for s in samples],
+        'rtt': [s[1] for s in samples],
+        'loss': [s[2] for s in samples]
+    }
+    return {'data': result}
+
+_SERIES = {
+    'temperature': _temperature_series,
+    'bandwidth': _bandwidth_series,
+    'latency': _latency_series,
+}
+
 @monitoring_bp.route('/api/monitoring/temperature/<ip>')
 @WebAuth.any_login_required
 def get_temperature_history_route(ip):
     try:
         hours = int(request.args.get('hours', 24))
-        manager = get_monitoring_manager()
-        data = manager.get_temperature_history(ip, hours)
-        
-        # Transformer pour l'API
-        result = [{'timestamp': r['timestamp'], 'value': r['value']} for r in data]
-        
-        return jsonify({'success': True, 'data': result})
+        return jsonify({'success': True, **_temperature_series(ip, hours, _points_arg())})
     except Exception as e:
         logger.error(f"Erreur API monitoring temperature {ip}: {e}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -66,13 +128,73 @@ def get_temperature_history_route(ip):
 def get_bandwidth_history_route(ip):
     try:
         hours = int(request.args.get('hours', 24))
-        manager = get_monitoring_manager()
-        data = manager.get_bandwidth_history(ip, hours)
+        return jsonify({'success': True, **_bandwidth_series(ip, hours, _points_arg())})
+    except Exception as e:
+        logger.error(f"Erreur API monitoring bandwidth {ip}: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@monitoring_bp.route('/api/monitoring/latency/<ip>')
+@WebAuth.any_login_required
+def get_latency_history_route(ip):
+    """Latence (ms, null si pas de réponse) et pertes (0-1) par colonnes, horodatages en secondes UTC."""
+    try:
+        hours = int(request.args.get('hours', 24))
+        return jsonify({'success': True, **_latency_series(ip, hours, _points_arg())})
+    except Exception as e:
+        logger.error(f"Erreur API monitoring latence {ip}: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@monitoring_bp.route('/api/monitoring/batch')
+@WebAuth.any_login_required
+def get_history_batch_route():
+    """
+    Historiques de plusieurs hôtes en une requête :
+    ?ips=a,b&metrics=temperature,bandwidth,latency&hours=24&points=300
+    Réponse : {'data': {ip: {métrique: {'data': ..., 'resolution': ...}}}}
+    """
+    try:
+        ips = [ip.strip() for ip in request.args.get('ips', '').split(',') if ip.strip()]
+        metrics = [m.strip() for m in request.args.get('metrics', 'temperature,bandwidth,latency').split(',') if m.strip()]
+        unknown = [m for m in metrics if m not in _SERIES]
+        if not ips or unknown:
+            error = f"Métriques inconnues: {', '.join(unknown)}" if unknown else 'Paramètre ips requis'
+            return jsonify({'success': False, 'error': error}), 400
+        if len(ips) > MAX_BATCH_HOSTS:
+            return jsonify({'success': False, 'error': f'Maximum {MAX_BATCH_HOSTS} hôtes par requête'}), 400
         
-        # Transformer pour l'API
-        result = [{'timestamp': r['timestamp'], 'in_mbps': r['in_mbps'], 'out_mbps': r['out_mbps']} for r in data]
+        hours = int(request.args.get('hours', 24))
+        points = _points_arg()
+        result = {ip: {metric: _SERIES[metric](ip, hours, points) for metric in metrics} for ip in dict.fromkeys(ips)}
         
         return jsonify({'success': True, 'data': result})
     except Exception as e:
-        logger.error(f"Erreur API monitoring bandwidth {ip}: {e}", exc_info=True)
+        logger.error(f"Erreur API monitoring batch: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@monitoring_bp.route('/api/probe/stats')
+@WebAuth.any_login_required
+def get_probe_stats_route():
+    """État du pipeline de sondes : file d'attente, sondes en cours, limites."""
+    try:
+        main_window = current_app.config['MAIN_WINDOW']
+        ping_manager = None
+        if hasattr(main_window, 'main_controller'):
+            ping_manager = main_window.main_controller.ping_manager
+        stats = ping_manager.get_probe_stats() if ping_manager else {}
+        return jsonify({'success': True, 'running': ping_manager is not None, 'data': stats})
+    except Exception as e:
+        logger.error(f"Erreur API probe stats: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@monitoring_bp.route('/api/web/broadcast_stats')
+@WebAuth.any_login_required
+def get_broadcast_stats_route():
+    """Regroupement des diffusions Socket.IO : demandes, diffusions et taux de regroupement."""
+    try:
+        web_server = current_app.config['WEB_SERVER']
+        stats = web_server.broadcast_scheduler.get_stats()
+        stats['rooms'] = web_server.host_rooms.stats()
+        return jsonify({'success': True, 'data': stats})
+    except Exception as e:
+        logger.error(f"Erreur API broadcast stats: {e}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -23,6 +23,14 @@ def get_settings():
             'success': True,
             'delai': var.delais,
             'nb_hs': var.nbrHs,
+            'probe_max_inflight': var.probe_max_inflight,
+            'probe_rate_pps': var.probe_rate_pps,
+            'probe_max_web': var.probe_max_web,
+            'probe_retry_mode': var.probe_retry_mode,
+            'probe_rtt_multiplier': var.probe_rtt_multiplier,
+            'probe_processes': var.probe_processes,
+            'probe_shard_mode': var.probe_shard_mode,
+            'web_broadcast_window_ms': var.web_broadcast_window_ms,
             'alerts': {
                 'popup': var.popup, 'mail': var.mail, 'telegram': var.telegram,
                 'mail_recap': var.mailRecap, 'db_externe': var.dbExterne,
@@ -277,14 +285,54 @@ def save_settings():
                     var.nbrHs = int(data['nb_hs'])
                 except:
                     pass
+            if 'probe_max_inflight' in data:
+                try:
+                    var.probe_max_inflight = max(1, int(data['probe_max_inflight']))
+                except:
+                    pass
+            if 'probe_max_web' in data:
+                try:
+                    var.probe_max_web = max(1, int(data['probe_max_web']))
+                except:
+                    pass
+            if data.get('probe_retry_mode') in ('adaptive', 'classic'):
+                var.probe_retry_mode = data['probe_retry_mode']
+            if 'probe_rtt_multiplier' in data:
+                try:
+                    var.probe_rtt_multiplier = max(1.0, float(data['probe_rtt_multiplier']))
+                except:
+                    pass
+            if 'probe_processes' in data:
+                try:
+                    var.probe_processes = max(0, min(64, int(data['probe_processes'])))
+                except:
+                    pass
+            if data.get('probe_shard_mode') in ('hash', 'site'):
+                var.probe_shard_mode = data['probe_shard_mode']
+            if 'web_broadcast_window_ms' in data:
+                try:
+                    var.web_broadcast_window_ms = max(0, min(5000, int(data['web_broadcast_window_ms'])))
+                except:
+                    pass
+            if 'probe_rate_pps' in data:
+                try:
+                    var.probe_rate_pps = max(0, float(data['probe_rate_pps'] or 0))
+                except:
+                    pass
+            # Paramètres de sonde relus par le service au prochain tour
+            var.probe_settings_version += 1
                     
         db.save_param_db()
+        db.save_probe_params()
         return jsonify({'success': True})
     except Exception as e:
         logger.error(f"Erreur save_settings: {e}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
-from src.database import get_host_notification_settings, set_host_notification_settings
+from src.database import (
+    get_host_notification_settings, set_host_notification_settings,
+    get_host_probe_interval, set_host_probe_interval
+)
 
 @settings_bp.route('/api/test_smtp', methods=['POST'])
 @WebAuth.login_required
@@ -304,6 +352,7 @@ def test_smtp():
 def get_host_settings_route(ip):
     try:
         settings = get_host_notification_settings(ip)
+        settings['interval'] = get_host_probe_interval(ip)
         return jsonify({'success': True, 'settings': settings})
     except Exception as e:
         logger.error(f"Erreur get_host_settings {ip}: {e}")
@@ -317,6 +366,16 @@ def save_host_settings_route(ip):
         email = data.get('email', True)
         telegram = data.get('telegram', True)
         
+        if 'interval' in data:
+            try:
+                interval = float(data.get('interval') or 0)
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'error': 'Intervalle invalide'}), 400
+            if interval < 0:
+                return jsonify({'success': False, 'error': 'Intervalle invalide'}), 400
+            if not set_host_probe_interval(ip, interval):
+                return jsonify({'success': False, 'error': 'Erreur sauvegarde'}), 500
+        
         if set_host_notification_settings(ip, email, telegram):
             return jsonify({'success': True})
         else:
@@ -89,6 +89,20 @@ const translations = {
         monitoring_control: "Contrôle du Monitoring",
         ping_delay: "Délai entre pings (sec)",
         hs_before_alert: "Nombre de HS avant alerte",
+        probe_max_inflight: "Sondes simultanées max",
+        probe_rate_pps: "Débit max (paquets/s, 0 = illimité)",
+        probe_max_web: "Sites web vérifiés en parallèle",
+        probe_retry_mode: "Nouvelles tentatives",
+        probe_retry_adaptive: "Adaptatives (selon l'historique)",
+        probe_retry_classic: "Classiques (2 puis 3 paquets)",
+        probe_rtt_multiplier: "Délai d'attente (× p99 du RTT)",
+        probe_processes: "Processus de sonde (0 = désactivé, au redémarrage)",
+        probe_shard_mode: "Répartition",
+        probe_shard_hash: "Par adresse",
+        probe_shard_site: "Par site",
+        web_broadcast_window: "Regroupement des mises à jour web (ms)",
+        probe_queue: "File d'attente",
+        probe_in_flight: "En cours",
         start: "Démarrer",
         stop: "Arrêter",
         alerts_config: "Configuration des Alertes",
@@ -317,6 +331,20 @@ const translations = {
         monitoring_control: "Monitoring Control",
         ping_delay: "Delay between pings (sec)",
         hs_before_alert: "Failures before alert",
+        probe_max_inflight: "Max concurrent probes",
+        probe_rate_pps: "Max rate (packets/s, 0 = unlimited)",
+        probe_max_web: "Concurrent website checks",
+        probe_retry_mode: "Retries",
+        probe_retry_adaptive: "Adaptive (history based)",
+        probe_retry_classic: "Classic (2 then 3 packets)",
+        probe_rtt_multiplier: "Timeout (× RTT p99)",
+        probe_processes: "Probe processes (0 = off, on restart)",
+        probe_shard_mode: "Split",
+        probe_shard_hash: "By address",
+        probe_shard_site: "By site",
+        web_broadcast_window: "Web update coalescing (ms)",
+        probe_queue: "Queue",
+        probe_in_flight: "In flight",
         start: "Start",
         stop: "Stop",
         alerts_config: "Alerts Configuration",
@@ -1038,10 +1066,7 @@ socket.on('disconnect', function () {
     console.log('❌ Disconnected from server');
 });
 
-socket.on('hosts_update', function (hosts) {
-    if (!Array.isArray(hosts)) {
-        hosts = [];
-    }
+const hostsFeed = subscribeHostsFeed(socket, function (hosts) {
     hostsData = hosts;
     // Appliquer le tri actuel si défini
     if (currentSort.column) {
@@ -1053,12 +1078,25 @@ socket.on('hosts_update', function (hosts) {
     }
     updateStats(hosts);
 });
+// Tous les hôtes, en encodage compact
+hostsFeed.subscribe({});
 
 socket.on('monitoring_status', function (data) {
     monitoringRunning = data.running;
     updateMonitoringStatus(data.running);
+    updateProbeStats(data.probe);
 });
 
+function updateProbeStats(probe) {
+    const el = document.getElementById('probe-stats');
+    if (!el) return;
+    if (!probe || probe.queued === undefined) {
+        el.textContent = '';
+        return;
+    }
+    el.textContent = `${t('probe_queue')}: ${probe.queued} · ${t('probe_in_flight')}: ${probe.in_flight}/${probe.max_inflight}`;
+}
+
 socket.on('notification', function (data) {
     showNotification(data.message, data.type || 'info');
 });
@@ -1229,7 +1267,7 @@ function updateHostsTable(hosts) {
         <td>${escapeHtml(host.mac) || '-'}</td>
         <td>${escapeHtml(host.port) || '-'}</td>
         <td style="text-align: center;">
-            <span class="latency-badge ${getLatencyClass(host.latence)}">${escapeHtml(host.latence) || '-'}</span>
+            <span class="latency-badge ${getLatencyClass(host.latence)}" title="${escapeHtml(formatProbeDetails(host.probe))}">${escapeHtml(host.latence) || '-'}</span>
         </td>
         <td>${escapeHtml(host.temp) || '-'}</td>
         <td>
@@ -1521,7 +1559,15 @@ document.getElementById('file-import-csv').addEventListener('change', async func
 document.getElementById('btn-save-monitoring').addEventListener('click', async function () {
     const settings = {
         delai: parseInt(document.getElementById('input-delai').value) || 10,
-        nb_hs: parseInt(document.getElementById('input-nb-hs').value) || 3
+        nb_hs: parseInt(document.getElementById('input-nb-hs').value) || 3,
+        probe_max_inflight: parseInt(document.getElementById('input-probe-max-inflight').value) || 100,
+        probe_rate_pps: parseFloat(document.getElementById('input-probe-rate').value) || 0,
+        probe_max_web: parseInt(document.getElementById('input-probe-max-web').value) || 10,
+        probe_retry_mode: document.getElementById('input-probe-retry-mode').value,
+        probe_rtt_multiplier: parseFloat(document.getElementById('input-probe-rtt-multiplier').value) || 4,
+        probe_processes: parseInt(document.getElementById('input-probe-processes').value) || 0,
+        probe_shard_mode: document.getElementById('input-probe-shard-mode').value,
+        web_broadcast_window_ms: parseInt(document.getElementById('input-web-broadcast-window').value) || 0
     };
 
     try {
@@ -1912,6 +1958,30 @@ async function loadSettings() {
         if (result.nb_hs) {
             document.getElementById('input-nb-hs').value = result.nb_hs;
         }
+        if (result.probe_max_inflight) {
+            document.getElementById('input-probe-max-inflight').value = result.probe_max_inflight;
+        }
+        if (result.probe_max_web) {
+            document.getElementById('input-probe-max-web').value = result.probe_max_web;
+        }
+        if (result.probe_retry_mode) {
+            document.getElementById('input-probe-retry-mode').value = result.probe_retry_mode;
+        }
+        if (result.probe_rtt_multiplier) {
+            document.getElementById('input-probe-rtt-multiplier').value = result.probe_rtt_multiplier;
+        }
+        if (result.probe_processes !== undefined) {
+            document.getElementById('input-probe-processes').value = result.probe_processes;
+        }
+        if (result.probe_shard_mode) {
+            document.getElementById('input-probe-shard-mode').value = result.probe_shard_mode;
+        }
+        if (result.probe_rate_pps !== undefined) {
+            document.getElementById('input-probe-rate').value = result.probe_rate_pps;
+        }
+        if (result.web_broadcast_window_ms !== undefined) {
+            document.getElementById('input-web-broadcast-window').value = result.web_broadcast_window_ms;
+        }
 
         if (result.alerts) {
             document.getElementById('check-popup').checked = result.alerts.popup || false;
@@ -2100,6 +2170,16 @@ function getSiteColor(siteName) {
 }
 
 
+function formatProbeDetails(probe) {
+    // Détail de la dernière sonde : paquets reçus, pertes, min/moy/max et gigue
+    if (!probe) return '';
+    let text = `${probe.received}/${probe.sent} (${Math.round(probe.loss * 100)}% loss)`;
+    if (probe.received) {
+        text += ` · ${probe.min}/${probe.avg}/${probe.max} ms · jitter ${probe.jitter} ms`;
+    }
+    return text;
+}
+
 function getLatencyClass(latence) {
     if (!latence || latence === '-') return 'offline';
 
@@ -2804,6 +2884,8 @@ async function openHostSettings(ip, name) {
         if (result.success && result.settings) {
             if (emailCheck) emailCheck.checked = result.settings.email;
             if (telegramCheck) telegramCheck.checked = result.settings.telegram;
+            const intervalInput = document.getElementById('host-setting-interval');
+            if (intervalInput) intervalInput.value = result.settings.interval || '';
         }
     } catch (e) {
         console.error('Erreur chargement settings host:', e);
@@ -2819,11 +2901,14 @@ if (formHostSettings) {
         const ip = document.getElementById('host-settings-ip-input').value;
         const email = document.getElementById('host-setting-email').checked;
         const telegram = document.getElementById('host-setting-telegram').checked;
+        const intervalInput = document.getElementById('host-setting-interval');
+        const interval = intervalInput ? parseFloat(intervalInput.value) || 0 : 0;
 
         try {
             const result = await apiCall(`/api/host/settings/${ip}`, 'POST', {
                 email: email,
-                telegram: telegram
+                telegram: telegram,
+                interval: interval
             });
 
             if (result.success) {
@@ -0,0 +1,103 @@
+/**
+ * Flux de mises à jour des hôtes (Socket.IO)
+ * - hosts_update : liste complète + numéro de séquence (connexion, resynchronisation)
+ * - hosts_delta  : champs modifiés par IP depuis le numéro `base`
+ * Si un delta ne suit pas le dernier numéro reçu (message manqué, reconnexion),
+ * le client demande un rattrapage au serveur.
+ *
+ * subscribe(filtre) abonne le client à une room filtrée côté serveur
+ * ({sites: [...]}, {dashboard: id} ou {} pour tous les hôtes) ; le filtre est
+ * renvoyé automatiquement à chaque reconnexion. Les listes complètes sont alors
+ * reçues en encodage compact (colonnes, compressées en gzip si le navigateur
+ * sait les décompresser).
+ */
+
+const HOSTS_ENCODING = typeof DecompressionStream !== 'undefined' ? 'columnar-gzip' : 'columnar';
+
+// Décode une liste d'hôtes : tableau JSON, colonnes {c, r} ou colonnes compressées (binaire)
+async function decodeHostsPayload(payload) {
+    if (payload instanceof ArrayBuffer || ArrayBuffer.isView(payload)) {
+        const stream = new Blob([payload]).stream().pipeThrough(new DecompressionStream('gzip'));
+        payload = JSON.parse(await new Response(stream).text());
+    }
+    if (payload && Array.isArray(payload.c) && Array.isArray(payload.r)) {
+        return payload.r.map(function (row) {
+            const host = {};
+            payload.c.forEach(function (key, i) { host[key] = row[i]; });
+            return host;
+        });
+    }
+    return Array.isArray(payload) ? payload : [];
+}
+
+function subscribeHostsFeed(socket, onHosts) {
+    let hosts = [];
+    let seq = -1;
+    let resyncPending = false;
+    let filter = null;
+    // Les messages sont traités dans l'ordre, même si le décodage est asynchrone
+    let queue = Promise.resolve();
+
+    function enqueue(handler) {
+        queue = queue.then(handler).catch(function (e) {
+            console.error('Erreur flux hôtes:', e);
+        });
+    }
+
+    socket.on('connect', function () {
+        if (filter !== null) {
+            socket.emit('subscribe_hosts', filter);
+        }
+    });
+
+    socket.on('hosts_update', function (payload, newSeq) {
+        enqueue(async function () {
+            hosts = await decodeHostsPayload(payload);
+            seq = typeof newSeq === 'number' ? newSeq : -1;
+            resyncPending = false;
+            onHosts(hosts);
+        });
+    });
+
+    socket.on('hosts_delta', function (delta) {
+        enqueue(function () {
+            if (!delta || delta.base !== seq) {
+                // Numéro inattendu : une seule demande de rattrapage à la fois
+                if (!resyncPending) {
+                    resyncPending = true;
+                    socket.emit('request_update', { since: seq });
+                }
+                return;
+            }
+            resyncPending = false;
+            seq = delta.seq;
+
+            const changes = delta.changes || {};
+            let changed = false;
+            hosts.forEach(function (host) {
+                const fields = changes[host.ip];
+                if (fields) {
+                    Object.assign(host, fields);
+                    changed = true;
+                }
+            });
+            if (changed) {
+                onHosts(hosts);
+            }
+        });
+    });
+
+    return {
+        subscribe: function (newFilter) {
+            filter = Object.assign({}, newFilter || {}, { encoding: HOSTS_ENCODING });
+            // Avant connexion, l'abonnement est envoyé par le gestionnaire 'connect'
+            if (socket.connected) {
+                socket.emit('subscribe_hosts', filter);
+            }
+        },
+        // Vérification périodique : le serveur ne renvoie que les changements manqués
+        refresh: function () {
+            socket.emit('request_update', { since: seq });
+        }
+    };
+}
@@ -12,7 +12,7 @@ import sys
 import os
 try:
     from flask import Flask, render_template, jsonify, request, send_file, session, redirect, url_for, send_from_directory, Blueprint
-    from flask_socketio import SocketIO, emit
+    from flask_socketio import SocketIO, emit, join_room, leave_room
     from flask_cors import CORS
     import json
     import shutil
@@ -50,20 +50,17 @@ from src.utils.headless_compat import GUI_AVAILABLE, QObject, Signal, QStandardI
 
 
 from src.utils.logger import get_logger
-from src.utils.colors import format_bandwidth
+from src.utils.bandwidth_store import bandwidth_store
 from src.web_auth import web_auth, WebAuth
+from src.web.change_feed import NO_SEQ
+from src.web.host_rooms import HostRooms, ALL_HOSTS_ROOM
+from src.web.payload_codec import encode_hosts, compress_response
+from src.web.broadcast_scheduler import BroadcastScheduler
+from src.web.log_tail import LogStream
+from src.web.assets import init_assets
 
 logger = get_logger(__name__)
 
-# Import optionnel de SNMP
-try:
-    from src.utils.snmp_helper import snmp_helper
-    SNMP_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"SNMP non disponible pour le serveur web: {e}")
-    snmp_helper = None
-    SNMP_AVAILABLE = False
-
 # Import du scanner réseau
 try:
     from src.utils.network_scanner import NetworkScanner
@@ -136,10 +133,12 @@ class WebServer(QObject):
         self.server_thread = None
         self.running = False
         
-        # Cache partagé pour les débits SNMP (référence au cache du PingManager)
-        # Cache partagé pour les débits SNMP (référence au cache du PingManager)
-        self.traffic_cache = {}
-        self._bandwidth_cache = {}  # Cache des derniers débits calculés (IP -> {in_mbps, out_mbps})
+        self._init_hosts_state()
+        # Regroupement des demandes de diffusion (une diffusion par fenêtre et par cible)
+        self.broadcast_scheduler = BroadcastScheduler(self._flush_broadcast, window=self._broadcast_window)
+        # Suivi en continu du fichier de logs pour les clients abonnés (page Logs)
+        from src.web.routes.log_routes import LOG_FILE
+        self.log_stream = LogStream(LOG_FILE, self._emit_log_lines)
         
         # Gestionnaire de notifications
         self.notification_manager = NotificationManager()
@@ -158,6 +157,17 @@ class WebServer(QObject):
         self._setup_routes()
         self._setup_socketio()
         
+    def _init_hosts_state(self):
+        """État des listes d'hôtes : cache, version et rooms Socket.IO."""
+        # Les compteurs de version repartent de 0 à chaque lancement : l'identifiant
+        # d'instance évite qu'un ETag mis en cache avant un redémarrage corresponde encore
+        self.instance_id = secrets.token_hex(4)
+        # Liste enrichie (débits) mise en cache par version de l'état des hôtes et des débits
+        self._hosts_cache = (None, [])
+        self._hosts_cache_lock = threading.Lock()
+        # Rooms par filtre (tous, sites, dashboard), chacune avec son flux de changements (hosts_delta)
+        self.host_rooms = HostRooms()
+    
     def _setup_routes(self):
         """Configuration des routes Flask via Blueprints"""
         from src.web.routes.main_routes import main_bp
@@ -192,6 +202,14 @@ class WebServer(QObject):
 
         self.app.register_blueprint(notification_bp)
         
+        # Ressources statiques fingerprintées (asset_url dans les templates, cache immutable)
+        init_assets(self.app)
+        
+        # Compression gzip des réponses négociée par Accept-Encoding
+        @self.app.after_request
+        def _compress(response):
+            return compress_response(response, request.headers.get('Accept-Encoding', ''))
+        
         # Initialiser la variable globale dans notification_routes
         import src.web.routes.notification_routes as nr
         nr.notification_manager = self.notification_manager
@@ -216,24 +234,74 @@ class WebServer(QObject):
         def handle_connect():
             logger.info(f"Client web connecté")
             try:
-                hosts = self._get_hosts_data()
-                emit('hosts_update', hosts)
+                # Room par défaut : tous les hôtes (jusqu'à un éventuel subscribe_hosts)
+                self.host_rooms.subscribe(request.sid, None)
+                join_room(ALL_HOSTS_ROOM)
+                emit('hosts_update', *self._room_state(ALL_HOSTS_ROOM))
             except Exception as e:
                 logger.error(f"Erreur lors de l'envoi initial: {e}", exc_info=True)
-                emit('hosts_update', [])
+                emit('hosts_update', [], NO_SEQ)
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
+            self.host_rooms.leave(request.sid)
+            self.log_stream.unsubscribe(request.sid)
             logger.info("Client web déconnecté")
         
+        @self.socketio.on('subscribe_hosts')
+        def handle_subscribe_hosts(data=None):
+            """
+            Abonnement à une room filtrée : {'sites': [...]} ou {'dashboard': id} ({} = tous),
+            avec éventuellement 'encoding' ('columnar', 'columnar-gzip') pour les listes complètes
+            """
+            try:
+                previous, room = self.host_rooms.subscribe(request.sid, data if isinstance(data, dict) else None)
+                if previous and previous != room:
+                    leave_room(previous)
+                join_room(room)
+                emit('hosts_update', *self._room_state(room))
+            except Exception as e:
+                logger.error(f"Erreur abonnement room: {e}", exc_info=True)
+                emit('hosts_update', [], NO_SEQ)
+        
         @self.socketio.on('request_update')
-        def handle_request_update():
+        def handle_request_update(data=None):
             try:
-                hosts = self._get_hosts_data()
-                emit('hosts_update', hosts)
+                room = self.host_rooms.room_of(request.sid)
+                feed = self.host_rooms.feed(room)
+                # Client en retard : rattrapage par les deltas manqués si possible
+                since = data.get('since') if isinstance(data, dict) else None
+                if isinstance(since, int) and since >= 0:
+                    delta = feed.since(since)
+                    if delta is not None:
+                        emit('hosts_delta', delta)
+                        return
+                emit('hosts_update', *self._room_state(room))
             except Exception as e:
                 logger.error(f"Erreur lors de l'envoi: {e}", exc_info=True)
-                emit('hosts_update', [])
+                emit('hosts_update', [], NO_SEQ)
+        
+        @self.socketio.on('follow_logs')
+        def handle_follow_logs(data=None):
+            """
+            Suivi des logs en continu (admin) : {'level', 'module', 'text', 'lines'}.
+            Renvoie les dernières lignes filtrées (reset) puis les nouvelles lignes au fil de l'eau.
+            """
+            try:
+                if not session.get('logged_in') or session.get('role') != 'admin':
+                    emit('log_lines', {'success': False, 'error': 'Non authentifié'})
+                    return
+                spec = data if isinstance(data, dict) else {}
+                count = min(5000, max(0, int(spec.get('lines', 200))))
+                lines = self.log_stream.subscribe(request.sid, spec, count)
+                emit('log_lines', {'success': True, 'reset': True, 'lines': lines})
+            except Exception as e:
+                logger.error(f"Erreur abonnement aux logs: {e}", exc_info=True)
+                emit('log_lines', {'success': False, 'error': str(e)})
+        
+        @self.socketio.on('unfollow_logs')
+        def handle_unfollow_logs(data=None):
+            self.log_stream.unsubscribe(request.sid)
         
         @self.socketio.on_error_default
         def default_error_handler(e):
@@ -269,13 +337,8 @@ class WebServer(QObject):
                              # Vérifier si l'hôte a un site qui correspond
                              continue
                     
-                    latence_text = host.get('latence', 'N/A')
-                    
-                    # Calculer la couleur de latence
-                    latency_color = self._get_latency_color(latence_text)
-                    
+                    # Couleur et libellés déjà dérivés des champs typés par le HostManager
                     host_data = host.copy() # Copie pour ne pas modifier l'original dans HostManager
-                    host_data['latency_color'] = latency_color
                     
                     # Récupération des débits depuis le cache (non bloquant)
                     bandwidth = self._get_cached_bandwidth(ip)
@@ -298,54 +361,49 @@ class WebServer(QObject):
         
         return hosts
     
+    def hosts_version(self):
+        """
+        Version de la liste des hôtes (instance du serveur, état du HostManager et
+        débits SNMP), None sans HostManager.
+        """
+        if not self.host_manager:
+            return None
+        return f"{self.instance_id}.{self.host_manager.get_snapshot()[0]}.{bandwidth_store.version}"
+
+    def get_hosts_snapshot(self):
+        """
+        Retourne (version, hôtes) : liste complète enrichie, reconstruite seulement
+        quand la version du HostManager ou des débits SNMP change. La liste est partagée : ne pas la modifier.
+        """
+        version = self.hosts_version()
+        if version is None:
+            return None, self._get_hosts_data(apply_filter=False)
+        with self._hosts_cache_lock:
+            if self._hosts_cache[0] != version:
+                self._hosts_cache = (version, self._get_hosts_data(apply_filter=False))
+            return self._hosts_cache
+    
+    def _get_room_hosts(self, room, hosts=None):
+        """Hôtes d'une room (liste complète non filtrée par site_filter, puis filtre de la room)"""
+        if hosts is None:
+            hosts = self.get_hosts_snapshot()[1]
+        return self.host_rooms.filter_hosts(room, hosts)
+    
+    def _room_state(self, room):
+        """
+        Liste complète d'une room (encodée) et numéro de séquence de son flux.
+        Même liste que celle dont _flush_broadcast calcule les deltas : un client
+        (re)synchronisé peut appliquer les deltas suivants.
+        """
+        return (encode_hosts(self._get_room_hosts(room), self.host_rooms.encoding(room)),
+                self.host_rooms.feed(room).seq)
+    
     def _get_cached_bandwidth(self, ip):
         """
-        Récupère le débit depuis le cache (non bloquant).
-        Les débits sont calculés par le PingManager pendant le monitoring.
+        Débit formaté d'un hôte ({'in', 'out'}, '-' si inconnu).
+        Les débits sont calculés une fois par cycle par le worker SNMP (bandwidth_store).
         """
-        try:
-            # Vérifier si le PingManager existe et a un cache
-            if hasattr(self.main_window, 'main_controller') and \
-               self.main_window.main_controller and \
-               hasattr(self.main_window.main_controller, 'ping_manager') and \
-               self.main_window.main_controller.ping_manager:
-                
-                ping_manager = self.main_window.main_controller.ping_manager
-                
-                # Récupérer le cache de trafic du PingManager (persiste entre les cycles)
-                if hasattr(ping_manager, 'traffic_cache'):
-                    traffic_cache = ping_manager.traffic_cache
-                    
-                    # Vérifier si on a des données pour cette IP
-                    if ip in traffic_cache:
-                        # Calculer le débit depuis le cache
-                        current_data = traffic_cache.get(ip)
-                        previous_data = self.traffic_cache.get(ip)
-                        
-                        if current_data and previous_data and SNMP_AVAILABLE:
-                            bandwidth = snmp_helper.calculate_bandwidth_sync(current_data, previous_data)
-                            if bandwidth:
-                                # Sauvegarder dans notre cache avec formatage automatique des unités
-                                self.traffic_cache[ip] = current_data
-                                self._bandwidth_cache[ip] = {
-                                    'in': format_bandwidth(bandwidth['in_mbps']),
-                                    'out': format_bandwidth(bandwidth['out_mbps'])
-                                }
-                                return self._bandwidth_cache[ip]
-                        
-                        # Sauvegarder les données actuelles pour le prochain calcul
-                        if current_data:
-                            self.traffic_cache[ip] = current_data
-            
-            # Retourner le dernier débit connu ou '-'
-            if ip in self._bandwidth_cache:
-                return self._bandwidth_cache[ip]
-            
-            return {'in': '-', 'out': '-'}
-            
-        except Exception as e:
-            logger.debug(f"Erreur récupération débit depuis cache pour {ip}: {e}")
-            return {'in': '-', 'out': '-'}
+        return bandwidth_store.get(ip)
     
     def _get_bandwidth_for_host(self, ip):
         """
@@ -390,86 +448,6 @@ class WebServer(QObject):
         except Exception as e:
             logger.error(f"Erreur nettoyage listes alertes: {e}", exc_info=True)
     
-    def _get_row_status(self, model, row):
-        """Détermine le statut (online/offline) selon la colonne Latence"""
-        try:
-            # Colonne 5 = "Latence" qui contient "HS" pour les hôtes hors service
-            latence_item = model.item(row, 5)
-            if latence_item:
-                latence_text = latence_item.text().strip().upper()
-                # Si la colonne contient "HS", l'hôte est hors ligne
-                if latence_text == "HS":
-                    return 'offline'
-                else:
-                    return 'online'
-        except:
-            pass
-        # Par défaut, considérer comme en ligne
-        return 'online'
-    
-    def _get_realtime_host_status(self, ip, model, row):
-        """
-        Détermine le statut en temps réel d'un hôte.
-        Vérifie d'abord le ping manager pour l'état actuel,
-        puis se rabat sur la colonne latence du modèle.
-        """
-        try:
-            # Vérifier si le monitoring est actif et récupérer l'état réel
-            if hasattr(self.main_window, 'main_controller') and \
-               self.main_window.main_controller and \
-               hasattr(self.main_window.main_controller, 'ping_manager') and \
-               self.main_window.main_controller.ping_manager:
-                
-                ping_manager = self.main_window.main_controller.ping_manager
-                
-                # Vérifier si l'IP est dans les hôtes suivis
-                if hasattr(ping_manager, 'host_states') and ip in ping_manager.host_states:
-                    # Récupérer l'état réel depuis le ping manager
-                    host_state = ping_manager.host_states[ip]
-                    # Si le dernier ping a réussi, l'hôte est online
-                    if host_state.get('is_alive', False):
-                        return 'online'
-                    else:
-                        return 'offline'
-        except Exception as e:
-            logger.debug(f"Erreur récupération statut temps réel pour {ip}: {e}")
-        
-        # Fallback: utiliser la méthode existante basée sur la colonne latence
-        return self._get_row_status(model, row)
-    
-    def _get_latency_color(self, latence_text):
-        """
-        Retourne la couleur correspondant à la latence.
-        
-        Règles:
-        - < 100ms : vert clair (#baf595)
-        - 100ms à 200ms : jaune clair (#fffd6a)
-        - > 200ms (mais < 500ms / HS) : orange clair (#ffb845)
-        - HS (offline) : rouge (#f97e7e)
-        """
-        try:
-            if not latence_text or latence_text.strip().upper() == 'HS' or latence_text == 'N/A':
-                return '#f97e7e'  # Rouge - HS
-            
-            # Extraire la valeur numérique de la latence (ex: "45.2 ms" -> 45.2)
-            import re
-            match = re.search(r'([\d.]+)', latence_text)
-            if match:
-                latency_ms = float(match.group(1))
-                
-                if latency_ms >= 500:
-                    return '#f97e7e'  # Rouge - HS
-                elif latency_ms > 200:
-                    return '#ffb845'  # Orange clair - latence élevée
-                elif latency_ms >= 100:
-                    return '#fffd6a'  # Jaune clair - latence moyenne
-                else:
-                    return '#baf595'  # Vert clair - bonne latence
-            
-            return '#baf595'  # Par défaut vert
-        except Exception:
-            return '#baf595'  # Par défaut vert en cas d'erreur
-    
     def _get_hosts_count(self):
         """Compte le nombre d'hôtes"""
         try:
@@ -678,6 +656,8 @@ class WebServer(QObject):
         
         try:
             self.running = False
+            self.broadcast_scheduler.stop()
+            self.log_stream.stop()
             logger.info("Arrêt du serveur web demandé")
             if hasattr(self, 'socketio') and self.socketio:
                 # Tentative d'arrêt propre du serveur SocketIO
@@ -706,22 +686,54 @@ class WebServer(QObject):
             logger.error(f"Erreur arrêt serveur web: {e}", exc_info=True)
     
     def broadcast_update(self):
-        """Diffuse une mise à jour à tous les clients connectés"""
+        """
+        Demande la diffusion d'une mise à jour à tous les clients connectés.
+        Les demandes sont regroupées par fenêtre (var.web_broadcast_window_ms).
+        """
+        if self.socketio and self.running:
+            self.broadcast_scheduler.request(('/', None))
+    
+    def _broadcast_window(self):
+        """Fenêtre de regroupement des diffusions en secondes"""
+        from src import var
+        return getattr(var, 'web_broadcast_window_ms', 250) / 1000.0
+    
+    def _flush_broadcast(self, target):
+        """Diffusion effective, appelée par l'ordonnanceur au plus une fois par fenêtre"""
         if self.socketio and self.running:
             try:
-                # Pour le broadcast temps réel, on envoie tous les hôtes
-                # Le filtrage est géré côté client (index.html)
-                hosts = self._get_hosts_data(apply_filter=False)
-                self.socketio.emit('hosts_update', hosts, namespace='/')
+                # Pour le broadcast temps réel, la liste est calculée une fois puis filtrée par room :
+                # chaque room ne reçoit que ses hôtes, et seulement les champs modifiés depuis
+                # sa dernière diffusion (liste complète si sa structure a changé).
+                all_hosts = self.get_hosts_snapshot()[1]
+                for room in self.host_rooms.active_rooms():
+                    message = self.host_rooms.feed(room).publish(self._get_room_hosts(room, all_hosts))
+                    if message is None:
+                        continue
+                    event, payload = message
+                    if event == 'hosts_update':
+                        hosts = encode_hosts(payload['hosts'], self.host_rooms.encoding(room))
+                        self.socketio.emit('hosts_update', hosts, payload['seq'], namespace='/', to=room)
+                    else:
+                        self.socketio.emit('hosts_delta', payload, namespace='/', to=room)
                 
                 # Envoyer aussi le statut du scan
                 monitoring_running = False
+                probe_stats = {}
                 if hasattr(self.main_window, 'main_controller'):
-                    monitoring_running = self.main_window.main_controller.ping_manager is not None
-                self.socketio.emit('monitoring_status', {'running': monitoring_running}, namespace='/')
+                    ping_manager = self.main_window.main_controller.ping_manager
+                    monitoring_running = ping_manager is not None
+                    if ping_manager is not None:
+                        probe_stats = ping_manager.get_probe_stats()
+                self.socketio.emit('monitoring_status', {'running': monitoring_running, 'probe': probe_stats}, namespace='/')
             except Exception as e:
                 logger.error(f"Erreur diffusion mise à jour: {e}", exc_info=True)
     
+    def _emit_log_lines(self, sid, lines):
+        """Envoi des nouvelles lignes de log à un client abonné (thread de suivi)"""
+        if self.socketio and self.running:
+            self.socketio.emit('log_lines', {'success': True, 'lines': lines}, namespace='/', to=sid)
+    
     def emit_scan_complete(self, hosts_count):
         """Émet un événement quand le scan est terminé"""
         if not self.running:
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Script de test pour la construction des ressources statiques de l'interface web.
+Vérifie les noms fingerprintés, les versions précompressées et la résolution des URL.
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.assets import AssetManifest, build_assets, precompressed_variant
+
+
+def _static_dir(tmp):
+    os.makedirs(os.path.join(tmp, 'js'))
+    with open(os.path.join(tmp, 'js', 'admin.js'), 'w', encoding='utf-8') as f:
+        f.write("console.log('admin');\n" * 200)
+    return tmp
+
+
+def test_construction_et_resolution():
+    """Le manifeste pointe vers un fichier fingerprinté et sa version gzip."""
+    with tempfile.TemporaryDirectory() as tmp:
+        static = _static_dir(tmp)
+        manifest = build_assets(static)
+        built = manifest['js/admin.js']
+        assert built.startswith('js/admin.') and built.endswith('.js') and built != 'js/admin.js'
+        path = os.path.join(static, 'dist', *built.split('/'))
+        with open(path + '.gz', 'rb') as f, open(os.path.join(static, 'js', 'admin.js'), 'rb') as source:
+            assert gzip.decompress(f.read()) == source.read()
+
+        assert AssetManifest(static).resolve('js/admin.js') == ('assets', {'filename': built})
+        assert precompressed_variant(path, 'gzip, deflate') == (path + '.gz', 'gzip')
+        assert precompressed_variant(path, 'identity') is None
+
+
+def test_fichier_modifie_apres_construction():
+    """Un fichier modifié depuis la construction est servi depuis la source, avec ?v=empreinte."""
+    with tempfile.TemporaryDirectory() as tmp:
+        static = _static_dir(tmp)
+        build_assets(static)
+        with open(os.path.join(static, 'js', 'admin.js'), 'a', encoding='utf-8') as f:
+            f.write("// modifié\n")
+        endpoint, params = AssetManifest(static).resolve('js/admin.js')
+        assert endpoint == 'static' and params['filename'] == 'js/admin.js' and len(params['v']) == 12
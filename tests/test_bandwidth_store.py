@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le calcul et le stockage des débits SNMP.
+Vérifie le débordement des compteurs et la publication des débits formatés.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.bandwidth_store import BandwidthStore, compute_rates, counter_delta
+
+
+def test_debordement_compteur_32_bits():
+    """Un compteur 32 bits qui repasse par zéro donne le delta modulo 2^32."""
+    assert counter_delta(2 ** 32 - 1000, 500, bits=32) == 1500
+    # Chute trop importante : remise à zéro de l'équipement, pas un débordement
+    assert counter_delta(1_000_000_000, 10, bits=32) is None
+    # Un compteur 64 bits qui décroît a été remis à zéro
+    assert counter_delta(5_000_000, 10, bits=64) is None
+    assert counter_delta(100, 400) == 300
+
+
+def test_calcul_debits():
+    """Débits en Mbps entre deux mesures ; None sans référence exploitable."""
+    previous = {'in': 2 ** 32 - 1_250_000, 'out': 0, 'timestamp': 100.0, 'bits': 32}
+    current = {'in': 1_250_000, 'out': 625_000, 'timestamp': 105.0, 'bits': 32}
+    assert compute_rates(previous, current) == (4.0, 1.0)
+    assert compute_rates(None, current) is None
+    assert compute_rates(current, dict(current)) is None
+
+
+def test_publication_debits_formates():
+    """Le store renvoie les libellés formatés et incrémente sa version s'ils changent."""
+    store = BandwidthStore()
+    assert store.get('10.0.0.1') == {'in': '-', 'out': '-'}
+    store.publish('10.0.0.1', 50.0, 1500.0)
+    assert store.get('10.0.0.1') == {'in': '50.00 Mbps', 'out': '1.50 Gbps'}
+    assert store.get_rate('10.0.0.1')['out_mbps'] == 1500.0
+    assert store.version == 1
+    # Même libellé affiché : la liste des hôtes n'a pas à être reconstruite
+    store.publish('10.0.0.1', 50.001, 1500.0)
+    assert store.version == 1
+    assert store.get_rate('10.0.0.1')['in_mbps'] == 50.001
+    store.publish('10.0.0.1', 60.0, 1500.0)
+    assert store.version == 2
+    store.remove('10.0.0.1')
+    assert store.get('10.0.0.1') == {'in': '-', 'out': '-'}
+
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Script de test pour l'ordonnanceur de diffusions web.
+Vérifie le regroupement des demandes par fenêtre et par cible.
+"""
+
+import sys
+import os
+import time
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.broadcast_scheduler import BroadcastScheduler
+
+
+def test_regroupement_par_fenetre():
+    """Les demandes d'une même fenêtre donnent une seule diffusion par cible."""
+    diffusions = []
+    scheduler = BroadcastScheduler(diffusions.append, window=lambda: 0.05)
+    for _ in range(100):
+        scheduler.request(('/', None))
+    scheduler.request(('/', 'site:A'))
+    time.sleep(0.2)
+    scheduler.stop()
+
+    assert sorted(diffusions, key=str) == [('/', 'site:A'), ('/', None)]
+    stats = scheduler.get_stats()
+    assert (stats['requests'], stats['emits'], stats['coalesced']) == (101, 2, 99)
+    assert stats['coalescing_ratio'] == 50.5
+
+
+def test_fenetre_nulle_immediate():
+    """Fenêtre nulle : diffusion immédiate dans le thread appelant."""
+    diffusions = []
+    scheduler = BroadcastScheduler(diffusions.append, window=lambda: 0)
+    scheduler.request()
+    scheduler.request()
+    assert len(diffusions) == 2
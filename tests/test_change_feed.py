@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le flux de changements des hôtes (hosts_delta).
+Vérifie les deltas par IP, les resynchronisations et le rattrapage d'un client.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.change_feed import HostChangeFeed
+
+
+def hotes(*latences):
+    return [{'ip': f'10.0.0.{i}', 'latence': lat} for i, lat in enumerate(latences, 1)]
+
+
+def test_delta_champs_modifies():
+    """Seuls les champs modifiés des hôtes modifiés sont émis."""
+    feed = HostChangeFeed()
+    event, payload = feed.publish(hotes('1 ms', '2 ms'))
+    assert event == 'hosts_update' and payload['seq'] == 1
+
+    event, payload = feed.publish(hotes('1 ms', 'HS'))
+    assert event == 'hosts_delta'
+    assert (payload['base'], payload['seq']) == (1, 2)
+    assert payload['changes'] == {'10.0.0.2': {'latence': 'HS'}}
+
+    assert feed.publish(hotes('1 ms', 'HS')) is None
+
+
+def test_resync_si_structure_change():
+    """Ajout d'hôte : liste complète et historique vidé."""
+    feed = HostChangeFeed()
+    feed.publish(hotes('1 ms'))
+    event, payload = feed.publish(hotes('1 ms', '2 ms'))
+    assert event == 'hosts_update'
+    assert feed.since(1) is None
+
+
+def test_rattrapage_client_en_retard():
+    """Un client en retard reçoit les deltas cumulés manqués."""
+    feed = HostChangeFeed()
+    feed.publish(hotes('1 ms', '2 ms'))
+    feed.publish(hotes('3 ms', '2 ms'))
+    feed.publish(hotes('4 ms', 'HS'))
+    delta = feed.since(1)
+    assert (delta['base'], delta['seq']) == (1, 3)
+    assert delta['changes'] == {'10.0.0.1': {'latence': '4 ms'}, '10.0.0.2': {'latence': 'HS'}}
+    assert feed.since(3)['changes'] == {}
+    assert feed.since(0) is None
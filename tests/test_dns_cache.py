@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module dns_cache.
+Vérifie le cache positif/négatif et le rafraîchissement anticipé.
+"""
+
+import sys
+import os
+import asyncio
+import socket
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.dns_cache import DNSCache
+
+
+class CompteurDNS(DNSCache):
+    """Cache dont le backend est remplacé par une table fixe."""
+
+    def __init__(self, table, **kwargs):
+        super().__init__(**kwargs)
+        self.table = table
+        self.requetes = 0
+
+    async def _query(self, name):
+        self.requetes += 1
+        if name not in self.table:
+            raise socket.gaierror(socket.EAI_NONAME, "inconnu")
+        return self.table[name], 60
+
+
+def test_adresse_ip_non_resolue():
+    """Une adresse IP est retournée telle quelle, sans requête."""
+    cache = CompteurDNS({})
+    assert asyncio.run(cache.resolve("192.168.1.1")) == "192.168.1.1"
+    assert cache.requetes == 0
+
+
+def test_cache_positif_et_mutualisation():
+    """Les résolutions simultanées et suivantes réutilisent la même requête."""
+    cache = CompteurDNS({"nas": ["10.0.0.5"]})
+
+    async def scenario():
+        resultats = await asyncio.gather(*[cache.resolve("NAS") for _ in range(5)])
+        resultats.append(await cache.resolve("nas"))
+        return resultats
+
+    assert asyncio.run(scenario()) == ["10.0.0.5"] * 6
+    assert cache.requetes == 1
+
+
+def test_cache_negatif():
+    """Un échec est mémorisé pendant negative_ttl."""
+    cache = CompteurDNS({}, negative_ttl=30)
+
+    async def scenario():
+        for _ in range(3):
+            try:
+                await cache.resolve("absent")
+            except socket.gaierror:
+                pass
+
+    asyncio.run(scenario())
+    assert cache.requetes == 1
+    assert cache.stats['negative_hits'] == 2
+
+
+def test_rafraichissement_anticipe():
+    """Passé refresh_ratio du TTL, l'entrée est servie puis rafraîchie en arrière-plan."""
+    cache = CompteurDNS({"srv": ["10.0.0.1"]}, min_ttl=0, refresh_ratio=0)
+
+    async def scenario():
+        await cache.resolve("srv")
+        cache.table["srv"] = ["10.0.0.2"]
+        ancienne = await cache.resolve("srv")
+        await asyncio.sleep(0.01)
+        return ancienne, await cache.resolve("srv")
+
+    assert asyncio.run(scenario()) == ("10.0.0.1", "10.0.0.2")
+
+
+def test_resolveurs_des_boucles_fermees_oublies():
+    """Une boucle temporaire par vérification (check_website_sync) ne laisse pas de résolveur derrière elle."""
+    import src.utils.dns_cache as module
+
+    class Reponse:
+        host = '10.0.0.9'
+        ttl = 60
+
+    class FauxResolveur:
+        def __init__(self, loop=None):
+            self.loop = loop
+
+        async def query(self, name, qtype):
+            return [Reponse()]
+
+        def cancel(self):
+            pass
+
+    class FauxAiodns:
+        DNSResolver = FauxResolveur
+
+    ancien = (module.aiodns, module.AIODNS_AVAILABLE)
+    module.aiodns, module.AIODNS_AVAILABLE = FauxAiodns, True
+    try:
+        cache = DNSCache()
+        for i in range(5):
+            loop = asyncio.new_event_loop()
+            assert loop.run_until_complete(cache.resolve(f'hote{i}.local')) == '10.0.0.9'
+            loop.close()
+        assert len(cache._resolvers) == 1
+    finally:
+        module.aiodns, module.AIODNS_AVAILABLE = ancien
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Script de test pour la réduction des séries des graphiques (LTTB).
+Vérifie le nombre de points retenus et la conservation des pics.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.downsample import downsample_indices, lttb_indices
+
+
+def test_lttb_conserve_les_pics():
+    """17 280 mesures (24 h à 5 s) réduites à 300 points, pic et creux conservés."""
+    xs = list(range(0, 86400, 5))
+    ys = [20.0 + (i % 50) / 100 for i in range(len(xs))]
+    ys[5000] = 95.0
+    ys[12000] = -5.0
+    indices = lttb_indices(xs, ys, 300)
+    assert len(indices) == 300
+    assert indices[0] == 0 and indices[-1] == len(xs) - 1
+    assert indices == sorted(set(indices))
+    assert 5000 in indices and 12000 in indices
+    # Série déjà assez courte : inchangée
+    assert lttb_indices(xs[:10], ys[:10], 300) == list(range(10))
+
+
+def test_plusieurs_series():
+    """Chaque série garde ses extrêmes ; points absent : aucune réduction."""
+    xs = list(range(1000))
+    flat = [1.0] * 1000
+    spikes_in, spikes_out = list(flat), list(flat)
+    spikes_in[100] = 50.0
+    spikes_out[900] = 80.0
+    indices = downsample_indices(xs, [spikes_in, spikes_out], 100)
+    assert 100 in indices and 900 in indices
+    assert len(indices) <= 100
+    assert downsample_indices(xs, [flat], None) == xs
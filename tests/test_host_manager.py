@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le HostManager.
+Vérifie l'index par IP (doublons compris) et les instantanés copie-sur-écriture.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.host_manager import HostManager, HostState
+from src.utils.colors import AppColors
+
+
+def test_mise_a_jour_doublons():
+    """Toutes les lignes d'une même IP sont mises à jour."""
+    manager = HostManager()
+    manager.set_hosts([
+        {'ip': '10.0.0.1', 'nom': 'a'},
+        {'ip': '10.0.0.2', 'nom': 'b'},
+        {'ip': '10.0.0.1', 'nom': 'a-bis'},
+    ])
+    manager.update_host_status('10.0.0.1', '3.0 ms', 'online')
+    assert [h['status'] for h in manager.get_hosts_by_ip('10.0.0.1')] == ['online', 'online']
+    assert manager.get_host_by_ip('10.0.0.2')['status'] == HostState.UNKNOWN
+    assert manager.get_host_by_ip('10.9.9.9') is None
+    # Resynchronisation : les IP retirées sont renvoyées
+    assert manager.set_hosts([{'ip': '10.0.0.2', 'nom': 'b'}]) == {'10.0.0.1'}
+
+
+def test_instantane_partage_et_immuable():
+    """Les lecteurs partagent l'instantané ; une écriture publie une nouvelle version."""
+    manager = HostManager()
+    manager.set_hosts([{'ip': '10.0.0.1', 'latence': 'HS'}])
+    version, hosts = manager.get_snapshot()
+    assert manager.get_all_hosts() is hosts
+
+    manager.update_host_status('10.0.0.1', '1.0 ms', 'online')
+    new_version, new_hosts = manager.get_snapshot()
+    assert new_version > version
+    assert hosts[0]['latence'] == 'HS'
+    assert new_hosts[0]['latence'] == '1.0 ms'
+
+
+def test_champs_types_et_derives():
+    """Latence, état et température typés ; libellé et couleur dérivés à l'écriture."""
+    manager = HostManager()
+    manager.set_hosts([{'ip': '10.0.0.1', 'latence': '45.2 ms', 'status': 'online', 'temp': '38,5'}])
+    host = manager.get_host_by_ip('10.0.0.1')
+    assert (host['latency_ms'], host['status'], host['temp_c']) == (45.2, HostState.ONLINE, 38.5)
+    assert host['latency_color'] == AppColors.VERT_PALE
+    depuis = host['changed_at']
+
+    manager.update_host_status('10.0.0.1', 250.0, HostState.ONLINE)
+    host = manager.get_host_by_ip('10.0.0.1')
+    assert (host['latence'], host['latency_color']) == ('250.0 ms', AppColors.ORANGE_PALE)
+    assert host['changed_at'] == depuis
+
+    manager.update_host_status('10.0.0.1', 120.0, HostState.OFFLINE)
+    manager.update_host_status('10.0.0.1', temp=41.0)
+    host = manager.get_host_by_ip('10.0.0.1')
+    assert (host['latency_ms'], host['latence'], host['status'], host['temp_c']) == (None, 'HS', 'offline', 41.0)
+    assert host['changed_at'] >= depuis
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Script de test pour les requêtes de l'API /api/hosts.
+Vérifie filtres, tri, pagination et projection.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.host_query import query_hosts
+
+HOTES = [
+    {'ip': '10.0.0.10', 'nom': 'routeur', 'site': 'A', 'status': 'online', 'latence': '12.0 ms', 'latency_ms': 12.0},
+    {'ip': '10.0.0.9', 'nom': 'switch', 'site': 'B', 'status': 'offline', 'latence': 'HS', 'latency_ms': None},
+    {'ip': '10.0.0.2', 'nom': 'serveur', 'site': 'A', 'status': 'online', 'latence': '3.5 ms', 'latency_ms': 3.5},
+]
+
+
+def test_filtres_et_projection():
+    """Filtre par site et statut, projection des champs demandés."""
+    total, page = query_hosts(HOTES, sites=['A,B'], status='online', fields=['ip,nom'])
+    assert total == 2
+    assert page == [{'ip': '10.0.0.10', 'nom': 'routeur'}, {'ip': '10.0.0.2', 'nom': 'serveur'}]
+
+    total, page = query_hosts(HOTES, text='SWI')
+    assert total == 1 and page[0]['ip'] == '10.0.0.9'
+
+
+def test_tri_et_pagination():
+    """Tri numérique des IP et des latences, pagination après tri."""
+    _, page = query_hosts(HOTES, sort='ip')
+    assert [h['ip'] for h in page] == ['10.0.0.2', '10.0.0.9', '10.0.0.10']
+
+    total, page = query_hosts(HOTES, sort='-latence', offset=1, limit=1)
+    assert total == 3
+    assert page[0]['ip'] == '10.0.0.10'
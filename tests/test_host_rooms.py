@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Script de test pour les rooms Socket.IO des hôtes.
+Vérifie les noms de room normalisés, le filtrage par site et les abonnements.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.host_rooms import HostRooms, room_for, ALL_HOSTS_ROOM
+
+
+def test_nom_de_room_normalise():
+    """Même ensemble de sites = même room, quel que soit l'ordre."""
+    assert room_for(None) == room_for({'sites': []}) == ALL_HOSTS_ROOM
+    assert room_for({'sites': ['B', 'A', 'A']}) == room_for({'sites': ['A', 'B']})
+    assert room_for({'dashboard': '3'}) == 'hosts:dashboard:3'
+
+
+def test_filtrage_et_abonnements():
+    """Une room de sites ne contient que ses hôtes et disparaît sans membre."""
+    rooms = HostRooms()
+    hosts = [{'ip': '10.0.0.1', 'site': 'A'}, {'ip': '10.0.0.2', 'site': 'B'}]
+
+    previous, room = rooms.subscribe('sid1', {'sites': ['A']})
+    assert previous is None
+    assert rooms.filter_hosts(room, hosts) == [hosts[0]]
+    assert rooms.filter_hosts(ALL_HOSTS_ROOM, hosts) == hosts
+    assert set(rooms.active_rooms()) == {ALL_HOSTS_ROOM, room}
+
+    assert rooms.subscribe('sid1', {}) == (room, ALL_HOSTS_ROOM)
+    assert rooms.active_rooms() == [ALL_HOSTS_ROOM]
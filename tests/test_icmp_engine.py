@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module icmp_engine.
+Vérifie la construction et l'analyse des paquets ICMP echo.
+"""
+
+import sys
+import os
+import struct
+import asyncio
+import time
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.icmp_engine import (
+    ICMPEngine, icmp_checksum, build_echo_request, parse_echo_reply, ICMP_ECHO_REPLY
+)
+
+
+def test_checksum_valide():
+    """Un paquet construit doit avoir une somme de contrôle nulle une fois vérifiée."""
+    packet = build_echo_request(0x1234, 42)
+    assert icmp_checksum(packet) == 0
+
+
+def test_parse_reply_sans_entete_ip():
+    """Réponse d'un socket DGRAM Linux (pas d'en-tête IP)."""
+    reply = struct.pack("!BBHHH", ICMP_ECHO_REPLY, 0, 0, 0x1234, 42) + b"data"
+    assert parse_echo_reply(reply) == (0x1234, 42)
+
+
+def test_parse_reply_avec_entete_ip():
+    """Réponse d'un socket RAW (en-tête IPv4 de 20 octets)."""
+    ip_header = bytes([0x45]) + bytes(19)
+    reply = ip_header + struct.pack("!BBHHH", ICMP_ECHO_REPLY, 0, 0, 7, 9)
+    assert parse_echo_reply(reply) == (7, 9)
+
+
+def test_parse_ignore_echo_request():
+    """Les paquets qui ne sont pas des echo reply sont ignorés."""
+    assert parse_echo_reply(build_echo_request(1, 1)) is None
+    assert parse_echo_reply(b"") is None
+    assert parse_echo_reply(b"\x00\x00") is None
+
+
+def ping_parallele(comportements):
+    """
+    Ping avec paquets redondants sur un echo simulé : pour chaque paquet,
+    (délai, RTT) ou None pour un paquet sans réponse ni délai d'attente écoulé.
+    Retourne (RTT, annulations, durée).
+    """
+    engine = ICMPEngine()
+    annules = []
+    envois = []
+
+    async def fake_echo(ip, timeout=2.0):
+        comportement = comportements[len(envois)]
+        envois.append(ip)
+        try:
+            if comportement is None:
+                await asyncio.sleep(timeout)
+                return None
+            delai, rtt = comportement
+            await asyncio.sleep(delai)
+            return rtt
+        except asyncio.CancelledError:
+            annules.append(ip)
+            raise
+
+    engine.echo = fake_echo
+    debut = time.perf_counter()
+    rtts = asyncio.run(engine.ping("10.0.0.1", count=len(comportements), timeout=5.0, interval=0))
+    return rtts, annules, time.perf_counter() - debut
+
+
+def test_paquets_paralleles_premiere_reponse():
+    """Paquets redondants : retour dès la première réponse, les autres sont annulés."""
+    rtts, annules, duree = ping_parallele([(0.01, 3.5), None])
+    assert duree < 1.0
+    assert rtts == [3.5, None]
+    assert annules == ["10.0.0.1"]
+
+
+def test_paquets_paralleles_premier_perdu():
+    """Un paquet perdu avant la réponse d'un autre n'interrompt pas l'attente."""
+    rtts, annules, duree = ping_parallele([(0.01, None), (0.02, 4.0), None])
+    assert duree < 1.0
+    assert rtts == [None, 4.0, None]
+    assert annules == ["10.0.0.1"]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Script de test pour l'historique compact de latence/pertes.
+Vérifie l'encodage des blocs et la lecture d'une période sur disque et en mémoire.
+"""
+
+import sys
+import os
+import random
+import sqlite3
+import tempfile
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.latency_history import LatencyHistoryStore, decode_block, encode_block
+
+
+def test_encodage_bloc_aller_retour():
+    """Horodatages exacts, latence au dixième de ms, mesures sans réponse conservées."""
+    samples = [(1_700_000_000 + 5 * i, round(1.2 + (i % 7) * 0.3, 1), 0.0) for i in range(720)]
+    samples[100] = (samples[100][0], None, 1.0)
+    samples[200] = (samples[200][0] + 2, 12.3, 0.25)
+    blob = encode_block(samples)
+    assert decode_block(blob) == samples
+    # Environ un octet par mesure pour un hôte régulier
+    assert len(blob) < 2 * len(samples)
+
+
+def test_lecture_periode_disque_et_memoire():
+    """Blocs terminés écrits, bloc en cours en mémoire : une seule lecture chronologique."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LatencyHistoryStore(os.path.join(tmp, 'latency.db'))
+        store.BLOCK_SAMPLES = 10
+        for i in range(25):
+            store.record('10.0.0.1', 2.0 + i / 10, ts=1000 + i)
+        store.record('10.0.0.1', 900.0, ts=1025)
+        store.flush(include_open=False)
+        assert store.stats['blocks_written'] == 2
+
+        samples = store.get_range('10.0.0.1', 1005, 1030)
+        assert [s[0] for s in samples] == list(range(1005, 1026))
+        assert samples[-1] == (1025, None, 1.0)
+        assert store.get_hosts() == {'10.0.0.1': (1000, 1025)}
+        store.close()
+
+        # Bloc en cours écrit à la fermeture
+        reopened = LatencyHistoryStore(os.path.join(tmp, 'latency.db'))
+        assert len(reopened.get_range('10.0.0.1', 0, 2000)) == 26
+        assert reopened.get_hosts() == {'10.0.0.1': (1000, 1025)}
+
+
+def test_bloc_termine_visible_jusqu_a_l_ecriture():
+    """Un bloc terminé reste lisible en mémoire tant que son écriture n'a pas abouti."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LatencyHistoryStore(os.path.join(tmp, 'latency.db'))
+        store.BLOCK_SAMPLES = 10
+        for i in range(15):
+            store.record('10.0.0.1', 1.0, ts=1000 + i)
+
+        def base_verrouillee():
+            raise sqlite3.OperationalError('database is locked')
+
+        store._get_write_connection = base_verrouillee
+        store.flush()
+        assert len(store.get_range('10.0.0.1', 0, 2000)) == 15
+        assert store.stats['blocks_written'] == 0
+
+        del store._get_write_connection
+        store.flush()
+        # Bloc terminé écrit, bloc en cours ajouté en fragment
+        assert store.stats['blocks_written'] == 1
+        assert store._sealed == []
+        assert len(store.get_range('10.0.0.1', 0, 2000)) == 15
+        store.close()
+
+
+def test_volume_ecrit_proportionnel_aux_mesures():
+    """Bloc en cours écrit par fragments : chaque mesure n'est écrite qu'une fois."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LatencyHistoryStore(os.path.join(tmp, 'latency.db'))
+        samples = store.BLOCK_SAMPLES
+        rng = random.Random(1)
+        for i in range(samples + 1):
+            store.record('10.0.0.1', round(rng.uniform(1, 30), 1), ts=1000 + 5 * i)
+            # Deux mesures par cycle d'écriture (sonde toutes les 5 s, écriture toutes les 10 s)
+            if i % 2:
+                store.flush()
+        store.flush()
+        assert store.stats['blocks_written'] == 1
+        # Réécrire le bloc en cours à chaque cycle représenterait environ 200 ko
+        assert store.stats['bytes_written'] < 15 * samples
+        store.close()
+
+
+def test_recuperation_apres_arret_brutal():
+    """Les fragments d'un bloc en cours sont relus au démarrage suivant."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'latency.db')
+        store = LatencyHistoryStore(path)
+        for i in range(6):
+            store.record('10.0.0.1', 1.5, ts=1000 + i)
+            if i % 2:
+                store.flush()
+        # Pas de close() : arrêt brutal, le bloc en cours n'existe que par fragments
+        reopened = LatencyHistoryStore(path)
+        assert [s[0] for s in reopened.get_range('10.0.0.1', 0, 2000)] == list(range(1000, 1006))
+        assert reopened.get_hosts() == {'10.0.0.1': (1000, 1005)}
+        reopened.close()
+        store.close()
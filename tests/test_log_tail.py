@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Script de test pour la lecture du fichier de logs (page Logs).
+Vérifie la lecture des dernières lignes, les filtres et le suivi avec rotation.
+"""
+
+import sys
+import os
+import tempfile
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.log_tail import LogFilter, LogFollower, tail_lines
+
+
+def _line(i, level='INFO', module='src.fcy_ping'):
+    return f"2025-01-01 12:00:00 - {module} - {level} - message {i}\n"
+
+
+def test_dernieres_lignes_par_blocs():
+    """Les N dernières lignes d'un fichier de plusieurs blocs, et d'un fichier court."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.log')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(_line(i) for i in range(20000))
+        lines = tail_lines(path, 3)
+        assert lines == [_line(i).rstrip('\n') for i in (19997, 19998, 19999)]
+        assert len(tail_lines(path, 5000)) == 5000
+        assert tail_lines(path, 0) == []
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_line(1) + _line(2))
+        assert len(tail_lines(path, 200)) == 2
+
+
+def test_filtre_niveau_module_texte():
+    """Les lignes de suite (trace) suivent la décision de leur enregistrement."""
+    lines = [_line(1).strip(), _line(2, 'ERROR', 'src.web.routes.log_routes').strip(),
+             'Traceback (most recent call last):', _line(3, 'WARNING', 'src.web_server').strip()]
+    assert LogFilter(level='error').apply(lines) == lines[1:3]
+    assert LogFilter(module='src.web').apply(lines) == lines[1:3]
+    assert LogFilter(text='MESSAGE 3').apply(lines) == lines[3:]
+    assert LogFilter().apply(lines) == lines
+
+
+def test_suivi_avec_rotation():
+    """Lignes ajoutées, ligne partielle complétée plus tard, puis rotation du fichier."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'app.log')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_line(0))
+        follower = LogFollower(path)
+        assert follower.read_new() == []
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(_line(1) + 'début')
+        assert follower.read_new() == [_line(1).strip()]
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(' fin\n' + _line(2))
+        assert follower.read_new() == ['début fin', _line(2).strip()]
+
+        # Rotation (RotatingFileHandler) : dernières lignes de l'ancien fichier puis le nouveau
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(_line(3))
+        os.replace(path, path + '.1')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_line(4))
+        assert follower.read_new() == [_line(3).strip(), _line(4).strip()]
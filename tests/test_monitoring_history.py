@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Script de test pour l'historique de monitoring (température et débit).
+Vérifie l'écriture différée par lots et la vidange du tampon à la fermeture.
+"""
+
+import sys
+import os
+import tempfile
+import time
+import sqlite3
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.monitoring_history import MonitoringHistoryManager
+
+
+def test_ecriture_par_lots_et_fermeture():
+    """Les mesures sont écrites en un seul lot, au plus tard à la fermeture."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = MonitoringHistoryManager(os.path.join(tmp, 'monitoring.db'))
+        for i in range(50):
+            manager.record_temperature('10.0.0.1', 40 + i % 5)
+            manager.record_bandwidth('10.0.0.1', 1.5, 0.5)
+        # Rien n'est écrit avant l'échéance du lot
+        assert manager.get_temperature_history('10.0.0.1') == []
+
+        manager.close()
+        assert len(manager.get_temperature_history('10.0.0.1', resolution=0)) == 50
+        assert len(manager.get_bandwidth_history('10.0.0.1', resolution=0)) == 50
+        assert manager.stats['batches'] == 1 and manager.stats['rows_written'] == 100
+
+        with manager._get_connection() as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_ecriture_des_le_seuil_de_lignes():
+    """Le thread d'écriture n'attend pas l'échéance quand FLUSH_ROWS mesures sont en attente."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = MonitoringHistoryManager(os.path.join(tmp, 'monitoring.db'))
+        manager.FLUSH_ROWS = 10
+        for i in range(10):
+            manager.record_temperature(f'10.0.0.{i}', 35.0)
+        deadline = time.time() + 2
+        while manager.stats['rows_written'] < 10 and time.time() < deadline:
+            time.sleep(0.01)
+        assert manager.stats['rows_written'] == 10
+        manager.close()
+
+
+def test_agregats_et_choix_de_resolution():
+    """Agrégats min/moy/max par tranche, conservés après le nettoyage des mesures brutes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = MonitoringHistoryManager(os.path.join(tmp, 'monitoring.db'))
+        hour = int(time.time()) - 3 * 86400
+        hour -= hour % 3600
+        for minute, value in ((1, 40.0), (16, 50.0), (59, 60.0)):
+            manager._enqueue('temperature', ('10.0.0.1', hour + minute * 60, value))
+        manager.flush()
+
+        assert manager.pick_resolution(1) == 0
+        assert manager.pick_resolution(24) == 60
+        assert manager.pick_resolution(24 * 30) == 3600
+        assert len(manager.get_temperature_history('10.0.0.1', 24 * 7, resolution=900)) == 3
+        hourly = manager.get_temperature_history('10.0.0.1', 24 * 7)
+        assert hourly == [{'ts': hour, 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(hour)),
+                           'value': 50.0, 'min': 40.0, 'max': 60.0}]
+
+        # Mesures brutes conservées RAW_RETENTION_DAYS jours, puis seulement les agrégats
+        manager.cleanup_old_data()
+        assert len(manager.get_temperature_history('10.0.0.1', 24 * 7, resolution=0)) == 3
+        manager.cleanup_old_data(days=2)
+        assert manager.get_temperature_history('10.0.0.1', 24 * 7, resolution=0) == []
+        assert manager.get_temperature_history('10.0.0.1', 24 * 7) == hourly
+        assert manager.get_hosts_with_data()['10.0.0.1']['has_temperature']
+        manager.close()
+
+
+def test_migration_horodatages_texte():
+    """Une base à horodatages texte en heure locale est convertie en secondes UTC (user_version 1)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'monitoring.db')
+        ts = int(time.time()) - 600
+        local = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE temperature_history (id INTEGER PRIMARY KEY AUTOINCREMENT, ip TEXT NOT NULL, '
+                     'timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, value REAL NOT NULL)')
+        conn.execute('INSERT INTO temperature_history (ip, timestamp, value) VALUES (?, ?, ?)', ('10.0.0.1', local, 42.0))
+        conn.commit()
+        conn.close()
+
+        manager = MonitoringHistoryManager(path)
+        rows = manager.get_temperature_history('10.0.0.1', 1, resolution=0)
+        assert [(r['ts'], r['timestamp'], r['value']) for r in rows] == [(ts, local, 42.0)]
+        # Agrégats recalculés depuis les mesures migrées
+        assert manager.get_temperature_history('10.0.0.1', 24)[0]['ts'] == ts - ts % 60
+        with manager._get_connection() as conn:
+            assert conn.execute('PRAGMA user_version').fetchone()[0] == 1
+        manager.close()
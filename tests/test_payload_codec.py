@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script de test pour les encodages compacts des listes d'hôtes.
+Vérifie le format colonnes, la compression et la négociation gzip.
+"""
+
+import sys
+import os
+import gzip
+import json
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.payload_codec import to_columnar, from_columnar, encode_hosts, accepts_gzip
+
+
+def flotte(n):
+    return [{'ip': f'10.0.{i // 250}.{i % 250}', 'nom': f'hote-{i}', 'latence': f'{i % 90}.0 ms',
+             'latency_color': '#baf595', 'status': 'online', 'site': 'Siège', 'commentaire': '',
+             'mac': '', 'port': '', 'temp': '', 'suivi': '', 'excl': '',
+             'debit_in': '-', 'debit_out': '-'} for i in range(n)]
+
+
+def test_aller_retour_colonnes():
+    """Le format colonnes restitue exactement la liste d'origine."""
+    hosts = flotte(10) + [{'ip': '10.9.9.9', 'extra': 1}]
+    decoded = from_columnar(to_columnar(hosts))
+    assert decoded[0] == {**hosts[0], 'extra': None}
+    assert decoded[-1]['extra'] == 1 and decoded[-1]['nom'] is None
+
+
+def test_compression_ordre_de_grandeur():
+    """5000 hôtes : colonnes compressées au moins 10 fois plus petites que le JSON."""
+    hosts = flotte(5000)
+    brut = len(json.dumps(hosts).encode('utf-8'))
+    compact = encode_hosts(hosts, 'columnar-gzip')
+    assert len(compact) * 10 < brut
+    assert from_columnar(json.loads(gzip.decompress(compact))) == hosts
+
+
+def test_negociation_gzip():
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('br;q=1.0, gzip;q=0.8')
+    assert not accepts_gzip('gzip;q=0')
+    assert not accepts_gzip('identity')
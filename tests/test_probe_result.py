@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module probe_result.
+Vérifie les statistiques d'une rafale (pertes, RTT, gigue).
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.probe_result import ProbeResult
+
+
+def test_rafale_partielle():
+    """Pertes partielles et statistiques de RTT."""
+    result = ProbeResult.from_samples([10.0, None, 14.0, 12.0])
+    data = result.to_dict()
+    assert (data['sent'], data['received'], data['loss']) == (4, 3, 0.25)
+    assert (data['min'], data['avg'], data['max']) == (10.0, 12.0, 14.0)
+    assert data['jitter'] == 3.0  # |14-10| et |12-14|
+    assert result.latency == 12.0
+
+
+def test_aucune_reponse():
+    """Sans réponse : perte totale et latence conventionnelle 500."""
+    result = ProbeResult(3)
+    assert result.loss == 1.0
+    assert result.latency == 500.0
+    assert result.to_dict()['avg'] is None
+
+
+def test_cumul_des_tentatives():
+    """Les paquets d'une nouvelle tentative s'ajoutent à la rafale initiale."""
+    result = ProbeResult(2).merge(ProbeResult.from_samples([5.0, 7.0, None]))
+    assert (result.sent, result.received) == (5, 2)
+    assert result.latency == 6.0
+
+
+def test_mesure_unique():
+    """TCP/HTTP : une mesure, >= 500 signifie échec."""
+    assert ProbeResult.single(42.0).to_dict()['loss'] == 0
+    assert ProbeResult.single(500.0).received == 0
+
+
+def test_paquets_redondants_une_seule_sonde():
+    """Paquets en parallèle : une sonde, pertes identiques quel que soit le paquet qui répond."""
+    for samples in ([3.5, None], [None, 4.0, None], [None, 5.0, 4.0]):
+        result = ProbeResult.from_hedged(samples)
+        assert (result.sent, result.received, result.loss, result.mdev) == (1, 1, 0.0, 0.0)
+    assert ProbeResult.from_hedged([None, None, None]).loss == 1.0
+    assert ProbeResult.from_hedged([None, 5.0, 4.0]).latency == 4.0
+    # Tentative initiale de 2 paquets perdus puis paquets redondants : 1 réponse sur 3 sondes
+    result = ProbeResult(2).merge(ProbeResult.from_hedged([None, 6.0, None]))
+    assert (result.sent, result.received) == (3, 1)
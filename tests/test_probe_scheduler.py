@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module probe_scheduler.
+Vérifie l'étalement des sondes et les intervalles par hôte.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.probe_scheduler import ProbeScheduler
+
+
+def test_etalement_sur_intervalle():
+    """Les nouveaux hôtes sont répartis uniformément sur l'intervalle."""
+    scheduler = ProbeScheduler(default_interval=10)
+    scheduler.set_hosts(["a", "b", "c", "d", "e"], now=0)
+
+    assert scheduler.pop_due(0) == ["a"]
+    assert scheduler.pop_due(1.9) == []
+    assert scheduler.pop_due(2.0) == ["b"]
+    assert scheduler.pop_due(9.9) == ["c", "d", "e"]
+    # Deuxième passage : même cadence
+    assert scheduler.pop_due(10.0) == ["a"]
+
+
+def test_intervalle_par_hote():
+    """Un intervalle spécifique n'affecte que son hôte."""
+    scheduler = ProbeScheduler(default_interval=10)
+    scheduler.set_intervals({"rapide": 2})
+    scheduler.set_hosts(["rapide", "lent"], now=0)
+
+    vus = []
+    for t in range(0, 11):
+        vus.extend(scheduler.pop_due(t))
+    assert vus.count("rapide") == 6
+    assert vus.count("lent") == 1
+
+
+def test_retrait_et_retard():
+    """Les hôtes retirés ne sortent plus ; un gros retard ne provoque pas de rafale."""
+    scheduler = ProbeScheduler(default_interval=5)
+    scheduler.set_hosts(["a", "b"], now=0)
+    scheduler.set_hosts(["a"], now=0)
+    assert "b" not in scheduler
+
+    assert scheduler.pop_due(0) == ["a"]
+    # 60 s de retard : une seule sonde, puis reprise à now + intervalle
+    assert scheduler.pop_due(60) == ["a"]
+    assert scheduler.pop_due(64) == []
+    assert scheduler.next_due() == 65
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module probe_shards.
+Vérifie la répartition des hôtes entre processus de sonde.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.probe_shards import partition_hosts, shard_of
+
+
+def test_hachage_stable_et_complet():
+    """Chaque hôte est attribué à un seul processus, toujours le même."""
+    hosts = [f"10.0.{i // 256}.{i % 256}" for i in range(1000)]
+    parts = partition_hosts(hosts, 4)
+    assert sorted(sum(parts, [])) == sorted(hosts)
+    assert all(host in parts[shard_of(host, 4)] for host in hosts)
+    # Répartition raisonnablement équilibrée
+    assert min(len(p) for p in parts) > 150
+
+
+def test_repartition_par_site():
+    """En mode site, un site n'est jamais coupé entre deux processus."""
+    sites = {"a1": "A", "a2": "A", "a3": "A", "b1": "B", "b2": "B", "c1": "C"}
+    parts = partition_hosts(list(sites), 2, mode='site', sites=sites)
+    site_a = [i for i, part in enumerate(parts) if "a1" in part][0]
+    assert {"a1", "a2", "a3"} <= set(parts[site_a])
+    assert sorted(len(p) for p in parts) == [3, 3]
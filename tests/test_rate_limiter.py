@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module rate_limiter.
+Vérifie la rafale initiale et le plafonnement du débit.
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.rate_limiter import TokenBucket
+
+
+def test_desactive_par_defaut():
+    """Un débit nul ne limite rien."""
+    bucket = TokenBucket(0)
+    assert not bucket.enabled
+    assert all(bucket.try_acquire() for _ in range(1000))
+
+
+def test_rafale_puis_refus():
+    """La capacité autorise une rafale, puis les jetons manquent."""
+    bucket = TokenBucket(rate=10, capacity=5)
+    assert all(bucket.try_acquire() for _ in range(5))
+    assert not bucket.try_acquire()
+
+
+def test_acquire_respecte_le_debit():
+    """Au-delà de la rafale, acquire() attend au rythme du débit."""
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    async def consommer():
+        for _ in range(6):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(consommer())
+    # 1 jeton initial + 5 jetons à 50/s = ~0.1 s
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Script de test pour le module retry_policy.
+Vérifie le choix des tentatives selon l'historique des hôtes.
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.retry_policy import RetryPolicy
+
+
+def test_hote_inconnu():
+    """Sans historique : 2 paquets au délai de base puis tentative parallèle plus courte."""
+    policy = RetryPolicy(base_timeout=4, hedge_count=3)
+    first, retry = policy.plan("a")
+    assert (first.count, first.timeout) == (2, 4)
+    assert (retry.count, retry.timeout, retry.interval, retry.delay) == (3, 2, 0, 0)
+
+
+def test_delai_adaptatif():
+    """Le délai suit k × p99 du RTT, borné par min_timeout et base_timeout."""
+    policy = RetryPolicy(base_timeout=4, rtt_multiplier=4, min_timeout=0.5)
+    for rtt in (20, 25, 30, 40, 50):
+        policy.record("wan", rtt)
+    assert policy.timeout_for("wan") == 0.5  # 4 × 50 ms = 0.2 s -> borne basse
+    for _ in range(5):
+        policy.record("sat", 400)
+    assert policy.timeout_for("sat") == 1.6
+
+
+def test_hote_hs_sonde_courte():
+    """Un hôte déjà HS est confirmé par un seul paquet court."""
+    policy = RetryPolicy(down_timeout=1.0)
+    policy.record("mort", None)
+    plan = policy.plan("mort")
+    assert len(plan) == 1
+    assert (plan[0].count, plan[0].timeout) == (1, 1.0)
+
+
+def test_hote_instable_paquets_paralleles():
+    """Un succès obtenu après nouvelle tentative rend l'hôte instable."""
+    policy = RetryPolicy(hedge_count=3)
+    policy.record("wifi", 12.0, attempts=2)
+    plan = policy.plan("wifi")
+    assert len(plan) == 1
+    assert (plan[0].count, plan[0].interval) == (3, 0)
+
+
+def test_mode_classique():
+    """Le mode classique reproduit l'ancien comportement (2 puis 3 paquets)."""
+    policy = RetryPolicy(mode='classic', base_timeout=4)
+    policy.record("x", None)
+    first, retry = policy.plan("x")
+    assert (first.count, first.timeout) == (2, 4)
+    assert (retry.count, retry.timeout, retry.delay) == (3, 3.0, 0.5)
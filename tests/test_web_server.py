@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Script de test pour la diffusion des hôtes du serveur web.
+Vérifie qu'un client resynchronisé reçoit la liste dont les deltas sont calculés
+et que la version des hôtes (ETag) change d'une instance du serveur à l'autre.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('flask')
+
+from src import var
+from src.host_manager import HostManager
+from src.web.host_rooms import ALL_HOSTS_ROOM
+from src.web_server import WebServer
+
+
+def serveur(host_manager):
+    """Serveur limité à l'état des listes d'hôtes (sans application Flask)."""
+    server = WebServer.__new__(WebServer)
+    server.host_manager = host_manager
+    server._init_hosts_state()
+    return server
+
+
+def test_resynchronisation_puis_delta_avec_filtre_de_site():
+    """Avec site_filter, la liste complète d'une room est celle dont les deltas sont calculés."""
+    manager = HostManager()
+    manager.set_hosts([
+        {'ip': '10.0.0.1', 'site': 'A', 'latence': '1.0 ms', 'status': 'online'},
+        {'ip': '10.0.0.2', 'site': 'B', 'latence': '2.0 ms', 'status': 'online'},
+    ])
+    server = serveur(manager)
+    feed = server.host_rooms.feed(ALL_HOSTS_ROOM)
+    previous_filter = var.site_filter
+    var.site_filter = ['A']
+    try:
+        feed.publish(server._get_room_hosts(ALL_HOSTS_ROOM))
+        # Client qui se (re)connecte : liste complète et numéro de séquence
+        hosts, seq = server._room_state(ALL_HOSTS_ROOM)
+        client = [dict(host) for host in hosts]
+        assert [host['ip'] for host in client] == ['10.0.0.1', '10.0.0.2']
+
+        manager.update_host_status('10.0.0.2', '5.0 ms', 'online')
+        event, payload = feed.publish(server._get_room_hosts(ALL_HOSTS_ROOM))
+        assert event == 'hosts_delta' and payload['base'] == seq
+        for host in client:
+            host.update(payload['changes'].get(host['ip'], {}))
+        assert client == server._get_room_hosts(ALL_HOSTS_ROOM)
+    finally:
+        var.site_filter = previous_filter
+
+
+def test_version_differente_apres_redemarrage():
+    """Mêmes compteurs, autre instance du serveur : la version (et donc l'ETag) diffère."""
+    manager = HostManager()
+    manager.set_hosts([{'ip': '10.0.0.1'}])
+    first, second = serveur(manager), serveur(manager)
+    assert first.hosts_version() == first.hosts_version()
+    assert first.hosts_version() != second.hosts_version()
+    assert first.hosts_version().split('.', 1)[1] == second.hosts_version().split('.', 1)[1]